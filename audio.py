@@ -0,0 +1,109 @@
+import os
+import queue
+import threading
+
+# Sound effects by name (replace with your own .wav files; missing ones are skipped)
+SOUND_FILES = {
+    "boot": "boot.wav",
+    "event": "event.wav",
+    "scan": "scan.wav",
+    "transmit": "transmit.wav",
+}
+
+# Plays waiting to be handed to the mixer; further requests are dropped
+# rather than ever blocking the caller
+MAX_PENDING = 16
+
+
+# Sound effects played from a background thread. pygame is only imported when
+# the thread starts (on start() or the first play()), where it also loads and
+# decodes every sound. play() just queues a name and returns. Without pygame
+# or an audio device the player silently stays mute.
+class AudioPlayer:
+    enabled = True
+
+    def __init__(self, sound_files=SOUND_FILES, directory="."):
+        self.sound_files = sound_files
+        self.directory = directory
+        self.sounds = {}
+        self.error = None
+        self.dropped = 0
+        self.ready = threading.Event()
+        self._queue = queue.Queue(MAX_PENDING)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    # Import pygame and preload the sounds in the background
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="audio", daemon=True)
+                self._thread.start()
+        return self
+
+    def play(self, name):
+        if self._thread is None:
+            self.start()
+        try:
+            self._queue.put_nowait(name)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        mixer = self._open_mixer()
+        self.ready.set()
+        while True:
+            name = self._queue.get()
+            if name is None:
+                break
+            sound = self.sounds.get(name)
+            if sound is not None:
+                sound.play()
+        if mixer is not None:
+            mixer.quit()
+
+    # Initialize the mixer and load every sound file that exists
+    def _open_mixer(self):
+        os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+        try:
+            import pygame
+            pygame.mixer.init()
+        except Exception as e:  # ImportError, or pygame.error without a device
+            self.error = str(e) or type(e).__name__
+            return None
+        for name, filename in self.sound_files.items():
+            try:
+                self.sounds[name] = pygame.mixer.Sound(os.path.join(self.directory, filename))
+            except (FileNotFoundError, pygame.error):
+                pass
+        return pygame.mixer
+
+    # Stop the thread and release the audio device
+    def close(self, timeout=2.0):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        thread.join(timeout)
+
+
+# Used with --no-audio: never imports pygame or touches an audio device
+class NullAudio:
+    enabled = False
+    error = None
+
+    def start(self):
+        return self
+
+    def play(self, name):
+        pass
+
+    def close(self, timeout=2.0):
+        pass
+
+
+NULL_AUDIO = NullAudio()
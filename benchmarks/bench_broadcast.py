@@ -0,0 +1,119 @@
+import selectors
+import socket
+import threading
+import time
+
+from benchmarks.common import report
+from broadcast import BroadcastServer
+
+# Sizes of a typical diff frame and of a full redraw (see bench_render)
+FRAME_BYTES = 320
+KEYFRAME_BYTES = 2300
+
+
+# Reads every viewer socket on one thread and records, for each frame, when
+# the last viewer finished receiving it
+class ViewerPool:
+    def __init__(self, address, count, frames):
+        self.selector = selectors.DefaultSelector()
+        self.sockets = []
+        self.received = {}
+        self.next_frame = {}
+        self.arrival = [0.0] * frames
+        self.delivered = [0] * frames
+        self.count = count
+        for _ in range(count):
+            sock = socket.create_connection(address)
+            sock.setblocking(False)
+            self.sockets.append(sock)
+            self.received[sock] = 0
+            self.next_frame[sock] = 0
+            self.selector.register(sock, selectors.EVENT_READ)
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while self.running:
+            for key, _ in self.selector.select(0.05):
+                sock = key.fileobj
+                try:
+                    data = sock.recv(65536)
+                except BlockingIOError:
+                    continue
+                now = time.perf_counter()
+                self.received[sock] += len(data)
+                frame = self.next_frame[sock]
+                while frame < len(self.arrival) and self.received[sock] >= KEYFRAME_BYTES + frame * FRAME_BYTES:
+                    self.arrival[frame] = max(self.arrival[frame], now)
+                    self.delivered[frame] += 1
+                    frame += 1
+                self.next_frame[sock] = frame
+
+    def close(self):
+        self.running = False
+        self.thread.join()
+        for sock in self.sockets:
+            sock.close()
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+# Publish `frames` frames at `interval` to `viewers` viewers (plus optionally
+# one that never reads) and measure publish-to-last-viewer latency
+def scenario(viewers, frames=100, interval=0.02, stalled=False):
+    with BroadcastServer(port=0, max_pending=64 * 1024) as server:
+        pool = ViewerPool(server.address, viewers, frames + 1)
+        stuck = None
+        if stalled:
+            # A tiny receive window so the kernel cannot absorb the backlog
+            stuck = socket.socket()
+            stuck.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+            stuck.connect(server.address)
+        while server.stats()["viewers"] < viewers + bool(stalled):
+            time.sleep(0.005)
+        keyframe = b"K" * KEYFRAME_BYTES
+        frame = b"F" * FRAME_BYTES
+        published = []
+        publish_cost = 0.0
+        for index in range(frames + 1):
+            start = time.perf_counter()
+            server.publish(frame, keyframe)
+            publish_cost += time.perf_counter() - start
+            published.append(start)
+            time.sleep(interval)
+        deadline = time.perf_counter() + 10
+        while pool.delivered[-1] < viewers and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        latencies = [pool.arrival[i] - published[i] for i in range(1, frames + 1) if pool.delivered[i] == viewers]
+        stats = server.stats()
+        pool.close()
+        if stuck:
+            stuck.close()
+    return {
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "publish_us": publish_cost / (frames + 1) * 1e6,
+        "complete_frames": len(latencies),
+        "dropped": stats["dropped"],
+    }
+
+
+# Per-frame latency (publish until the last viewer has the frame) as the
+# number of viewers grows, the frame loop's cost per publish, and a run with
+# one viewer that never reads to show it is cut off rather than slowing the rest
+def run(viewer_counts=(1, 10, 100, 500)):
+    results = {}
+    for count in viewer_counts:
+        for metric, value in scenario(count).items():
+            results[f"{count}_viewers_{metric}"] = value
+    for metric, value in scenario(100, frames=1000, interval=0.002, stalled=True).items():
+        results[f"100_plus_stalled_{metric}"] = value
+    return results
+
+
+if __name__ == "__main__":
+    report("Console broadcast", run())
@@ -0,0 +1,71 @@
+import time
+
+from benchmarks.common import best_of, report
+from constellation import (CONJUNCTION_KM, Constellation, SpatialGrid, brute_force_pairs, debris_catalog,
+                           positions_at, walker_constellation, walker_planes)
+from orbit import J2000_UNIX, SatelliteOrbit
+
+SATELLITES = 1000
+COUNTS = (1000, 5000, 20000, 100000)
+BRUTE_FORCE_MAX = 20000
+
+
+def pair_set(pairs):
+    return set(zip(pairs[0].tolist(), pairs[1].tolist()))
+
+
+# Best mean milliseconds per grid update after the first frame, updating one
+# grid or building a new one each time
+def per_update(frames, incremental, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        grid = SpatialGrid(CONJUNCTION_KM).update(frames[0])
+        start = time.perf_counter()
+        for frame in frames[1:]:
+            (grid if incremental else SpatialGrid(CONJUNCTION_KM)).update(frame)
+        best = min(best, (time.perf_counter() - start) / (len(frames) - 1))
+    return best * 1000
+
+
+# Screening 1000 satellites against growing debris catalogs (every object
+# tracked, no altitude filter): the grid's update and query against checking
+# all pairs; the incremental update against a full re-sort; and one tick of
+# the game's constellation mode
+def run():
+    results = {}
+    satellites = positions_at(walker_constellation(SATELLITES, walker_planes(SATELLITES)), J2000_UNIX)
+    for count in COUNTS:
+        debris = positions_at(debris_catalog(count, seed=1)[0], J2000_UNIX)
+        results[f"grid_{count}_ms"] = best_of(
+            lambda: SpatialGrid(CONJUNCTION_KM).update(debris).query(satellites, CONJUNCTION_KM), 5) * 1000
+        grid = SpatialGrid(CONJUNCTION_KM).update(debris)
+        if count <= BRUTE_FORCE_MAX:
+            results[f"all_pairs_{count}_ms"] = best_of(
+                lambda: brute_force_pairs(satellites, debris, CONJUNCTION_KM), 1) * 1000
+            results[f"pairs_match_{count}"] = pair_set(grid.query(satellites, CONJUNCTION_KM)) == \
+                pair_set(brute_force_pairs(satellites, debris, CONJUNCTION_KM))
+
+    # Grid updates over consecutive ticks of the fastest and the default
+    # frame speed: re-sorting the previous, almost sorted order against
+    # sorting from scratch
+    elements = debris_catalog(COUNTS[-1], seed=1)[0]
+    for tick in (0.1, 0.5):
+        frames = [positions_at(elements, J2000_UNIX + k * tick) for k in range(11)]
+        label = str(tick).replace(".", "_")
+        results[f"update_{label}s_incremental_ms"] = per_update(frames, True)
+        results[f"update_{label}s_full_sort_ms"] = per_update(frames, False)
+
+    debris, names = debris_catalog(20000, seed=1)
+    constellation = Constellation.around(SatelliteOrbit(), SATELLITES, debris, names)
+    start = time.perf_counter()
+    ticks = 240
+    for k in range(ticks):
+        constellation.screen(J2000_UNIX + k * 0.5)
+    results["game_tick_ms"] = (time.perf_counter() - start) * 1000 / ticks
+    results["tracked_debris"] = len(constellation.debris_names)
+    results["conjunctions_per_2_min"] = constellation.conjunctions
+    return results
+
+
+if __name__ == "__main__":
+    report("Constellation conjunction screening", run())
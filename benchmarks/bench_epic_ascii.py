@@ -0,0 +1,64 @@
+import io
+import os
+import time
+
+import numpy as np
+
+from benchmarks.common import best_of, report
+from epic_ascii import FIXTURE_IMAGE, EpicView, decode_image, reduce_source, render_lines
+
+ROWS, COLS = 48, 160
+
+
+# A 2048x2048 picture the size of an EPIC image: the fixture Earth scaled up
+# with sensor noise, so it compresses like a photograph
+def epic_sized_image():
+    with open(FIXTURE_IMAGE, "rb") as f:
+        earth = decode_image(f.read())
+    big = np.repeat(np.repeat(earth, 8, axis=0), 8, axis=1).astype(np.int16)
+    noise = np.random.default_rng(7).integers(-6, 7, big.shape)
+    return np.clip(big + noise, 0, 255).astype(np.uint8)
+
+
+def encode_png(pixels):
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    import pygame
+
+    out = io.BytesIO()
+    pygame.image.save(pygame.surfarray.make_surface(pixels.transpose(1, 0, 2)), out, "earth.png")
+    return out.getvalue()
+
+
+# Decoding a full-size image, reducing it, turning it into terminal lines,
+# and answering again from the rendered-frame cache
+def run():
+    results = {}
+    pixels = epic_sized_image()
+    png = encode_png(pixels)
+    results["png_bytes"] = len(png)
+    results["decode_ms"] = best_of(lambda: decode_image(png), 3) * 1000
+    results["decode_matches"] = bool((decode_image(png) == pixels).all())
+
+    results["reduce_to_512_ms"] = best_of(lambda: reduce_source(pixels), 5) * 1000
+    source = reduce_source(pixels)
+    results["render_ascii_ms"] = best_of(lambda: render_lines(source, ROWS, COLS, "ascii"), 20) * 1000
+    results["render_ansi256_ms"] = best_of(lambda: render_lines(source, ROWS, COLS, "ansi256"), 20) * 1000
+
+    view = EpicView(lambda image: png)
+    start = time.perf_counter()
+    while view.lines("earth", ROWS, COLS) is None:
+        time.sleep(0.001)
+    results["first_frame_ms"] = (time.perf_counter() - start) * 1000
+    # A new terminal size re-renders from the kept source instead of decoding
+    start = time.perf_counter()
+    while view.lines("earth", ROWS - 10, COLS - 40) is None:
+        time.sleep(0.001)
+    results["resize_frame_ms"] = (time.perf_counter() - start) * 1000
+    results["cache_hit_us"] = best_of(lambda: view.lines("earth", ROWS, COLS), 1000) * 1e6
+    results["decodes"] = view.decodes
+    view.close()
+    return results
+
+
+if __name__ == "__main__":
+    report("EPIC image to ASCII", run())
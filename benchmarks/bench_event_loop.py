@@ -0,0 +1,49 @@
+import os
+import threading
+import time
+
+from benchmarks.common import report
+from event_loop import FrameScheduler
+
+
+# Key-to-tick latency and tick jitter for the scheduler, with keys written to
+# a pipe standing in for the terminal at times unrelated to the tick clock.
+# Presses are at least one tick apart; bursts are handed out one per tick.
+def run(tick=0.02, presses=50):
+    read_fd, write_fd = os.pipe()
+    stdin = os.fdopen(read_fd, "rb", buffering=0)
+    scheduler = FrameScheduler(tick, stdin=stdin)
+    sent = []
+    latencies = []
+
+    def typist():
+        for i in range(presses):
+            time.sleep(tick * (1.03 + (i % 7) * 0.17))
+            sent.append(time.perf_counter())
+            os.write(write_fd, b"k")
+
+    def on_tick(key):
+        if key is not None:
+            latencies.append(time.perf_counter() - sent[len(latencies)])
+        return len(latencies) < presses
+
+    thread = threading.Thread(target=typist)
+    thread.start()
+    scheduler.run(on_tick)
+    thread.join()
+    scheduler.close()
+    stdin.close()
+    os.close(write_fd)
+
+    return {
+        "tick_ms": tick * 1000,
+        "key_latency_mean_ms": sum(latencies) / len(latencies) * 1000,
+        "key_latency_max_ms": max(latencies) * 1000,
+        "tick_jitter_mean_ms": scheduler.mean_jitter * 1000,
+        "tick_jitter_max_ms": scheduler.max_jitter * 1000,
+        "deadline_misses": scheduler.deadline_misses,
+    }
+
+
+if __name__ == "__main__":
+    report("Frame scheduler", run())
@@ -0,0 +1,32 @@
+import random
+
+from benchmarks.common import best_of, report
+from frame_metrics import NULL_METRICS, FrameMetrics
+
+
+# Cost of one phase measurement (clock, clock, observe) with instrumentation
+# on and with the null object, and of building the overlay and exports
+def run(calls=100000):
+    results = {}
+    durations = [random.lognormvariate(-8, 1.5) for _ in range(1000)]
+
+    def measure(metrics):
+        def loop():
+            clock, observe = metrics.clock, metrics.observe
+            for index in range(calls):
+                started = clock()
+                observe("compose", clock() - started + durations[index % 1000])
+        return best_of(loop, 3) / calls * 1e9
+
+    metrics = FrameMetrics()
+    results["enabled_measurement_ns"] = measure(metrics)
+    results["null_measurement_ns"] = measure(NULL_METRICS)
+    results["overlay_us"] = best_of(lambda: [metrics.overlay_lines() for _ in range(100)], 5) / 100 * 1e6
+    results["prometheus_export_us"] = best_of(lambda: [metrics.to_prometheus() for _ in range(100)], 5) / 100 * 1e6
+    results["p99_error"] = abs(metrics.histograms["compose"].quantile(0.99) /
+                               sorted(durations)[989] - 1)
+    return results
+
+
+if __name__ == "__main__":
+    report("Frame instrumentation", run())
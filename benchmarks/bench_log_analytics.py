@@ -0,0 +1,72 @@
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+
+import log_analytics
+from benchmarks.common import best_of, report
+from log_analytics import LogIndex, analyze, parse_time
+from mission_log import format_record
+
+MESSAGES = [
+    "Initiated sector scan", "Scan completed: 50MB data collected", "Initiated data transmission",
+    "Transmission disrupted due to interference", "Transmission completed: Mission 4",
+    "EVENT: Solar flare detected!", "Event Outcome: Systems recovered",
+    "Initiated repairs: Consumed 10% solar power", "Repairs completed: Health +20%",
+]
+
+
+# A week of records two seconds apart, mostly telemetry, with a JSON Lines
+# stretch in the middle
+def write_log(path, count, seed=1):
+    rng = random.Random(seed)
+    start = datetime(2026, 10, 1).timestamp()
+    with open(path, "w") as f:
+        for i in range(count):
+            if i % 3:
+                message = f"Telemetry - Lat: {rng.uniform(-90, 90):.2f}, Lon: {rng.uniform(-180, 180):.2f}, Health: {rng.randint(40, 100)}"
+            else:
+                message = rng.choice(MESSAGES)
+            f.write(format_record(start + i * 2, message, {}, json_lines=count // 3 <= i < count // 2))
+
+
+# Full-log summary throughput, building the timestamp index, and a two-hour
+# query with the index against scanning the whole log for it
+def run(count=300000):
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "satellite_log.txt")
+        write_log(path, count)
+        results["log_bytes"] = os.path.getsize(path)
+
+        elapsed = best_of(lambda: analyze(path), 2)
+        results["full_summary_ms"] = elapsed * 1000
+        results["records_per_s"] = count / elapsed
+        results["mb_per_s"] = results["log_bytes"] / elapsed / 1e6
+
+        start = time.perf_counter()
+        index = LogIndex(path).refresh()
+        results["index_build_ms"] = (time.perf_counter() - start) * 1000
+        results["index_entries"] = len(index.offsets)
+        results["index_reload_ms"] = best_of(lambda: LogIndex(path).refresh(), 5) * 1000
+
+        since, until = parse_time("2026-10-04 10:00"), parse_time("2026-10-04 12:00")
+        results["range_indexed_ms"] = best_of(lambda: analyze(path, since, until), 5) * 1000
+        results["range_full_scan_ms"] = best_of(lambda: analyze(path, since, until, use_index=False), 2) * 1000
+
+        # Two workers over the whole log (no faster on a single CPU)
+        threshold = log_analytics.PARALLEL_MIN_BYTES
+        log_analytics.PARALLEL_MIN_BYTES = 1 << 20
+        try:
+            start = time.perf_counter()
+            parallel = analyze(path, workers=2)
+            results["parallel_2_workers_ms"] = (time.perf_counter() - start) * 1000
+        finally:
+            log_analytics.PARALLEL_MIN_BYTES = threshold
+        results["parallel_matches"] = parallel.to_dict() == analyze(path).to_dict()
+    return results
+
+
+if __name__ == "__main__":
+    report("Log analytics", run())
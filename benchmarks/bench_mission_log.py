@@ -0,0 +1,53 @@
+import os
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.common import report
+from mission_log import BackgroundLogger
+
+
+# The previous log_data: open, append one line, close
+def open_append_close(path, message):
+    with open(path, "a") as f:
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        f.write(f"[{timestamp}] {message}\n")
+
+
+# Caller-side cost per log call (what the frame loop pays) and end-to-end
+# throughput for the old open-append-close path and the background logger
+def run(records=20000):
+    message = "Telemetry - Lat: 12.34, Lon: -56.78, Health: 90"
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "old.txt")
+        start = time.perf_counter()
+        for _ in range(records):
+            open_append_close(path, message)
+        elapsed = time.perf_counter() - start
+        results["open_append_close_us_per_call"] = elapsed / records * 1e6
+
+        for json_lines in (False, True):
+            name = "jsonl" if json_lines else "text"
+            logger = BackgroundLogger(os.path.join(tmp, f"new_{name}.txt"), max_queue=records + 1,
+                                      json_lines=json_lines).start()
+            start = time.perf_counter()
+            for _ in range(records):
+                logger.log(message, health=90)
+            queued = time.perf_counter() - start
+            logger.flush()
+            total = time.perf_counter() - start
+            logger.close()
+            results[f"background_{name}_us_per_call"] = queued / records * 1e6
+            results[f"background_{name}_records_per_s"] = records / total
+
+        rotating = BackgroundLogger(os.path.join(tmp, "rotating.txt"), max_bytes=64 * 1024, backup_count=3)
+        for _ in range(records):
+            rotating.log(message)
+        rotating.close()
+        results["rotated_files"] = sum(1 for name in os.listdir(tmp) if name.startswith("rotating.txt"))
+    return results
+
+
+if __name__ == "__main__":
+    report("Mission log", run())
@@ -0,0 +1,57 @@
+import os
+import tempfile
+import time
+
+from benchmarks.common import report
+from nasa_cache import ResponseCache
+from nasa_client import NasaClient
+from nasa_fixture_server import FixtureServer
+
+
+# Time from client start to a complete snapshot, and the requests it cost
+def first_snapshot(server, cache):
+    before = len(server.requests)
+    start = time.perf_counter()
+    client = NasaClient(base_url=server.url, api_key="BENCH", cache=cache)
+    client.poll_once()
+    elapsed = time.perf_counter() - start
+    client.session.close()
+    return elapsed * 1000, len(server.requests) - before
+
+
+# Cold vs warm startup against a fixture server with simulated API latency,
+# plus conditional revalidation once entries go stale and raw lookup cost
+def run(latency=0.05):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp, FixtureServer(delay=latency) as server:
+        path = os.path.join(tmp, "cache.sqlite3")
+        results["no_cache_startup_ms"], results["no_cache_requests"] = first_snapshot(server, None)
+
+        cache = ResponseCache(path)
+        results["cold_startup_ms"], results["cold_requests"] = first_snapshot(server, cache)
+        cache.close()
+
+        # A new process reopening the cache file
+        cache = ResponseCache(path)
+        results["warm_startup_ms"], results["warm_requests"] = first_snapshot(server, cache)
+        results["warm_bytes_saved"] = cache.stats()["bytes_saved"]
+        cache.close()
+
+        # Expire everything: the next start revalidates with 304s instead of re-downloading
+        cache = ResponseCache(path, ttls={}, default_ttl=0)
+        results["stale_startup_ms"], results["stale_requests"] = first_snapshot(server, cache)
+        results["stale_revalidations"] = cache.stats()["revalidations"]
+        cache.close()
+
+        cache = ResponseCache(path)
+        lookups = 10000
+        start = time.perf_counter()
+        for _ in range(lookups):
+            cache.get("/EPIC/api/natural")
+        results["lookup_us"] = (time.perf_counter() - start) / lookups * 1e6
+        cache.close()
+    return results
+
+
+if __name__ == "__main__":
+    report("NASA response cache", run())
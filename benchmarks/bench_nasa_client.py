@@ -0,0 +1,46 @@
+import time
+
+from benchmarks.common import best_of, report
+from nasa_client import NasaClient
+from nasa_fixture_server import FixtureServer
+
+
+# Fetch latency for both feeds against the local fixture server, comparing the
+# pooled session with a fresh connection per request
+def run(requests_per_round=50):
+    results = {}
+    with FixtureServer() as server:
+        client = NasaClient(base_url=server.url, api_key="BENCH")
+        client.fetch_epic()
+
+        pooled = best_of(lambda: [client.fetch_epic() for _ in range(requests_per_round)], repeat=3)
+        results["epic_pooled_ms"] = pooled / requests_per_round * 1000
+
+        def unpooled():
+            for _ in range(requests_per_round):
+                fresh = NasaClient(base_url=server.url, api_key="BENCH")
+                fresh.fetch_epic()
+                fresh.session.close()
+        results["epic_unpooled_ms"] = best_of(unpooled, repeat=3) / requests_per_round * 1000
+
+        feed = best_of(lambda: [client.fetch_neo_feed() for _ in range(requests_per_round)], repeat=3)
+        results["neo_feed_pooled_ms"] = feed / requests_per_round * 1000
+
+        # Time from start() until the first snapshot has both feeds
+        started = time.perf_counter()
+        poller = NasaClient(base_url=server.url, api_key="BENCH").start()
+        while poller.snapshot.epic is None or poller.snapshot.neos is None:
+            time.sleep(0.001)
+        results["first_snapshot_ms"] = (time.perf_counter() - started) * 1000
+        poller.stop()
+
+        # A 429 with Retry-After must push the next poll out, not spin
+        server.inject("/EPIC", 429, retry_after=30)
+        client.poll_once(now=0.0)
+        results["backoff_after_429_s"] = client._feeds["epic"]["due"]
+        client.stop()
+    return results
+
+
+if __name__ == "__main__":
+    report("NASA client (local fixture server)", run())
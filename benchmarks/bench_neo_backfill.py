@@ -0,0 +1,64 @@
+import os
+import tempfile
+import time
+from datetime import date
+
+from benchmarks.common import report
+from nasa_client import NasaClient
+from nasa_fixture_server import FixtureServer
+from neo_backfill import NeoBackfill, TokenBucket
+from neo_store import NeoStore
+
+START, END = date(2024, 1, 1), date(2024, 12, 31)
+
+
+# One backfill of 2024 into a fresh store; returns (seconds, stats, store)
+def backfill(server, directory, workers, max_requests=None, fresh=True):
+    store_path = os.path.join(directory, "neo_store.npz")
+    progress_path = os.path.join(directory, "neo_backfill.json")
+    if fresh:
+        for path in (store_path, progress_path):
+            if os.path.exists(path):
+                os.remove(path)
+    client = NasaClient(base_url=server.url, api_key="BENCH", session=NasaClient._make_session(workers))
+    job = NeoBackfill(client, store_path, progress_path, workers, TokenBucket(100.0, workers))
+    start = time.perf_counter()
+    stats = job.run(START, END, max_requests=max_requests)
+    elapsed = time.perf_counter() - start
+    client.session.close()
+    return elapsed, stats, NeoStore.load(store_path)
+
+
+# A year of 7-day feed windows from the fixture server with 50 ms of latency
+# per response: one request at a time against a pool of 8, then with 429s and
+# 503s injected, and an interrupted run resumed from its progress file
+def run():
+    results = {}
+    with FixtureServer(delay=0.05, rate_limit=1000000, synthetic_feed=True) as server, \
+            tempfile.TemporaryDirectory() as directory:
+        elapsed, stats, store = backfill(server, directory, 1)
+        results["sequential_s"] = elapsed
+        results["windows"] = stats["saved"]
+        results["approaches"] = len(store)
+
+        elapsed, stats, store = backfill(server, directory, 8)
+        results["pool_8_s"] = elapsed
+        results["windows_per_s"] = stats["saved"] / elapsed
+        results["pool_approaches_match"] = len(store) == results["approaches"]
+
+        server.inject("/neo/rest/v1/feed", 429, 3, retry_after=0.2)
+        server.inject("/neo/rest/v1/feed", 503, 3, retry_after=0.1)
+        elapsed, stats, store = backfill(server, directory, 8)
+        results["with_faults_s"] = elapsed
+        results["fault_retries"] = stats["retries"]
+        results["faults_approaches_match"] = len(store) == results["approaches"] and not stats["failed"]
+
+        backfill(server, directory, 8, max_requests=20)
+        _, stats, store = backfill(server, directory, 8, fresh=False)
+        results["resumed_requests"] = stats["requests"]
+        results["resume_approaches_match"] = len(store) == results["approaches"]
+    return results
+
+
+if __name__ == "__main__":
+    report("NEO backfill (local fixture server)", run())
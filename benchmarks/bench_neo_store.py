@@ -0,0 +1,73 @@
+import json
+import os
+
+import numpy as np
+
+from benchmarks.common import best_of, report
+from neo_store import LUNAR_DISTANCE_KM, MS_PER_DAY, NEO_DTYPE, NeoStore, rows_from_response
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sentinel_fixtures")
+
+
+# A year of synthetic close approaches, spread evenly over time
+def synthetic_rows(count, seed=1):
+    rng = np.random.default_rng(seed)
+    rows = np.zeros(count, dtype=NEO_DTYPE)
+    rows["neo_id"] = rng.integers(2000000, 4000000, count)
+    rows["name"] = "synthetic"
+    rows["epoch_ms"] = rng.integers(0, 365 * MS_PER_DAY, count) + 1704067200000
+    rows["miss_ld"] = rng.uniform(0.05, 200.0, count)
+    rows["miss_km"] = rows["miss_ld"] * LUNAR_DISTANCE_KM
+    rows["velocity_kps"] = rng.uniform(2.0, 40.0, count)
+    rows["diameter_min_m"] = rng.lognormal(4.0, 1.2, count)
+    rows["diameter_max_m"] = rows["diameter_min_m"] * 2.236
+    rows["hazardous"] = rng.random(count) < 0.07
+    return rows
+
+
+# Mean latency of one call in microseconds
+def per_call_us(fn, calls=2000):
+    return best_of(lambda: [fn() for _ in range(calls)], 3) / calls * 1e6
+
+
+# Fixture ingest and query latency on a 100k-row store; the old path was a
+# linear walk of the parsed feed JSON on every lookup
+def run(count=100000):
+    results = {}
+    responses = []
+    for name in ("neo_feed.json", "neo_browse.json"):
+        with open(os.path.join(FIXTURES, name)) as f:
+            responses.append(json.load(f))
+
+    def ingest():
+        store = NeoStore()
+        for data in responses:
+            store.add(rows_from_response(data))
+        return store
+
+    results["fixture_ingest_ms"] = best_of(ingest, 20) * 1000
+    results["fixture_rows"] = len(ingest())
+
+    rows = synthetic_rows(count)
+    results["bulk_add_ms"] = best_of(lambda: NeoStore(rows), 5) * 1000
+    store = NeoStore(rows)
+    results["rows"] = len(store)
+
+    middle = int(np.median(store.rows["epoch_ms"]))
+    results["next_approaches_us"] = per_call_us(lambda: store.next_approaches(5, after_ms=middle))
+    results["next_within_1ld_us"] = per_call_us(lambda: store.next_approaches(5, within_ld=1.0, after_ms=middle))
+    results["hazardous_week_us"] = per_call_us(lambda: store.hazardous(middle))
+    results["within_1ld_us"] = per_call_us(lambda: store.within(1.0))
+    results["closest_us"] = per_call_us(lambda: store.closest(10))
+
+    # Baseline: a full scan of the rows for the same filtered query
+    def scan():
+        epochs = store.rows["epoch_ms"]
+        match = store.rows[(epochs >= middle) & (store.rows["miss_ld"] <= 1.0)]
+        return match[np.argsort(match["epoch_ms"])][:5]
+    results["full_scan_within_1ld_us"] = per_call_us(scan, 200)
+    return results
+
+
+if __name__ == "__main__":
+    report("NEO store", run())
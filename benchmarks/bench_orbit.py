@@ -0,0 +1,32 @@
+import numpy as np
+
+from benchmarks.common import best_of, report
+from orbit import J2000_UNIX, SatelliteOrbit, circular_orbit, propagate
+
+
+# Random circular orbits between 400 and 1200 km
+def constellation(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return circular_orbit(rng.uniform(400, 1200, count), rng.uniform(0, 180, count),
+                          rng.uniform(0, 360, count), rng.uniform(0, 360, count))
+
+
+# Propagation throughput in object-epochs per second for several grid shapes,
+# plus the single-position call the animation makes every frame
+def run(shapes=((1, 1000), (1000, 100), (1000, 1000), (10000, 100))):
+    results = {}
+    for objects, epochs in shapes:
+        elements = constellation(objects)
+        times = J2000_UNIX + np.linspace(0, 86400, epochs)
+        elapsed = best_of(lambda: propagate(elements, times), repeat=3)
+        results[f"{objects}x{epochs}_object_epochs_per_s"] = objects * epochs / elapsed
+
+    satellite = SatelliteOrbit()
+    calls = 2000
+    elapsed = best_of(lambda: [satellite.position(J2000_UNIX + t) for t in range(calls)], repeat=3)
+    results["single_position_us"] = elapsed / calls * 1e6
+    return results
+
+
+if __name__ == "__main__":
+    report("Orbit propagation", run())
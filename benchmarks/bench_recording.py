@@ -0,0 +1,86 @@
+import os
+import random
+import tempfile
+import time
+
+import satellite_animation as app
+from benchmarks.common import report
+from recording import SessionRecorder, compare, load_recording, replay
+from simulation import SimState, advance
+from state_store import DEFAULT_STATE
+
+# A day of play at the default half-second tick
+DAY_TICKS = 172800
+
+EPOCH = 1704067200.0
+
+
+# A careful operator: ignores every event and keeps scanning. Neither costs
+# anything (unlike (T)ransmit, which takes the hit if a debris field appears
+# on the same tick), so the session runs for the whole day.
+def careful_operator(sim, rng):
+    if sim.event is not None:
+        return "g"
+    if sim.scanning or rng.random() < 0.9:
+        return None
+    return "c"
+
+
+# Record a session the way the front end does, with telemetry drawn one
+# reading at a time
+def record_session(path, ticks, seed=7):
+    state = dict(DEFAULT_STATE)
+    orbit = {field: values.tolist() for field, values in app.satellite_orbit.elements._asdict().items()}
+    recorder = SessionRecorder(path, seed, EPOCH, state, orbit)
+    rng = random.Random(seed)
+    policy = random.Random(seed + 2)
+    sim = SimState.from_persistent(state)
+    effects = []
+    for tick in range(ticks):
+        when = EPOCH + sim.elapsed_time
+        key = careful_operator(sim, policy)
+        del effects[:]
+        advance(sim, key, rng, effects)
+        if key:
+            recorder.key(tick, key)
+        for effect in effects:
+            if effect[0] == "log":
+                recorder.log(effect[1])
+            elif effect[0] == "telemetry":
+                recorder.log(app.telemetry_record(app.generate_telemetry(None, when), sim.health)[0])
+        recorder.snapshot(tick, sim)
+        if not sim.running:
+            ticks = tick + 1
+            break
+    recorder.close(ticks, sim.persistent())
+    return ticks
+
+
+# Size of a day-long recording and how fast it replays headlessly, with the
+# log and final state checked against the recorded session
+def run(ticks=DAY_TICKS):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "day.rec")
+        ticks = record_session(path, ticks)
+        recording = load_recording(path)
+        results["session_hours"] = ticks * 0.5 / 3600
+        results["recorded_keys"] = len(recording.keys)
+        results["file_bytes"] = os.path.getsize(path)
+
+        start = time.perf_counter()
+        load_recording(path)
+        results["load_ms"] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        result = replay(recording, app.telemetry_messages)
+        elapsed = time.perf_counter() - start
+        results["replay_day_s"] = elapsed
+        results["replay_ticks_per_s"] = ticks / elapsed
+        results["log_records"] = len(result.logs)
+        results["mismatches"] = len(compare(recording, result))
+    return results
+
+
+if __name__ == "__main__":
+    report("Session record/replay", run())
@@ -0,0 +1,56 @@
+import random
+import time
+
+import satellite_animation as app
+from benchmarks.common import NullTTY, best_of, report
+from renderer import TerminalRenderer
+from simulation import SimState, autopilot, step
+
+
+# Frames per second and bytes per frame for the whole per-frame path (atlas
+# lookup, telemetry, compose, diff render) into a null terminal, with the
+# autopilot playing so every activity state and event gets drawn; plus the
+# cost of the frame helpers on their own
+def run(frames=5000):
+    results = {}
+    app.frame_atlas.build()
+    sink = NullTTY()
+    renderer = TerminalRenderer(stream=sink)
+    rng = random.Random(1)
+    sim = SimState()
+    epoch = time.time()
+    sizes = []
+    start = time.perf_counter()
+    for _ in range(frames):
+        sim, _ = step(sim, autopilot(sim, rng), rng)
+        if not sim.running:
+            sim = SimState()
+        frame_set = app.frame_atlas.frames(sim.health, sim.mode)
+        telemetry = app.generate_telemetry(None, epoch + sim.elapsed_time)
+        before = sink.bytes
+        renderer.render(app.compose_screen(frame_set[sim.frame_index % len(frame_set)], sim, telemetry))
+        sizes.append(sink.bytes - before)
+    elapsed = time.perf_counter() - start
+    results["frames_per_s"] = frames / elapsed
+    results["frame_us"] = elapsed / frames * 1e6
+    results["first_frame_bytes"] = sizes[0]
+    results["mean_frame_bytes"] = sum(sizes[1:]) / (frames - 1)
+    results["max_frame_bytes"] = max(sizes[1:])
+
+    # A full redraw of every frame, as before the diff renderer
+    full = TerminalRenderer(stream=NullTTY())
+    screen = app.compose_screen(app.frame_atlas.frame(100, "default", 0), SimState(), telemetry)
+    results["full_redraw_bytes"] = len(full.render(screen).encode("utf-8"))
+
+    calls = 2000
+    results["get_frame_us"] = best_of(lambda: [app.get_frame(60, app.base_frames) for _ in range(calls)], 3) / calls * 1e6
+    results["colorize_frame_us"] = best_of(
+        lambda: [app.colorize_frame(app.scan_frames[0], "scanning") for _ in range(calls)], 3) / calls * 1e6
+    results["atlas_lookup_us"] = best_of(
+        lambda: [app.frame_atlas.frames(60, "scanning") for _ in range(calls)], 3) / calls * 1e6
+    results["telemetry_us"] = best_of(lambda: [app.generate_telemetry(None, epoch) for _ in range(calls)], 3) / calls * 1e6
+    return results
+
+
+if __name__ == "__main__":
+    report("Frame rendering (null terminal)", run())
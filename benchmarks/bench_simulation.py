@@ -0,0 +1,37 @@
+import random
+import time
+
+from benchmarks.common import report
+from simulation import SimState, autopilot, run_headless, step
+
+
+# Headless ticks per second for the in-place runner (idle and autopilot)
+# and for the pure step() API
+def run(ticks=1_000_000):
+    results = {}
+    start = time.perf_counter()
+    _, done, _ = run_headless(ticks, seed=1, inputs={})
+    results["headless_idle_ticks_per_s"] = done / (time.perf_counter() - start)
+
+    # The autopilot session ends when solar power runs out, so restart it
+    done = 0
+    start = time.perf_counter()
+    seed = 0
+    while done < ticks:
+        _, count, _ = run_headless(ticks - done, seed=seed, inputs=autopilot)
+        done += count
+        seed += 1
+    results["headless_autopilot_ticks_per_s"] = done / (time.perf_counter() - start)
+
+    rng = random.Random(1)
+    state = SimState()
+    count = ticks // 10
+    start = time.perf_counter()
+    for _ in range(count):
+        state, _ = step(state, None, rng)
+    results["pure_step_ticks_per_s"] = count / (time.perf_counter() - start)
+    return results
+
+
+if __name__ == "__main__":
+    report("Simulation core", run())
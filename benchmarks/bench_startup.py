@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.common import report
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run in a fresh interpreter: import the front end, then build and render the
+# first animation frame into a null terminal. Prints the in-process import and
+# first-frame times; the caller times the whole process.
+CHILD = """
+import time
+start = time.perf_counter()
+import satellite_animation as app
+imported = time.perf_counter()
+from benchmarks.common import NullTTY
+from renderer import TerminalRenderer
+from simulation import SimState
+app.frame_atlas.build()
+sim = SimState()
+screen = app.compose_screen(app.frame_atlas.frame(sim.health, sim.mode, 0), sim, app.generate_telemetry())
+TerminalRenderer(stream=NullTTY()).render(screen)
+done = time.perf_counter()
+print((imported - start) * 1000, (done - imported) * 1000)
+"""
+
+
+# Launch-to-first-frame time of a new process (interpreter start, imports,
+# frame atlas and the first render), the part of it spent importing, and the
+# bare interpreter start for reference. Boot-sequence pauses are excluded.
+def run(repeat=5):
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    results = {}
+    best = (float("inf"), 0.0, 0.0)
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", CHILD], cwd=ROOT, env=env,
+                             capture_output=True, text=True, check=True).stdout
+        total = (time.perf_counter() - start) * 1000
+        if total < best[0]:
+            import_ms, frame_ms = (float(value) for value in out.split()[-2:])
+            best = (total, import_ms, frame_ms)
+    results["process_to_first_frame_ms"], results["import_ms"], results["first_frame_ms"] = best
+
+    bare = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], env=env, check=True)
+        bare = min(bare, (time.perf_counter() - start) * 1000)
+    results["bare_interpreter_ms"] = bare
+    return results
+
+
+if __name__ == "__main__":
+    report("Startup to first frame", run())
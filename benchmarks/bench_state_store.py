@@ -0,0 +1,67 @@
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.common import report
+from state_store import StateStore
+
+
+# The previous save_state: rewrite the whole file in place
+def rewrite_in_place(path, state):
+    with open(path, "w") as f:
+        json.dump(state, f)
+
+
+# Write cost per state transition (journal append vs full rewrite vs an
+# atomic checkpoint) and recovery time for journals of increasing length
+def run(transitions=5000, journal_sizes=(1000, 10000, 100000)):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        state = {"health": 100, "data_collected": 0, "missions_completed": 0, "solar_power": 100}
+
+        path = os.path.join(tmp, "rewrite.json")
+        start = time.perf_counter()
+        for i in range(transitions):
+            state["data_collected"] = i
+            rewrite_in_place(path, state)
+        results["rewrite_in_place_us"] = (time.perf_counter() - start) / transitions * 1e6
+
+        for fsync in (False, True):
+            count = transitions if not fsync else transitions // 10
+            store = StateStore(os.path.join(tmp, f"journal_{fsync}.json"), checkpoint_every=count + 1, fsync=fsync)
+            state = store.load()
+            start = time.perf_counter()
+            for i in range(count):
+                state["data_collected"] = i
+                store.record(state)
+            results[f"journal_record_us{'_fsync' if fsync else ''}"] = (time.perf_counter() - start) / count * 1e6
+            store.close()
+
+        store = StateStore(os.path.join(tmp, "checkpoint.json"))
+        state = store.load()
+        count = transitions // 10
+        start = time.perf_counter()
+        for i in range(count):
+            state["data_collected"] = i
+            store.checkpoint(state)
+        results["atomic_checkpoint_us"] = (time.perf_counter() - start) / count * 1e6
+
+        for size in journal_sizes:
+            path = os.path.join(tmp, f"recover_{size}.json")
+            store = StateStore(path, checkpoint_every=size + 1)
+            state = store.load()
+            for i in range(size):
+                state["health"] = i % 100
+                state["data_collected"] = i
+                store.record(state)
+            store.close()
+            start = time.perf_counter()
+            recovered = StateStore(path).load()
+            results[f"recover_{size}_entries_ms"] = (time.perf_counter() - start) * 1000
+            assert recovered["data_collected"] == size - 1
+    return results
+
+
+if __name__ == "__main__":
+    report("State persistence", run())
@@ -0,0 +1,58 @@
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.common import best_of, report
+from telemetry_history import TREND_FIELDS, TelemetryHistory
+
+TELEMETRY = {"latitude": 12.5, "longitude": -48.25, "altitude_km": 550.3,
+             "temperature_c": 21.4, "signal_noise_ratio": 18.7}
+
+
+# Fill a history with a day of samples (one per half second)
+def fill(history, count):
+    for i in range(count):
+        history.append(1700000000.0 + i * 0.5, TELEMETRY, 100 - i % 100, 80)
+
+
+# Append cost for in-memory and file-backed histories, trend rows over ten
+# minutes and a full day, and reopening a full file. The baseline for
+# reopening is parsing the same day out of text log lines.
+def run(count=172800):
+    results = {}
+    for name, path in (("memory", None), ("mmap", True)):
+        with tempfile.TemporaryDirectory() as directory:
+            history = TelemetryHistory(count, os.path.join(directory, "history.dat") if path else None)
+            start = time.perf_counter()
+            fill(history, count)
+            elapsed = time.perf_counter() - start
+            results[f"append_{name}_us"] = elapsed / count * 1e6
+            results[f"append_{name}_per_s"] = count / elapsed
+            if path:
+                history.close()
+                results["file_bytes"] = os.path.getsize(history.path)
+                start = time.perf_counter()
+                reopened = TelemetryHistory(path=history.path)
+                results["reopen_ms"] = (time.perf_counter() - start) * 1000
+                results["reopened_samples"] = len(reopened)
+                reopened.close()
+            else:
+                results["trend_rows_10min_us"] = best_of(lambda: [
+                    history.trend_row(label, field, 40, 1200, unit) for label, field, unit in TREND_FIELDS], 20) * 1e6
+                results["trend_rows_day_ms"] = best_of(lambda: [
+                    history.trend_row(label, field, 40, None, unit) for label, field, unit in TREND_FIELDS], 5) * 1000
+
+    lines = [f"Telemetry Update - Lat: 12.5, Lon: -48.25, Alt: 550.3km, Temp: 21.4C, SNR: 18.7dB, Health: {i % 100}%"
+             for i in range(count)]
+
+    def parse():
+        temps = np.array([float(line.split("Temp: ")[1].split("C", 1)[0]) for line in lines])
+        return temps.mean()
+    results["parse_text_day_ms"] = best_of(parse, 2) * 1000
+    return results
+
+
+if __name__ == "__main__":
+    report("Telemetry history", run())
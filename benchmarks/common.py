@@ -0,0 +1,42 @@
+import time
+
+
+# Run fn `repeat` times and return the best wall time in seconds
+def best_of(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# Print benchmark results as aligned "name: value" rows
+def report(title, results):
+    print(title)
+    width = max(len(name) for name in results)
+    for name, value in results.items():
+        if isinstance(value, float):
+            value = f"{value:.6g}"
+        print(f"  {name.ljust(width)}  {value}")
+
+
+# Stand-in for a terminal: claims to be a TTY and discards everything written
+# to it, counting the bytes and writes
+class NullTTY:
+    encoding = "utf-8"
+
+    def __init__(self):
+        self.bytes = 0
+        self.writes = 0
+
+    def write(self, text):
+        self.bytes += len(text.encode("utf-8"))
+        self.writes += 1
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return True
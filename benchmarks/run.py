@@ -0,0 +1,251 @@
+import argparse
+import importlib
+import json
+import os
+import pkgutil
+import platform
+import random
+import statistics
+import sys
+import time
+
+import numpy as np
+
+import benchmarks
+from benchmarks.common import best_of, report
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Allowed relative slowdown before a metric counts as a regression. Wall-clock
+# benchmarks on shared CI machines are noisy (30% swings between identical runs
+# are common), so this is deliberately loose.
+DEFAULT_TOLERANCE = 0.5
+
+# Metric name endings telling which way is better; anything else (counts,
+# sizes of test data) is reported but never flagged
+HIGHER_IS_BETTER = ("_per_s", "_fps")
+LOWER_IS_BETTER = ("_ns", "_us", "_ms", "_s", "_us_per_call", "_bytes")
+
+# Seconds per unit of the timing metrics, by name ending
+TIME_UNITS = (("_us_per_call", 1e-6), ("_ns", 1e-9), ("_us", 1e-6), ("_ms", 1e-3), ("_s", 1.0))
+
+# Timings must also get worse by more than this many seconds to be flagged: a
+# microsecond-scale measurement moves by half of itself with a cache miss or a
+# timer tick, which the relative tolerance alone would report
+NOISE_FLOOR_S = 20e-6
+
+# Worst-case and tail-latency metrics swing several times over with whatever
+# else the machine is doing, so like counts they are reported but never flagged
+NOISY_METRICS = ("jitter", "max_", "p99")
+
+# Correctness results checked on every run whatever the baseline says: flags
+# naming a match (e.g. "pairs_match_1000", "decode_matches") must be true and
+# counts with these endings must be zero
+CHECK_FLAGS = "match"
+ZERO_COUNTS = ("mismatches",)
+
+
+# Every benchmarks/bench_*.py module, by short name ("render" for bench_render)
+def discover():
+    names = []
+    for module in pkgutil.iter_modules(benchmarks.__path__):
+        if module.name.startswith("bench_"):
+            names.append(module.name[len("bench_"):])
+    return sorted(names)
+
+
+# Seconds for a fixed mix of interpreter and numpy work, timed (best of the
+# rounds) before each benchmark. The same tree can run twice as slow on a
+# busier (virtual) machine, so timings are compared after scaling by the
+# median of how much slower this got since each benchmark's baseline.
+def calibrate():
+    values = [random.Random(1).random() for _ in range(100000)]
+    array = np.random.default_rng(1).random(1000000)
+
+    def work():
+        counts = {}
+        for value in sorted(values):
+            key = int(value * 1000)
+            counts[key] = counts.get(key, 0) + 1
+        np.sort(array)
+
+    return best_of(work, 5)
+
+
+# +1 when a bigger value is better, -1 when smaller is, 0 when not comparable
+def direction(metric):
+    if metric.endswith(HIGHER_IS_BETTER):
+        return 1
+    if metric.endswith(LOWER_IS_BETTER):
+        return -1
+    return 0
+
+
+# Seconds per unit of a timing metric, or None for anything else
+def time_unit(metric):
+    if metric.endswith(HIGHER_IS_BETTER):
+        return None
+    for ending, seconds in TIME_UNITS:
+        if metric.endswith(ending):
+            return seconds
+    return None
+
+
+# Whether a result is a correctness check, and whether it passed
+def is_check(metric, value):
+    return metric.endswith(ZERO_COUNTS) or (isinstance(value, bool) and CHECK_FLAGS in metric)
+
+
+def check_passed(value):
+    return value is True if isinstance(value, bool) else value == 0
+
+
+# Correctness checks that failed, as (benchmark, metric, value) tuples
+def failed_checks(results):
+    return [(name, metric, value) for name, metrics in results.items() for metric, value in metrics.items()
+            if is_check(metric, value) and not check_passed(value)]
+
+
+# Metrics that got worse than the baseline by more than `tolerance`, as
+# (benchmark, metric, baseline, current, change) tuples. `speed` is how many
+# times longer the calibration work took than for the baseline; timings and
+# rates are held to the baseline scaled by it (sizes are not). Timings must
+# also be slower by more than `noise_floor` seconds.
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE, speed=1.0, noise_floor=NOISE_FLOOR_S):
+    regressions = []
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            base = baseline.get(name, {}).get(metric)
+            sign = direction(metric)
+            if base is None or not sign or not isinstance(value, (int, float)) or base <= 0:
+                continue
+            if any(word in metric for word in NOISY_METRICS):
+                continue
+            if not metric.endswith("_bytes"):
+                base = base * speed if sign < 0 else base / speed
+            change = (value - base) / base
+            unit = time_unit(metric)
+            if unit is not None and (value - base) * unit <= noise_floor:
+                continue
+            if (sign > 0 and value < base / (1 + tolerance)) or (sign < 0 and value > base * (1 + tolerance)):
+                regressions.append((name, metric, base, value, change))
+    return regressions
+
+
+# Fold one more run of a benchmark into its best values so far (keeping any
+# failed correctness check)
+def keep_best(best, results):
+    for metric, value in results.items():
+        sign = direction(metric)
+        if is_check(metric, value):
+            if not check_passed(value):
+                best[metric] = value
+        elif sign and (value - best[metric]) * sign > 0:
+            best[metric] = value
+    return best
+
+
+# Run each of `modules` (by name) `rounds` times, folding the runs into
+# `results` and the calibration times into `calibration`, keeping the best.
+# Rounds go through every benchmark in turn rather than repeating one, so the
+# runs of each are spread out and a slow spell of the machine does not land
+# on all of them.
+def run_rounds(modules, rounds, results, calibration, elapsed):
+    for _ in range(rounds):
+        for name, module in modules.items():
+            calibration[name] = min(calibration.get(name, float("inf")), calibrate())
+            start = time.perf_counter()
+            run = module.run()
+            elapsed[name] = elapsed.get(name, 0.0) + time.perf_counter() - start
+            results[name] = keep_best(results[name], run) if name in results else run
+
+
+def machine():
+    return {"python": platform.python_version(), "platform": platform.platform(), "processor": platform.machine()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark suite and check it against saved baselines")
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run (default: all of {', '.join(discover())})")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="write these results as the new baseline")
+    parser.add_argument("--output", default=None, help="also write the results to this JSON file")
+    parser.add_argument("--rounds", type=int, default=3,
+                        help="run each benchmark this many times and keep the best of each metric")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed relative slowdown before a metric is flagged (default %(default)s)")
+    args = parser.parse_args(argv)
+
+    names = args.names or discover()
+    modules = {name: importlib.import_module(f"benchmarks.bench_{name}") for name in names}
+    results, calibration, elapsed = {}, {}, {}
+    run_rounds(modules, args.rounds, results, calibration, elapsed)
+    for name in names:
+        report(f"{name} ({elapsed[name]:.1f}s)", results[name])
+
+    def write_output():
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump({"machine": machine(), "calibration_s": calibration, "results": results}, f,
+                          indent=2, sort_keys=True)
+
+    write_output()
+
+    if args.save_baseline:
+        saved = {"machine": machine(), "results": {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                saved = json.load(f)
+        saved["machine"] = machine()
+        saved.setdefault("calibration_s", {}).update(calibration)
+        saved["results"].update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(saved, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline saved to {args.baseline}")
+        return report_checks(results)
+
+    failed = report_checks(results)
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return failed
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("machine") != machine():
+        print(f"Note: baseline was recorded on {baseline.get('machine')}, comparisons are approximate")
+    speeds = [seconds / baseline["calibration_s"][name] for name, seconds in calibration.items()
+              if name in baseline.get("calibration_s", {})]
+    # A faster run is held to the baseline as it is
+    speed = max(1.0, statistics.median(speeds)) if speeds else 1.0
+    print(f"Calibration: {speed:.2f}x the baseline's time")
+    regressions = compare(results, baseline["results"], args.tolerance, speed)
+    if regressions:
+        # A real regression shows up again; a slow spell rarely hits the same
+        # benchmarks twice
+        flagged = list(dict.fromkeys(name for name, *_ in regressions))
+        print(f"Re-running {', '.join(flagged)} to confirm {len(regressions)} regression(s)")
+        run_rounds({name: modules[name] for name in flagged}, args.rounds, results, calibration, elapsed)
+        write_output()
+        regressions = compare(results, baseline["results"], args.tolerance, speed)
+    if not regressions:
+        print(f"No regressions beyond {args.tolerance:.0%} of the baseline")
+        return failed
+    print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%} of the baseline:")
+    for name, metric, base, value, change in regressions:
+        print(f"  {name}.{metric}: {base:.6g} -> {value:.6g} ({change:+.0%})")
+    return 1
+
+
+# Print any failed correctness checks; 1 if there were some, else 0
+def report_checks(results):
+    failed = failed_checks(results)
+    if not failed:
+        return 0
+    print(f"{len(failed)} correctness check(s) failed:")
+    for name, metric, value in failed:
+        print(f"  {name}.{metric}: {value}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
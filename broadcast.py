@@ -0,0 +1,259 @@
+import selectors
+import socket
+import threading
+from collections import deque
+
+# Default port viewers connect to (e.g. `nc host 8766` in a terminal the size
+# of the local console)
+BROADCAST_PORT = 8766
+
+# Bytes a viewer may have queued before it is considered too slow: its queued
+# frames are dropped and it is resynchronized with the next keyframe
+MAX_PENDING_BYTES = 256 * 1024
+
+# Kernel send buffer per viewer. Kept small so a stalled viewer backs up into
+# our queue (where it is noticed and dropped) instead of megabytes of kernel
+# memory per connection.
+SEND_BUFFER_BYTES = 64 * 1024
+
+# Longest line accepted from a viewer that is not the controller
+MAX_LINE = 256
+
+
+# One connected viewer and the frames queued for it
+class Viewer:
+    def __init__(self, sock, address):
+        self.sock = sock
+        self.address = address
+        self.queue = deque()
+        self.offset = 0
+        self.pending = 0
+        self.needs_keyframe = True
+        self.controller = False
+        self.writing = False
+        self.dropped = 0
+        self.line = b""
+
+    def enqueue(self, data):
+        self.queue.append(data)
+        self.pending += len(data)
+
+    # Forget queued frames, except one that is already partly sent, so the
+    # viewer never sees half an escape sequence
+    def drop_pending(self):
+        keep = self.queue.popleft() if self.queue and self.offset else None
+        self.queue.clear()
+        self.pending = 0
+        if keep is not None:
+            self.queue.append(keep)
+            self.pending = len(keep) - self.offset
+
+
+# Fans the console out to TCP viewers. The frame loop calls publish() with the
+# bytes it just wrote to the terminal (a diff against the previous frame);
+# that encodes them once and hands them to the server thread, so its cost does
+# not depend on how many viewers there are. The server thread queues each
+# frame for every viewer and writes with non-blocking sends. A viewer that
+# falls more than max_pending bytes behind has its backlog dropped and gets a
+# full-screen keyframe instead. A viewer that sends "control <token>" becomes
+# the (single) controller, and its keystrokes are passed to on_key.
+class BroadcastServer:
+    def __init__(self, host="127.0.0.1", port=BROADCAST_PORT, max_pending=MAX_PENDING_BYTES,
+                 control_token=None, on_key=None):
+        self.host = host
+        self.port = port
+        self.max_pending = max_pending
+        self.control_token = control_token
+        self.on_key = on_key
+        self.viewers = {}
+        self.frames = 0
+        self.keyframes = 0
+        self.dropped = 0
+        self.bytes_sent = 0
+        self._published = deque()
+        self._want_keyframe = False
+        self._running = False
+        self._thread = None
+        self._selector = selectors.DefaultSelector()
+        self._wake_read, self._wake_write = socket.socketpair()
+        self._wake_read.setblocking(False)
+        self._wake_write.setblocking(False)
+        self._listener = None
+
+    @property
+    def address(self):
+        return self._listener.getsockname()[:2] if self._listener else (self.host, self.port)
+
+    def start(self):
+        self._listener = socket.create_server((self.host, self.port), backlog=512)
+        self._listener.setblocking(False)
+        self._selector.register(self._listener, selectors.EVENT_READ, self._accept)
+        self._selector.register(self._wake_read, selectors.EVENT_READ, self._fan_out)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="broadcast", daemon=True)
+        self._thread.start()
+        return self
+
+    # Called by the frame loop after each terminal write. `keyframe` is the
+    # full redraw (or a function producing it), only needed while a viewer is
+    # waiting for one.
+    def publish(self, frame, keyframe=None):
+        full = None
+        if self._want_keyframe and keyframe is not None:
+            full = keyframe() if callable(keyframe) else keyframe
+            full = full.encode("utf-8") if isinstance(full, str) else full
+        if not frame and full is None:
+            return
+        data = frame.encode("utf-8") if isinstance(frame, str) else frame
+        self._published.append((data, full))
+        try:
+            self._wake_write.send(b"\0")
+        except BlockingIOError:
+            pass
+
+    def stats(self):
+        return {"viewers": len(self.viewers), "frames": self.frames, "keyframes": self.keyframes,
+                "dropped": self.dropped, "bytes_sent": self.bytes_sent}
+
+    def _run(self):
+        while self._running:
+            for key, mask in self._selector.select(0.5):
+                key.data(key.fileobj, mask)
+
+    def _accept(self, listener, mask):
+        while True:
+            try:
+                sock, address = listener.accept()
+            except BlockingIOError:
+                return
+            sock.setblocking(False)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SEND_BUFFER_BYTES)
+            viewer = Viewer(sock, address)
+            self.viewers[sock] = viewer
+            self._want_keyframe = True
+            self._selector.register(sock, selectors.EVENT_READ, self._service)
+
+    # Queue every published frame for every viewer, then send what can be sent
+    def _fan_out(self, wake, mask):
+        try:
+            while wake.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+        while self._published:
+            data, full = self._published.popleft()
+            self.frames += 1
+            if full is not None:
+                self.keyframes += 1
+            for viewer in self.viewers.values():
+                if viewer.needs_keyframe:
+                    if full is not None:
+                        viewer.drop_pending()
+                        viewer.enqueue(full)
+                        viewer.needs_keyframe = False
+                elif viewer.pending + len(data) > self.max_pending:
+                    viewer.drop_pending()
+                    viewer.needs_keyframe = True
+                    viewer.dropped += 1
+                    self.dropped += 1
+                elif data:
+                    viewer.enqueue(data)
+        self._want_keyframe = any(viewer.needs_keyframe for viewer in self.viewers.values())
+        for viewer in list(self.viewers.values()):
+            if viewer.queue:
+                self._flush(viewer)
+
+    def _service(self, sock, mask):
+        viewer = self.viewers.get(sock)
+        if viewer is None:
+            return
+        if mask & selectors.EVENT_READ:
+            self._read(viewer)
+        if mask & selectors.EVENT_WRITE and sock in self.viewers:
+            self._flush(viewer)
+
+    # Send queued frames until done or the socket would block
+    def _flush(self, viewer):
+        try:
+            while viewer.queue:
+                chunk = viewer.queue[0]
+                sent = viewer.sock.send(memoryview(chunk)[viewer.offset:])
+                self.bytes_sent += sent
+                viewer.pending -= sent
+                viewer.offset += sent
+                if viewer.offset < len(chunk):
+                    break
+                viewer.queue.popleft()
+                viewer.offset = 0
+        except BlockingIOError:
+            pass
+        except OSError:
+            self._drop(viewer)
+            return
+        # Only wait for writability while something is left to send
+        if viewer.writing != bool(viewer.queue):
+            viewer.writing = bool(viewer.queue)
+            events = selectors.EVENT_READ | (selectors.EVENT_WRITE if viewer.writing else 0)
+            self._selector.modify(viewer.sock, events, self._service)
+
+    def _read(self, viewer):
+        try:
+            data = viewer.sock.recv(1024)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._drop(viewer)
+            return
+        if viewer.controller:
+            for char in data.decode("utf-8", errors="ignore").lower():
+                if char.isprintable() and self.on_key is not None:
+                    self.on_key(char)
+            return
+        viewer.line = (viewer.line + data)[-MAX_LINE:]
+        while b"\n" in viewer.line:
+            line, viewer.line = viewer.line.split(b"\n", 1)
+            if self._claims_control(line):
+                viewer.controller = True
+                viewer.line = b""
+                return
+
+    def _claims_control(self, line):
+        if not self.control_token or any(viewer.controller for viewer in self.viewers.values()):
+            return False
+        return line.strip() == f"control {self.control_token}".encode()
+
+    def _drop(self, viewer):
+        self.viewers.pop(viewer.sock, None)
+        try:
+            self._selector.unregister(viewer.sock)
+        except (KeyError, ValueError):
+            pass
+        viewer.sock.close()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            try:
+                self._wake_write.send(b"\0")
+            except BlockingIOError:
+                pass
+            self._thread.join(2.0)
+            self._thread = None
+        for viewer in list(self.viewers.values()):
+            self._drop(viewer)
+        if self._listener is not None:
+            self._selector.unregister(self._listener)
+            self._listener.close()
+            self._listener = None
+        self._selector.close()
+        self._wake_read.close()
+        self._wake_write.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
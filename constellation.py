@@ -0,0 +1,312 @@
+import argparse
+import math
+import time
+
+import numpy as np
+
+from orbit import (EARTH_RADIUS_KM, J2000_UNIX, Elements, circular_orbit, concat_elements, load_tles,
+                   make_elements, propagate_eci)
+
+# Pairs closer than this (km) are conjunctions
+CONJUNCTION_KM = 10.0
+
+# Screening covers the whole interval since the previous screen, not just its
+# end: a pair passing within the radius at any time in an interval of up to
+# MAX_STEP seconds is within radius + MAX_CLOSING_KPS * MAX_STEP / 2 of each
+# other at its middle (longer gaps are split). That bound is the game's
+# grid cell size. Two objects in low orbit close at 16 km/s at most (head on).
+MAX_CLOSING_KPS = 16.0
+MAX_STEP = 2.0
+
+# Seconds before the same satellite/object pair is reported again
+COOLDOWN = 600.0
+
+# Cell coordinates are biased to be positive and packed 21 bits each into one
+# int64 key (cells of 1 km reach far beyond geostationary orbit)
+CELL_BIAS = 1 << 20
+CELL_BITS = 21
+
+# Up to this share of points changing cell, re-sorting the previous order is
+# faster than sorting from scratch (about twice as fast at 10%, even at 45%)
+RESORT_SHARE = 0.3
+
+# Synthetic debris: the altitude band (km) it is spread over
+DEBRIS_ALTITUDE_KM = (400.0, 1200.0)
+
+
+# Walker delta constellation: `total` circular orbits in `planes` evenly
+# spaced planes, with adjacent planes offset by `phasing` slots
+def walker_constellation(total, planes, phasing=1, altitude_km=550.0, inclination_deg=97.6, epoch=J2000_UNIX):
+    if total % planes:
+        raise ValueError("satellites must divide evenly into planes")
+    per_plane = total // planes
+    plane, slot = np.divmod(np.arange(total), per_plane)
+    raan = 360.0 * plane / planes
+    phase = 360.0 * slot / per_plane + 360.0 * phasing * plane / total
+    return circular_orbit(np.full(total, altitude_km), inclination_deg, raan, phase, epoch)
+
+
+# Most planes (up to the square root of the count) that divide it evenly
+def walker_planes(total):
+    return max(p for p in range(1, int(total ** 0.5) + 1) if total % p == 0)
+
+
+# A synthetic debris catalog: near-circular orbits over the LEO band, at all
+# inclinations, with random nodes and phases
+def debris_catalog(count, seed=0, epoch=J2000_UNIX):
+    rng = np.random.default_rng(seed)
+    low, high = DEBRIS_ALTITUDE_KM
+    elements = make_elements(
+        EARTH_RADIUS_KM + rng.uniform(low, high, count), rng.uniform(0.0, 0.01, count),
+        np.arccos(rng.uniform(-1.0, 1.0, count)), rng.uniform(0, 2 * np.pi, count),
+        rng.uniform(0, 2 * np.pi, count), rng.uniform(0, 2 * np.pi, count), epoch,
+    )
+    return elements, [f"DEB {n:05d}" for n in range(1, count + 1)]
+
+
+# The objects at the given indices
+def subset(elements, index):
+    return Elements(*(field[index] for field in elements))
+
+
+# Positions (km, Earth-centred inertial) of every object at one time, (n, 3)
+def positions_at(elements, when):
+    x, y, z = propagate_eci(elements, [when])
+    return np.column_stack((x[:, 0], y[:, 0], z[:, 0]))
+
+
+# Indices of the objects whose perigee..apogee band comes within `margin` km
+# of any of the satellites' bands. The orbit model only drifts the angles, so
+# these bands never move and the rest can never come close; they need not be
+# propagated at all.
+def shell_overlap(objects, satellites, margin):
+    low = satellites.a_km * (1 - satellites.e) - margin
+    high = satellites.a_km * (1 + satellites.e) + margin
+    # Merge the satellites' bands into disjoint intervals
+    order = np.argsort(low)
+    low, high = low[order], np.maximum.accumulate(high[order])
+    starts = np.concatenate(([True], low[1:] > high[:-1]))
+    ends = np.concatenate((starts[1:], [True]))
+    low, high = low[starts], high[ends]
+    # An object overlaps if the first interval ending above its perigee
+    # starts below its apogee
+    perigee = objects.a_km * (1 - objects.e)
+    apogee = objects.a_km * (1 + objects.e)
+    first = np.searchsorted(high, perigee)
+    inside = first < len(low)
+    inside[inside] = low[first[inside]] <= apogee[inside]
+    return np.flatnonzero(inside)
+
+
+# Uniform-grid spatial hash over points: each point's cell key, and the point
+# indices sorted by key so each cell is one run found by binary search.
+# update() is incremental: nothing is re-sorted unless a point changed cell,
+# and when only a few did, the previous order is re-sorted by the new keys.
+# It is almost sorted already, which the stable (adaptive) sort handles in
+# close to linear time.
+class SpatialGrid:
+    def __init__(self, cell_km):
+        self.cell_km = cell_km
+        self.positions = None
+        self.keys = None
+        self.order = None
+        self.sorted_keys = None
+        self.moved = 0
+
+    # Biased first, so truncating to integers rounds down
+    def cell_keys(self, positions):
+        cells = (positions * (1 / self.cell_km) + CELL_BIAS).astype(np.int64)
+        return (cells[:, 0] << (2 * CELL_BITS)) | (cells[:, 1] << CELL_BITS) | cells[:, 2]
+
+    def update(self, positions):
+        keys = self.cell_keys(positions)
+        if self.keys is None or len(keys) != len(self.keys):
+            self.moved = len(keys)
+            self.order = np.argsort(keys)
+        else:
+            self.moved = int(np.count_nonzero(keys != self.keys))
+            if self.moved > RESORT_SHARE * len(keys):
+                self.order = np.argsort(keys)
+            elif self.moved:
+                self.order = self.order[np.argsort(keys[self.order], kind="stable")]
+        self.keys = keys
+        self.sorted_keys = keys[self.order]
+        self.positions = positions
+        return self
+
+    # Pairs (query index, point index, distance) of query points within
+    # `radius` (at most the cell size) of a grid point. The three cells along
+    # z are consecutive keys, so the 27 neighbouring cells are 9 key ranges.
+    def query(self, points, radius):
+        if radius > self.cell_km:
+            raise ValueError("query radius is larger than the grid cells")
+        keys = self.cell_keys(points)
+        firsts, counts, owners = [], [], []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                column = keys + (dx << (2 * CELL_BITS)) + (dy << CELL_BITS)
+                first = np.searchsorted(self.sorted_keys, column - 1, "left")
+                last = np.searchsorted(self.sorted_keys, column + 1, "right")
+                hit = np.flatnonzero(last > first)
+                firsts.append(first[hit])
+                counts.append(last[hit] - first[hit])
+                owners.append(hit)
+        firsts, counts, owners = np.concatenate(firsts), np.concatenate(counts), np.concatenate(owners)
+        # Expand each run into one candidate pair per point in it
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        query_index = np.repeat(owners, counts)
+        point_index = self.order[np.repeat(firsts, counts) + offsets]
+        distance = np.linalg.norm(points[query_index] - self.positions[point_index], axis=1)
+        close = distance <= radius
+        return query_index[close], point_index[close], distance[close]
+
+
+# Every pair within `radius` by checking all of them, in chunks; the
+# reference the grid is measured against
+def brute_force_pairs(points, objects, radius, chunk=256):
+    found = []
+    for start in range(0, len(points), chunk):
+        block = points[start:start + chunk]
+        distance = np.linalg.norm(block[:, None, :] - objects[None, :, :], axis=2)
+        query_index, point_index = np.nonzero(distance <= radius)
+        found.append((query_index + start, point_index, distance[query_index, point_index]))
+    return tuple(np.concatenate(parts) for parts in zip(*found))
+
+
+# A constellation of satellites screened against a catalog of debris. Only
+# debris whose altitude band overlaps the constellation's is tracked; each
+# screen() propagates it, updates the grid and reports the conjunctions since
+# the previous screen as alert dicts (closest first), each pair at most once
+# per COOLDOWN seconds. Candidates near the middle of the interval are refined
+# to their closest approach in it, taking the relative motion as straight.
+class Constellation:
+    def __init__(self, satellites, names, debris, debris_names, radius_km=CONJUNCTION_KM, cooldown=COOLDOWN):
+        self.satellites = satellites
+        self.names = list(names)
+        self.catalog_size = len(debris.a_km)
+        tracked = shell_overlap(debris, satellites, radius_km)
+        self.debris = subset(debris, tracked)
+        self.debris_names = [debris_names[k] for k in tracked]
+        self.radius_km = radius_km
+        self.cooldown = cooldown
+        self.grid = SpatialGrid(radius_km + MAX_CLOSING_KPS * MAX_STEP / 2)
+        self.last_when = None
+        self.recent = {}
+        self.last_ms = 0.0
+        self.conjunctions = 0
+
+    # Walker constellation of `count` satellites around the simulator's own
+    # (index 0), sharing its altitude and inclination
+    @classmethod
+    def around(cls, orbit, count, debris, debris_names, **kwargs):
+        altitude = float(orbit.elements.a_km[0]) - EARTH_RADIUS_KM
+        inclination = float(np.degrees(orbit.elements.i[0]))
+        walker = walker_constellation(count, walker_planes(count), 1, altitude, inclination,
+                                      float(orbit.elements.epoch[0]))
+        names = [orbit.name] + [f"{orbit.name.upper()}-{n:04d}" for n in range(1, count + 1)]
+        return cls(concat_elements(orbit.elements, walker), names, debris, debris_names, **kwargs)
+
+    # Debris from a TLE file, or a synthetic catalog of `count` objects
+    @staticmethod
+    def load_debris(path=None, count=20000, seed=0):
+        if path is None:
+            return debris_catalog(count, seed)
+        with open(path) as f:
+            return load_tles(f.read())
+
+    def __len__(self):
+        return len(self.names)
+
+    # New conjunctions between the previous screen and Unix time `when`
+    def screen(self, when):
+        started = time.perf_counter()
+        alerts = []
+        if len(self.debris.a_km):
+            since = when if self.last_when is None or self.last_when > when else self.last_when
+            steps = max(1, math.ceil((when - since) / MAX_STEP))
+            bounds = np.linspace(since, when, steps + 1)
+            for start, end in zip(bounds[:-1], bounds[1:]):
+                alerts.extend(self._screen_interval(start, end))
+            alerts.sort(key=lambda alert: alert["miss_km"])
+            self._forget(when)
+        self.last_when = when
+        self.last_ms = (time.perf_counter() - started) * 1000
+        return alerts
+
+    def _screen_interval(self, start, end):
+        middle, half = (start + end) / 2, (end - start) / 2
+        satellites = positions_at(self.satellites, middle)
+        self.grid.update(positions_at(self.debris, middle))
+        sat_index, debris_index, _ = self.grid.query(satellites, self.radius_km + MAX_CLOSING_KPS * half)
+        if not len(sat_index):
+            return []
+        # Relative position at the middle and velocity (from half a second
+        # either side) of each candidate pair, then the closest approach
+        # within the interval along that line
+        offset = satellites[sat_index] - self.grid.positions[debris_index]
+        satellites, debris = subset(self.satellites, sat_index), subset(self.debris, debris_index)
+        velocity = ((positions_at(satellites, middle + 0.5) - positions_at(debris, middle + 0.5))
+                    - (positions_at(satellites, middle - 0.5) - positions_at(debris, middle - 0.5)))
+        speed_squared = np.maximum(np.einsum("ij,ij->i", velocity, velocity), 1e-12)
+        closest = np.clip(-np.einsum("ij,ij->i", offset, velocity) / speed_squared, -half, half)
+        distance = np.linalg.norm(offset + velocity * closest[:, None], axis=1)
+        when = middle + closest
+        new = [k for k in np.flatnonzero(distance <= self.radius_km)
+               if when[k] - self.recent.get((sat_index[k], debris_index[k]), -np.inf) >= self.cooldown]
+        return [self._alert(sat_index[k], debris_index[k], distance[k], speed_squared[k] ** 0.5, when[k])
+                for k in new]
+
+    def _alert(self, sat_index, debris_index, distance, speed, when):
+        self.recent[(sat_index, debris_index)] = when
+        self.conjunctions += 1
+        return {
+            "kind": "conjunction",
+            "satellite": self.names[sat_index],
+            "satellite_index": int(sat_index),
+            "object": self.debris_names[debris_index],
+            "miss_km": round(float(distance), 2),
+            "velocity_kps": round(float(speed), 1),
+            "epoch_ms": int(when * 1000),
+        }
+
+    def _forget(self, when):
+        if len(self.recent) > 1000:
+            self.recent = {pair: seen for pair, seen in self.recent.items() if when - seen < self.cooldown}
+
+    def stats_line(self):
+        return (f"Constellation: {len(self)} satellites, {len(self.debris_names)}/{self.catalog_size} debris "
+                f"in their shell | screen {self.last_ms:.1f}ms, {self.grid.moved} moved cell | "
+                f"{self.conjunctions} conjunctions")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Screen a constellation against a debris catalog over a time span")
+    parser.add_argument("--satellites", type=int, default=1000)
+    parser.add_argument("--debris", type=int, default=20000, help="size of the synthetic catalog")
+    parser.add_argument("--debris-tle", default=None, help="screen against the objects in this TLE file instead")
+    parser.add_argument("--altitude", type=float, default=550.0)
+    parser.add_argument("--inclination", type=float, default=97.6)
+    parser.add_argument("--minutes", type=float, default=10.0)
+    parser.add_argument("--step", type=float, default=0.5, help="seconds between screenings")
+    parser.add_argument("--radius", type=float, default=CONJUNCTION_KM)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    satellites = walker_constellation(args.satellites, walker_planes(args.satellites), 1, args.altitude,
+                                      args.inclination)
+    names = [f"SAT-{n:04d}" for n in range(1, args.satellites + 1)]
+    debris, debris_names = Constellation.load_debris(args.debris_tle, args.debris, args.seed)
+    constellation = Constellation(satellites, names, debris, debris_names, args.radius)
+    start = time.perf_counter()
+    steps = int(args.minutes * 60 / args.step)
+    for n in range(steps):
+        for alert in constellation.screen(J2000_UNIX + n * args.step):
+            print(f"T+{n * args.step:7.1f}s {alert['object']} passes {alert['satellite']} at "
+                  f"{alert['miss_km']} km, {alert['velocity_kps']} km/s")
+    elapsed = time.perf_counter() - start
+    print(constellation.stats_line())
+    print(f"{steps} screenings in {elapsed:.2f}s ({elapsed / steps * 1000:.2f}ms each)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import argparse
+import io
+import os
+import queue
+import shutil
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+# Earth image used offline and until the first EPIC image arrives
+FIXTURE_IMAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sentinel_fixtures", "epic_earth.png")
+
+# Characters from dark to bright
+ASCII_RAMP = " .:-=+*#%@"
+
+# ascii: plain characters; ansi256: the same characters in the nearest color
+# of the xterm 256-color cube
+PALETTES = ("ascii", "ansi256")
+
+# Terminal cells are about twice as tall as they are wide
+CELL_ASPECT = 2.0
+
+# Decoded images are reduced to at most this many pixels a side before being
+# kept, so resizing re-averages a small array instead of decoding again
+MAX_SOURCE = 512
+
+# Seconds before an image that failed to load is tried again
+RETRY_AFTER = 60.0
+
+RESET = "\x1b[0m"
+
+# Intensities of the six levels of each axis of the xterm color cube, and the
+# midpoints between them
+CUBE_LEVELS = np.array([0, 95, 135, 175, 215, 255])
+CUBE_EDGES = (CUBE_LEVELS[1:] + CUBE_LEVELS[:-1]) / 2
+
+LUMA = np.array([0.2126, 0.7152, 0.0722])
+
+
+# Decode image bytes (PNG, JPEG, ...) to an RGB uint8 array with pygame,
+# imported on first use as in audio.py
+def decode_image(data):
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    import pygame
+
+    surface = pygame.image.load(io.BytesIO(data))
+    # surfarray indexes (x, y); the rest of the module works on rows
+    return np.ascontiguousarray(pygame.surfarray.array3d(surface).transpose(1, 0, 2))
+
+
+# Mean of each of rows x cols equal blocks of the image (centre-cropped so
+# the blocks divide it evenly): summed down each block's rows, then across
+# its columns, so both reductions run over contiguous memory
+def block_average(pixels, rows, cols):
+    height, width = pixels.shape[:2]
+    block_h, block_w = max(1, height // rows), max(1, width // cols)
+    rows, cols = min(rows, height // block_h), min(cols, width // block_w)
+    top, left = (height - rows * block_h) // 2, (width - cols * block_w) // 2
+    crop = pixels[top:top + rows * block_h, left:left + cols * block_w]
+    total = np.uint32 if pixels.dtype == np.uint8 else np.float32
+    sums = crop.reshape(rows, block_h, -1).sum(axis=1, dtype=total)
+    sums = sums.reshape(rows, cols, block_w, -1).sum(axis=2, dtype=total)
+    return sums.astype(np.float32) / (block_h * block_w)
+
+
+# Reduce a decoded image to at most MAX_SOURCE pixels a side
+def reduce_source(pixels, limit=MAX_SOURCE):
+    factor = -(-max(pixels.shape[:2]) // limit)
+    if factor <= 1:
+        return pixels.astype(np.float32)
+    return block_average(pixels, pixels.shape[0] // factor, pixels.shape[1] // factor)
+
+
+# Largest rows x cols of terminal cells within the limits that keeps the
+# image's proportions
+def fit_cells(height, width, max_rows, max_cols, aspect=CELL_ASPECT):
+    cols = max_cols
+    rows = round(cols * height / width / aspect)
+    if rows > max_rows:
+        rows = max_rows
+        cols = round(rows * aspect * width / height)
+    return max(1, min(rows, height)), max(1, min(cols, width))
+
+
+# Terminal lines showing an RGB image in at most max_rows x max_cols cells:
+# brightness picks the character and, for ansi256, the block's mean color
+# picks its xterm-256 color. Every color change starts with a reset so the
+# renderer never accumulates styles along a line.
+def render_lines(pixels, max_rows, max_cols, palette="ansi256"):
+    if palette not in PALETTES:
+        raise ValueError(f"unknown palette {palette!r}")
+    rows, cols = fit_cells(pixels.shape[0], pixels.shape[1], max_rows, max_cols)
+    cells = block_average(pixels, rows, cols)[..., :3]
+    levels = np.minimum((cells @ LUMA * (len(ASCII_RAMP) / 256.0)).astype(np.intp), len(ASCII_RAMP) - 1)
+    chars = np.array(list(ASCII_RAMP))[levels]
+    pad = " " * ((max_cols - chars.shape[1]) // 2)
+    if palette == "ascii":
+        return [pad + "".join(row) for row in chars]
+    cube = np.searchsorted(CUBE_EDGES, cells)
+    codes = (16 + 36 * cube[..., 0] + 6 * cube[..., 1] + cube[..., 2]).tolist()
+    lines = []
+    for row_chars, row_codes in zip(chars.tolist(), codes):
+        out = [pad]
+        current = None
+        for char, code in zip(row_chars, row_codes):
+            if char == " ":
+                if current is not None:
+                    out.append(RESET)
+                    current = None
+            elif code != current:
+                out.append(f"{RESET}\x1b[38;5;{code}m")
+                current = code
+            out.append(char)
+        if current is not None:
+            out.append(RESET)
+        lines.append("".join(out))
+    return lines
+
+
+# Renders images as terminal lines on a background thread. lines() answers
+# from a cache keyed by (image, rows, cols, palette); on a miss it queues the
+# work and returns None, and a later call finds the result. Decoded images
+# are kept too (reduced to MAX_SOURCE), so a new terminal size or palette
+# only re-averages them. `load(image)` returns the encoded bytes of an image.
+class EpicView:
+    def __init__(self, load, palette="ansi256", max_frames=64, max_images=8):
+        self.load = load
+        self.palette = palette
+        self.max_frames = max_frames
+        self.max_images = max_images
+        self.frames = OrderedDict()
+        self.images = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.decodes = 0
+        self.error = None
+        self._failed = {}
+        self._pending = set()
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="epic-view", daemon=True)
+                self._thread.start()
+        return self
+
+    def lines(self, image, rows, cols, palette=None):
+        key = (image, rows, cols, palette or self.palette)
+        with self._lock:
+            frame = self.frames.get(key)
+            if frame is not None:
+                self.frames.move_to_end(key)
+                self.hits += 1
+                return frame
+            if key in self._pending or time.monotonic() < self._failed.get(image, 0.0):
+                return None
+            self.misses += 1
+            self._pending.add(key)
+        self.start()
+        self._queue.put(key)
+        return None
+
+    # Render one frame on the calling thread, through the image cache
+    def render(self, image, rows, cols, palette="ansi256"):
+        pixels = self.images.get(image)
+        if pixels is None:
+            pixels = reduce_source(decode_image(self.load(image)))
+            self.decodes += 1
+            self.images[image] = pixels
+            if len(self.images) > self.max_images:
+                self.images.popitem(last=False)
+        else:
+            self.images.move_to_end(image)
+        return render_lines(pixels, rows, cols, palette)
+
+    def _run(self):
+        while True:
+            key = self._queue.get()
+            if key is None:
+                break
+            try:
+                frame = self.render(*key)
+            except Exception as e:  # bad image data or a failed download
+                frame = None
+                self.error = str(e) or type(e).__name__
+            with self._lock:
+                self._pending.discard(key)
+                if frame is None:
+                    self._failed[key[0]] = time.monotonic() + RETRY_AFTER
+                    continue
+                self.error = None
+                self.frames[key] = frame
+                if len(self.frames) > self.max_frames:
+                    self.frames.popitem(last=False)
+
+    def close(self, timeout=2.0):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+
+
+# Loader for EpicView: local files by path, anything else as an EPIC image
+# name fetched (and cached) through the NASA client
+def image_loader(client=None):
+    def load(image):
+        if client is None or os.path.exists(image):
+            with open(image, "rb") as f:
+                return f.read()
+        return client.fetch_epic_image(image)
+    return load
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show an EPIC (or any other) image in the terminal")
+    parser.add_argument("image", nargs="?", default=FIXTURE_IMAGE)
+    parser.add_argument("--palette", choices=PALETTES, default="ansi256")
+    parser.add_argument("--rows", type=int, default=None)
+    parser.add_argument("--cols", type=int, default=None)
+    args = parser.parse_args()
+    size = shutil.get_terminal_size()
+    with open(args.image, "rb") as f:
+        data = f.read()
+    start = time.perf_counter()
+    pixels = decode_image(data)
+    decoded = time.perf_counter()
+    lines = render_lines(reduce_source(pixels), args.rows or size.lines - 2, args.cols or size.columns, args.palette)
+    rendered = time.perf_counter()
+    print("\n".join(lines))
+    print(f"{pixels.shape[1]}x{pixels.shape[0]} decoded in {(decoded - start) * 1000:.0f}ms, "
+          f"rendered in {(rendered - decoded) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
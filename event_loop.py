@@ -0,0 +1,203 @@
+import os
+import platform
+import selectors
+import socket
+import sys
+import time
+from collections import deque
+
+from frame_metrics import NULL_METRICS
+
+if platform.system() == "Windows":
+    import msvcrt
+else:
+    import termios
+    import tty
+
+# How often the Windows console is polled for keys, since it cannot be selected on
+WINDOWS_POLL_INTERVAL = 0.005
+
+
+# Put the terminal into cbreak mode (unbuffered, no echo) for the whole session
+# instead of switching modes around every read. Ctrl+C still raises
+# KeyboardInterrupt and output post-processing is left alone.
+class RawTerminal:
+    def __init__(self, stream=None):
+        self.stream = stream if stream is not None else sys.stdin
+        self._saved = None
+
+    def __enter__(self):
+        if platform.system() != "Windows" and self.stream.isatty():
+            fd = self.stream.fileno()
+            self._saved = termios.tcgetattr(fd)
+            tty.setcbreak(fd, termios.TCSANOW)
+        return self
+
+    def __exit__(self, *exc):
+        if self._saved is not None:
+            termios.tcsetattr(self.stream.fileno(), termios.TCSADRAIN, self._saved)
+            self._saved = None
+
+
+# Fixed-timestep scheduler driving the animation from a single clock. Between
+# ticks it waits in select() on stdin, registered readers and a wake-up socket
+# for other threads, so keys are picked up the moment they arrive and handed
+# to the next tick. Deadlines advance by exactly one tick; when a tick starts
+# more than one period late the schedule is realigned and a miss is counted.
+# With a FrameMetrics, the time spent waiting ("sleep"), handling input and
+# other readers ("input") and in on_tick ("frame") is recorded every tick.
+class FrameScheduler:
+    def __init__(self, tick, stdin=None, metrics=NULL_METRICS):
+        self.tick = tick
+        self.stdin = stdin if stdin is not None else sys.stdin
+        self.metrics = metrics
+        self.keys = deque()
+        self.ticks = 0
+        self.deadline_misses = 0
+        self.max_jitter = 0.0
+        self._jitter_total = 0.0
+        self._slept = 0.0
+        self._handling = 0.0
+        self._running = False
+        self._deadline = None
+        self._timers = []
+        self._callbacks = deque()
+        self._windows = platform.system() == "Windows"
+        self._selector = selectors.DefaultSelector()
+        # A socket pair rather than a pipe, so the wake-up also works with the
+        # Windows selector, which only accepts sockets
+        self._wake_read, self._wake_write = socket.socketpair()
+        self._wake_read.setblocking(False)
+        self._wake_write.setblocking(False)
+        self._selector.register(self._wake_read, selectors.EVENT_READ, self._drain_wakeups)
+        if not self._windows and self.stdin is not None:
+            self._selector.register(self.stdin, selectors.EVENT_READ, self._read_stdin)
+
+    # Call back when a file object becomes readable (e.g. a socket)
+    def add_reader(self, fileobj, callback):
+        self._selector.register(fileobj, selectors.EVENT_READ, lambda _: callback(fileobj))
+
+    def remove_reader(self, fileobj):
+        self._selector.unregister(fileobj)
+
+    # Run callback every `interval` seconds on the scheduler's thread
+    def add_timer(self, interval, callback):
+        self._timers.append([time.monotonic() + interval, interval, callback])
+
+    # Schedule fn on the scheduler's thread from any other thread
+    def call_soon_threadsafe(self, fn):
+        self._callbacks.append(fn)
+        try:
+            self._wake_write.send(b"\0")
+        except BlockingIOError:
+            pass
+
+    # Push the next tick back, e.g. to hold a notice on screen; input is still read
+    def delay(self, seconds):
+        if self._deadline is not None:
+            self._deadline += seconds
+
+    def stop(self):
+        self._running = False
+
+    # Average and worst lateness of ticks, in seconds
+    @property
+    def mean_jitter(self):
+        return self._jitter_total / self.ticks if self.ticks else 0.0
+
+    def stats_line(self):
+        return (f"Ticks: {self.ticks} | Missed: {self.deadline_misses} | "
+                f"Jitter: {self.mean_jitter * 1000:.2f}ms avg, {self.max_jitter * 1000:.2f}ms max")
+
+    # Call on_tick(key) once per tick until it returns False or stop() is called.
+    # `key` is the oldest unprocessed keypress, or None.
+    def run(self, on_tick):
+        metrics = self.metrics
+        self._running = True
+        self._deadline = time.monotonic() + self.tick
+        while self._running:
+            now = time.monotonic()
+            wait = self._deadline - now
+            for timer in self._timers:
+                wait = min(wait, timer[0] - now)
+            self._wait(max(0.0, wait))
+
+            now = time.monotonic()
+            for timer in self._timers:
+                if now >= timer[0]:
+                    timer[0] = now + timer[1]
+                    timer[2]()
+            if now < self._deadline:
+                continue
+
+            lateness = now - self._deadline
+            self._jitter_total += lateness
+            self.max_jitter = max(self.max_jitter, lateness)
+            self.ticks += 1
+            metrics.count("ticks")
+            if lateness > self.tick:
+                self.deadline_misses += 1
+                metrics.count("deadline_misses")
+                self._deadline = now + self.tick
+            else:
+                self._deadline += self.tick
+            metrics.observe("sleep", self._slept)
+            metrics.observe("input", self._handling)
+            self._slept = self._handling = 0.0
+
+            key = self.keys.popleft() if self.keys else None
+            started = metrics.clock()
+            if on_tick(key) is False:
+                self._running = False
+            metrics.observe("frame", metrics.clock() - started)
+
+    def _wait(self, timeout):
+        clock = self.metrics.clock
+        if self._windows:
+            end = time.monotonic() + timeout
+            pending = len(self.keys)
+            while True:
+                started = clock()
+                self._poll_windows_keys()
+                for key, _ in self._selector.select(0):
+                    key.data(key.fileobj)
+                handled = clock()
+                self._handling += handled - started
+                remaining = end - time.monotonic()
+                if remaining <= 0 or len(self.keys) > pending:
+                    return
+                time.sleep(min(remaining, WINDOWS_POLL_INTERVAL))
+                self._slept += clock() - handled
+        started = clock()
+        ready = self._selector.select(timeout)
+        selected = clock()
+        for key, _ in ready:
+            key.data(key.fileobj)
+        self._slept += selected - started
+        self._handling += clock() - selected
+
+    def _read_stdin(self, stream):
+        data = os.read(stream.fileno(), 64)
+        if not data:
+            self._selector.unregister(stream)
+            return
+        for char in data.decode("utf-8", errors="ignore").lower():
+            self.keys.append(char)
+
+    def _poll_windows_keys(self):
+        while msvcrt.kbhit():
+            self.keys.append(msvcrt.getch().decode("utf-8", errors="ignore").lower())
+
+    def _drain_wakeups(self, _):
+        try:
+            while self._wake_read.recv(512):
+                pass
+        except BlockingIOError:
+            pass
+        while self._callbacks:
+            self._callbacks.popleft()()
+
+    def close(self):
+        self._selector.close()
+        self._wake_read.close()
+        self._wake_write.close()
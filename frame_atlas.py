@@ -0,0 +1,72 @@
+from collections import namedtuple
+
+# One prebuilt animation frame: its colorized, prefixed screen lines, so drawing
+# a frame never has to rebuild or recolor it. The renderer diffs lines cell by
+# cell, so lines (not encoded bytes) are the form it can use directly.
+AtlasFrame = namedtuple("AtlasFrame", ["lines"])
+
+
+# Lookup table of every (health tier, activity state, frame index) combination.
+# Tiers are (threshold, transform) pairs checked in order: a tier applies when
+# health > threshold, and a threshold of None catches everything else.
+class FrameAtlas:
+    def __init__(self, tiers, colorize, prefix=""):
+        self.tiers = list(tiers)
+        self.colorize = colorize
+        self.prefix = prefix
+        self.frame_sets = {}
+        self._entries = {}
+
+    # Register the raw frames for an activity state (e.g. "scanning")
+    def add_frame_set(self, state, frames):
+        self.frame_sets[state] = list(frames)
+        self._drop(state=state)
+
+    # Add a health tier; tiers are kept ordered from highest threshold down
+    def add_tier(self, threshold, transform):
+        self.tiers.append((threshold, transform))
+        self.tiers.sort(key=lambda tier: float("-inf") if tier[0] is None else tier[0], reverse=True)
+        self._entries.clear()
+
+    # Index of the first tier whose threshold the health value exceeds
+    def tier_for(self, health):
+        for index, (threshold, _) in enumerate(self.tiers):
+            if threshold is None or health > threshold:
+                return index
+        return len(self.tiers) - 1
+
+    # Prebuilt frames for a health value and activity state, built on first use
+    def frames(self, health, state):
+        key = (self.tier_for(health), state)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._build(*key)
+        return entry
+
+    # Single frame lookup for callers that track the frame index themselves
+    def frame(self, health, state, index):
+        frames = self.frames(health, state)
+        return frames[index % len(frames)]
+
+    # Eagerly build every tier and state, e.g. at startup before the first frame
+    def build(self):
+        for tier_index in range(len(self.tiers)):
+            for state in self.frame_sets:
+                if (tier_index, state) not in self._entries:
+                    self._build(tier_index, state)
+        return self
+
+    def _build(self, tier_index, state):
+        _, transform = self.tiers[tier_index]
+        built = []
+        for frame in self.frame_sets[state]:
+            text = self.colorize(transform(frame), state)
+            lines = tuple(self.prefix + line for line in text.split("\n"))
+            built.append(AtlasFrame(lines))
+        entry = tuple(built)
+        self._entries[(tier_index, state)] = entry
+        return entry
+
+    def _drop(self, state):
+        for key in [key for key in self._entries if key[1] == state]:
+            del self._entries[key]
@@ -0,0 +1,145 @@
+import bisect
+import json
+import time
+
+# Phases of one animation frame that are timed
+PHASES = ("input", "screen", "compose", "write", "log", "persist", "sleep", "frame")
+
+# Histogram buckets: 20 per decade from 1 microsecond to 100 seconds (upper
+# bounds, in seconds), so any quantile is within ~12% of the true value
+BUCKETS_PER_DECADE = 20
+BUCKET_BOUNDS = tuple(10 ** (exponent / BUCKETS_PER_DECADE - 6) for exponent in range(8 * BUCKETS_PER_DECADE + 1))
+
+# Prefix of every exported Prometheus metric
+METRIC_PREFIX = "satellite"
+
+
+# Fixed-size log-bucketed histogram of durations in seconds. Recording is a
+# binary search and an increment, and memory does not grow with the run.
+class Histogram:
+    def __init__(self, bounds=BUCKET_BOUNDS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    # Value below which a fraction q of observations fall, interpolated
+    # within the bucket it lands in
+    def quantile(self, q):
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.bounds[index - 1] if index else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / count, self.max)
+            seen += count
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self):
+        return {"count": self.count, "sum": self.total, "mean": self.mean,
+                "p50": self.quantile(0.5), "p99": self.quantile(0.99), "max": self.max}
+
+
+# Per-phase frame timings plus event counters (ticks, deadline misses). Hot
+# paths call clock() and observe(); the overlay and exports read summaries.
+class FrameMetrics:
+    enabled = True
+
+    def __init__(self, phases=PHASES):
+        self.histograms = {phase: Histogram() for phase in phases}
+        self.counters = {"ticks": 0, "deadline_misses": 0}
+        self.started = time.time()
+
+    clock = staticmethod(time.perf_counter)
+
+    def observe(self, phase, seconds):
+        self.histograms[phase].observe(seconds)
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    # Lines for the on-screen overlay: p50/p99/max per phase and the counters
+    def overlay_lines(self):
+        lines = []
+        for phase, histogram in self.histograms.items():
+            if histogram.count:
+                lines.append(f"{phase:>8}: p50 {histogram.quantile(0.5) * 1000:7.3f}ms  "
+                             f"p99 {histogram.quantile(0.99) * 1000:7.3f}ms  max {histogram.max * 1000:7.3f}ms")
+        lines.append(" | ".join(f"{name}: {value}" for name, value in self.counters.items()))
+        return lines
+
+    def to_dict(self):
+        return {
+            "started": self.started,
+            "duration": time.time() - self.started,
+            "phases": {phase: histogram.summary() for phase, histogram in self.histograms.items()},
+            "counters": dict(self.counters),
+        }
+
+    # Prometheus text exposition format: a summary per phase and a counter
+    # per event, suitable for the node exporter's textfile collector
+    def to_prometheus(self):
+        name = f"{METRIC_PREFIX}_frame_phase_seconds"
+        lines = [f"# HELP {name} Time spent in each phase of an animation frame.",
+                 f"# TYPE {name} summary"]
+        for phase, histogram in self.histograms.items():
+            for q in (0.5, 0.99):
+                lines.append(f'{name}{{phase="{phase}",quantile="{q}"}} {histogram.quantile(q):.9f}')
+            lines.append(f'{name}_sum{{phase="{phase}"}} {histogram.total:.9f}')
+            lines.append(f'{name}_count{{phase="{phase}"}} {histogram.count}')
+        lines.append(f"# HELP {name}_max Slowest observation of each phase.")
+        lines.append(f"# TYPE {name}_max gauge")
+        for phase, histogram in self.histograms.items():
+            lines.append(f'{name}_max{{phase="{phase}"}} {histogram.max:.9f}')
+        for counter, value in self.counters.items():
+            lines.append(f"# TYPE {METRIC_PREFIX}_{counter}_total counter")
+            lines.append(f"{METRIC_PREFIX}_{counter}_total {value}")
+        return "\n".join(lines) + "\n"
+
+    # Write JSON for a .json path, Prometheus text otherwise
+    def export(self, path):
+        with open(path, "w") as f:
+            if path.endswith(".json"):
+                json.dump(self.to_dict(), f, indent=2)
+                f.write("\n")
+            else:
+                f.write(self.to_prometheus())
+
+
+# Stand-in used when instrumentation is off: the same interface with nothing
+# behind it, so the frame loop pays one no-op call per measurement
+class NullMetrics:
+    enabled = False
+
+    def clock(self):
+        return 0.0
+
+    def observe(self, phase, seconds):
+        pass
+
+    def count(self, name, amount=1):
+        pass
+
+    def overlay_lines(self):
+        return []
+
+    def export(self, path):
+        pass
+
+
+NULL_METRICS = NullMetrics()
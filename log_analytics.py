@@ -0,0 +1,395 @@
+import argparse
+import json
+import mmap
+import multiprocessing
+import os
+import re
+from collections import Counter
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from mission_log import LOG_FILE
+from telemetry_history import sparkline
+
+# One log record in either format the mission log writes:
+#   [2026-10-17 02:18:08] message
+#   {"ts": "2026-10-17T02:18:08.123", "message": "message", ...}
+# Anything else on a line is counted as unparsed.
+LINE_RE = re.compile(
+    rb'^(?:\[(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\] ([^\n]*)'
+    rb'|\{"ts": "(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d)[^"\n]*", "message": "((?:[^"\\\n]|\\.)*)"[^\n]*'
+    rb'|([^\n]+))$',
+    re.M,
+)
+
+# Message kinds the simulator logs, matched at the start of the message. A
+# kind with a group keeps what it captured (event names, health readings).
+MESSAGE_KINDS = [
+    ("telemetry", rb"Telemetry - .*Health: (\d+)"),
+    ("event", rb"EVENT: (.*)"),
+    ("event_outcome", rb"Event Outcome: (.*)"),
+    ("scan_started", rb"Initiated sector scan"),
+    ("scan_completed", rb"Scan completed"),
+    ("transmit_started", rb"Initiated data transmission"),
+    ("transmit_completed", rb"Transmission completed"),
+    ("transmit_disrupted", rb"Transmission disrupted"),
+    ("repair_started", rb"Initiated repairs"),
+    ("repair_completed", rb"Repairs completed"),
+    ("failure", rb"Satellite failure: (.*)"),
+    ("session", rb"Session seed"),
+]
+KIND_RE = re.compile(b"|".join(b"(?P<%s>%s)" % (name.encode(), pattern) for name, pattern in MESSAGE_KINDS))
+
+# Group holding each kind's captured detail, if it has one
+DETAIL_GROUPS = {name: KIND_RE.groupindex[name] + 1 for name, pattern in MESSAGE_KINDS if b"(" in pattern}
+
+# Health trajectory resolution: how much of the timestamp names a bucket
+BUCKET_WIDTHS = {"minute": 16, "hour": 13, "day": 10}
+
+# Bytes between entries of the timestamp index
+INDEX_STRIDE = 256 << 10
+
+# Bytes of the file start kept in the index to notice the log was rotated
+INDEX_HEAD = 64
+
+# Ranges smaller than this per worker are scanned in this process
+PARALLEL_MIN_BYTES = 32 << 20
+
+
+# A record's timestamp as the bytes "YYYY-mm-dd HH:MM:SS", which sort in
+# time order, from a LINE_RE match (None for unparsed lines)
+def line_time(line):
+    if line.group(1) is not None:
+        return line.group(1)
+    if line.group(3) is not None:
+        return line.group(3).replace(b"T", b" ")
+    return None
+
+
+# Sampled index from timestamps to byte offsets, stored next to the log as
+# <log>.idx.npz. Every INDEX_STRIDE bytes it records the offset and time of
+# the next record, so a time range maps to a byte range without reading the
+# records in between. The log only grows, so refreshing extends the index
+# from where it stopped; a log that shrank or changed its first bytes (it
+# was rotated) is indexed afresh.
+class LogIndex:
+    def __init__(self, path, stride=INDEX_STRIDE):
+        self.path = path
+        self.index_path = path + ".idx.npz"
+        self.stride = stride
+        self.times = np.zeros(0, dtype="S19")
+        self.offsets = np.zeros(0, dtype=np.int64)
+        self.size = 0
+
+    def _load(self, head, size):
+        try:
+            with np.load(self.index_path) as saved:
+                if (int(saved["stride"]) != self.stride or bytes(saved["head"]) != head
+                        or int(saved["size"]) > size):
+                    return
+                self.times, self.offsets, self.size = saved["times"], saved["offsets"], int(saved["size"])
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def _save(self, head):
+        temp = self.index_path + ".tmp"
+        try:
+            with open(temp, "wb") as f:
+                np.savez(f, times=self.times, offsets=self.offsets, size=self.size,
+                         stride=self.stride, head=np.frombuffer(head, dtype=np.uint8))
+            os.replace(temp, self.index_path)
+        except OSError:
+            pass
+
+    # Bring the index up to date with the log; returns self
+    def refresh(self):
+        size = os.path.getsize(self.path)
+        if not size:
+            return self
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            head = data[:INDEX_HEAD]
+            self._load(head, size)
+            if self.size == size:
+                return self
+            times, offsets = list(self.times), list(self.offsets)
+            position = int(self.offsets[-1]) + self.stride if len(self.offsets) else 0
+            while position < size:
+                # The first timestamped record starting at or after position
+                if position and data[position - 1] != ord("\n"):
+                    position = data.find(b"\n", position) + 1 or size
+                entry = None
+                for line in LINE_RE.finditer(data, position):
+                    when = line_time(line)
+                    if when is not None:
+                        entry = when, line.start(), line.end()
+                        break
+                # A partly written last record is indexed next time
+                if entry is None or entry[2] >= size:
+                    break
+                times.append(entry[0])
+                offsets.append(entry[1])
+                position = entry[1] + self.stride
+            self.times = np.array(times, dtype="S19")
+            self.offsets = np.array(offsets, dtype=np.int64)
+            self.size = size
+            self._save(head)
+        return self
+
+    # Byte range holding every record between since and until (inclusive,
+    # as "YYYY-mm-dd HH:MM:SS" bytes; None for unbounded)
+    def range(self, since=None, until=None):
+        start, end = 0, os.path.getsize(self.path)
+        if since is not None and len(self.times):
+            before = np.searchsorted(self.times, since, "left") - 1
+            if before >= 0:
+                start = int(self.offsets[before])
+        if until is not None and len(self.times):
+            after = np.searchsorted(self.times, until, "right")
+            if after < len(self.offsets):
+                end = int(self.offsets[after])
+        return start, end
+
+
+# Aggregates over a stretch of log records. Summaries of consecutive ranges
+# merge into the summary of the whole.
+class LogSummary:
+    def __init__(self, bucket="hour"):
+        self.bucket = bucket
+        self.records = 0
+        self.unparsed = 0
+        self.first = None
+        self.last = None
+        self.kinds = Counter()
+        self.events = Counter()
+        self.outcomes = Counter()
+        self.failures = Counter()
+        # Health by bucket: [readings, total, lowest, highest]
+        self.health = {}
+
+    # Add the records in data[start:end] (which starts at a line) that fall
+    # between since and until
+    def scan(self, data, start, end, since=None, until=None):
+        kinds, events, outcomes, failures, health = self.kinds, self.events, self.outcomes, self.failures, self.health
+        width = BUCKET_WIDTHS[self.bucket]
+        match_kind = KIND_RE.match
+        records = unparsed = 0
+        first = last = None
+        for line in LINE_RE.finditer(data, start, end):
+            when, message, json_when, json_message, other = line.groups()
+            if when is None:
+                if json_when is None:
+                    # Without a time of their own, these only count when
+                    # the whole log is summarized
+                    if since is None and until is None:
+                        unparsed += 1
+                    continue
+                when, message = json_when.replace(b"T", b" "), json_message
+                if b"\\" in message:
+                    message = json.loads(b'"' + message + b'"').encode()
+            if since is not None and when < since or until is not None and when > until:
+                continue
+            records += 1
+            if first is None:
+                first = when
+            last = when
+            kind = match_kind(message)
+            if kind is None:
+                kinds["other"] += 1
+                continue
+            name = kind.lastgroup
+            kinds[name] += 1
+            if name == "telemetry":
+                reading = int(kind.group(DETAIL_GROUPS[name]))
+                key = when[:width]
+                stats = health.get(key)
+                if stats is None:
+                    health[key] = [1, reading, reading, reading]
+                else:
+                    stats[0] += 1
+                    stats[1] += reading
+                    if reading < stats[2]:
+                        stats[2] = reading
+                    elif reading > stats[3]:
+                        stats[3] = reading
+            elif name == "event":
+                events[kind.group(DETAIL_GROUPS[name])] += 1
+            elif name == "event_outcome":
+                outcomes[kind.group(DETAIL_GROUPS[name])] += 1
+            elif name == "failure":
+                failures[kind.group(DETAIL_GROUPS[name])] += 1
+        self.records += records
+        self.unparsed += unparsed
+        if first is not None:
+            self.first = first if self.first is None else min(self.first, first)
+            self.last = last if self.last is None else max(self.last, last)
+        return self
+
+    def merge(self, other):
+        self.records += other.records
+        self.unparsed += other.unparsed
+        for mine, theirs in ((self.kinds, other.kinds), (self.events, other.events),
+                             (self.outcomes, other.outcomes), (self.failures, other.failures)):
+            mine.update(theirs)
+        for key, (count, total, low, high) in other.health.items():
+            stats = self.health.get(key)
+            if stats is None:
+                self.health[key] = [count, total, low, high]
+            else:
+                stats[0] += count
+                stats[1] += total
+                stats[2] = min(stats[2], low)
+                stats[3] = max(stats[3], high)
+        if other.first is not None:
+            self.first = other.first if self.first is None else min(self.first, other.first)
+            self.last = other.last if self.last is None else max(self.last, other.last)
+        return self
+
+    # Transmission disruptions per transmission started
+    def interference_rate(self):
+        started = self.kinds["transmit_started"]
+        return self.kinds["transmit_disrupted"] / started if started else 0.0
+
+    # Health readings per bucket as (bucket, mean, lowest, highest), in time order
+    def health_trajectory(self):
+        return [(key.decode(), total / count, low, high)
+                for key, (count, total, low, high) in sorted(self.health.items())]
+
+    def to_dict(self):
+        text = lambda counter: {key.decode("utf-8", "replace"): count for key, count in counter.most_common()}
+        return {
+            "records": self.records,
+            "unparsed": self.unparsed,
+            "first": self.first.decode() if self.first else None,
+            "last": self.last.decode() if self.last else None,
+            "kinds": dict(self.kinds.most_common()),
+            "events": text(self.events),
+            "event_outcomes": text(self.outcomes),
+            "failures": text(self.failures),
+            "interference_rate": self.interference_rate(),
+            "health": [{"bucket": key, "mean": mean, "min": low, "max": high}
+                       for key, mean, low, high in self.health_trajectory()],
+        }
+
+    # Human-readable report
+    def report_lines(self, name=""):
+        kinds = self.kinds
+        lines = [f"{name}: {self.records:,} records"
+                 + (f" from {self.first.decode()} to {self.last.decode()}" if self.first else "")
+                 + (f" ({self.unparsed:,} unparsed lines)" if self.unparsed else "")]
+        lines.append(f"Scans: {kinds['scan_started']} started, {kinds['scan_completed']} completed")
+        lines.append(f"Transmissions: {kinds['transmit_started']} started, {kinds['transmit_completed']} completed, "
+                     f"{kinds['transmit_disrupted']} disruptions from interference "
+                     f"({self.interference_rate():.2f} per transmission)")
+        lines.append(f"Repairs: {kinds['repair_started']} started, {kinds['repair_completed']} completed")
+        lines.append(f"Sessions: {kinds['session']} | Telemetry readings: {kinds['telemetry']}")
+        for title, counter in (("Events", self.events), ("Event outcomes", self.outcomes), ("Failures", self.failures)):
+            if counter:
+                lines.append(f"{title}:")
+                lines.extend(f"  {count:6}  {key.decode('utf-8', 'replace')}" for key, count in counter.most_common())
+        trajectory = self.health_trajectory()
+        if trajectory:
+            means = np.array([mean for _, mean, _, _ in trajectory])
+            lines.append(f"Health by {self.bucket}: {sparkline(means, 0, 100)}")
+            lines.extend(f"  {key}  mean {mean:5.1f}  min {low:3}  max {high:3}"
+                         for key, mean, low, high in trajectory)
+        return lines
+
+
+# Summarize data[start:end] of one log file (run in a worker process)
+def _scan_range(task):
+    path, start, end, since, until, bucket = task
+    summary = LogSummary(bucket)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return summary.scan(data, start, end, since, until)
+
+
+# Split [start, end) into up to `parts` ranges that begin at line starts
+def _split(data, start, end, parts):
+    bounds = [start]
+    for part in range(1, parts):
+        cut = data.find(b"\n", start + (end - start) * part // parts, end) + 1
+        if cut > bounds[-1]:
+            bounds.append(cut)
+    bounds.append(end)
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+# Summarize one log file between since and until. A time range is looked up
+# in the timestamp index first, and large ranges are split across `workers`
+# processes (default: one per CPU).
+def analyze(path=LOG_FILE, since=None, until=None, bucket="hour", workers=None, use_index=True):
+    summary = LogSummary(bucket)
+    size = os.path.getsize(path)
+    if not size:
+        return summary
+    start, end = 0, size
+    if use_index and (since is not None or until is not None):
+        start, end = LogIndex(path).refresh().range(since, until)
+    workers = workers or os.cpu_count() or 1
+    parts = max(1, min(workers, (end - start) // PARALLEL_MIN_BYTES))
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        if parts == 1:
+            return summary.scan(data, start, end, since, until)
+        ranges = _split(data, start, end, parts)
+    with multiprocessing.Pool(min(workers, len(ranges))) as pool:
+        for part in pool.imap(_scan_range, [(path, a, b, since, until, bucket) for a, b in ranges]):
+            summary.merge(part)
+    return summary
+
+
+# A time bound from the command line: "2026-10-17", "2026-10-17 06:00[:00]"
+# or a span back from now such as "30m", "12h", "7d" or "2w". A date alone as
+# an upper bound means the end of that day.
+def parse_time(text, end=False, now=None):
+    relative = re.fullmatch(r"(\d+)([smhdw])", text.strip())
+    if relative:
+        unit = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days", "w": "weeks"}[relative.group(2)]
+        when = (now or datetime.now()) - timedelta(**{unit: int(relative.group(1))})
+    else:
+        text = text.strip().replace("T", " ")
+        for layout in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+            try:
+                when = datetime.strptime(text, layout)
+                break
+            except ValueError:
+                continue
+        else:
+            raise ValueError(f"unrecognized time {text!r}")
+        if end and layout == "%Y-%m-%d":
+            when += timedelta(days=1, seconds=-1)
+    return when.strftime("%Y-%m-%d %H:%M:%S").encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize the mission log: events, completions, interference and health")
+    parser.add_argument("logs", nargs="*", default=[LOG_FILE],
+                        help="log files (e.g. satellite_log.txt and its rotated .1, .2 ...)")
+    parser.add_argument("--since", default=None, help="start time, e.g. 2026-10-10, '2026-10-10 06:00' or 7d")
+    parser.add_argument("--until", default=None, help="end time (inclusive), in the same forms")
+    parser.add_argument("--bucket", choices=sorted(BUCKET_WIDTHS), default="hour",
+                        help="resolution of the health trajectory")
+    parser.add_argument("--workers", type=int, default=None, help="processes for large logs (default: CPU count)")
+    parser.add_argument("--no-index", action="store_true", help="scan instead of using the timestamp index")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+    try:
+        since = parse_time(args.since) if args.since else None
+        until = parse_time(args.until, end=True) if args.until else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    summary = LogSummary(args.bucket)
+    for path in args.logs:
+        if os.path.exists(path):
+            summary.merge(analyze(path, since, until, args.bucket, args.workers, not args.no_index))
+        else:
+            print(f"{path}: not found")
+    if args.json:
+        print(json.dumps(summary.to_dict(), indent=2))
+    else:
+        print("\n".join(summary.report_lines(", ".join(args.logs))))
+
+
+if __name__ == "__main__":
+    main()
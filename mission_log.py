@@ -0,0 +1,136 @@
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+# File the mission log is written to
+LOG_FILE = "satellite_log.txt"
+
+# Queue item asking the writer to flush and signal the attached event
+_FLUSH = object()
+
+
+# Format one record as a "[timestamp] message" line or a JSON Lines object
+def format_record(timestamp, message, fields, json_lines=False):
+    when = datetime.fromtimestamp(timestamp)
+    if json_lines:
+        record = {"ts": when.isoformat(timespec="milliseconds"), "message": message}
+        record.update(fields)
+        return json.dumps(record) + "\n"
+    return f"[{when.strftime('%Y-%m-%d %H:%M:%S')}] {message}\n"
+
+
+# Mission log with a bounded in-memory queue drained by a background writer.
+# Callers never touch the disk: records are batched and flushed once
+# batch_size records are pending or flush_interval seconds have passed.
+# When the queue is full new records are dropped and counted rather than
+# blocking the caller. With max_bytes set, the file is rotated to
+# satellite_log.txt.1 .. .N once it would grow past that size.
+class BackgroundLogger:
+    def __init__(self, path=LOG_FILE, max_queue=10000, batch_size=256, flush_interval=1.0,
+                 max_bytes=0, backup_count=3, json_lines=False):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.json_lines = json_lines
+        self.dropped = 0
+        self.written = 0
+        self._queue = queue.Queue(max_queue)
+        self._thread = None
+        self._file = None
+        self._lock = threading.Lock()
+
+    # Queue a record; returns False if it had to be dropped
+    def log(self, message, **fields):
+        if self._thread is None:
+            self.start()
+        try:
+            self._queue.put_nowait((time.time(), message, fields))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="mission-log", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+        return self
+
+    # Block until everything queued so far is on disk
+    def flush(self, timeout=5.0):
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put((_FLUSH, done, None))
+        return done.wait(timeout)
+
+    # Flush outstanding records and stop the writer thread
+    def close(self, timeout=5.0):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+
+    def _run(self):
+        pending = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = ()
+            if item is None:
+                self._write(pending)
+                self._close_file()
+                return
+            if item and item[0] is _FLUSH:
+                self._write(pending)
+                pending = []
+                item[1].set()
+            elif item:
+                pending.append(item)
+                if len(pending) < self.batch_size and time.monotonic() < deadline:
+                    continue
+            self._write(pending)
+            pending = []
+            deadline = time.monotonic() + self.flush_interval
+
+    def _write(self, records):
+        if not records:
+            return
+        data = "".join(format_record(ts, message, fields, self.json_lines) for ts, message, fields in records)
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        if self.max_bytes and self._file.tell() + len(data) > self.max_bytes and self._file.tell() > 0:
+            self._rotate()
+        self._file.write(data)
+        self._file.flush()
+        self.written += len(records)
+
+    # Shift satellite_log.txt -> .1 -> .2 ... and start a fresh file
+    def _rotate(self):
+        self._close_file()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
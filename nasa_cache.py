@@ -0,0 +1,168 @@
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from datetime import date
+from urllib.parse import urlencode
+
+# File holding cached NASA responses between runs
+CACHE_FILE = "nasa_cache.sqlite3"
+
+# Seconds a response stays fresh, by endpoint prefix (longest prefix wins)
+DEFAULT_TTLS = {
+    "/EPIC/api/natural": 60 * 60,
+    "/EPIC/archive/": 30 * 24 * 60 * 60,
+    "/neo/rest/v1/feed": 6 * 60 * 60,
+    "/neo/rest/v1/neo/browse": 24 * 60 * 60,
+    "/neo/rest/v1/neo/": 7 * 24 * 60 * 60,
+}
+DEFAULT_TTL = 5 * 60
+
+# Feed windows that ended before today will not change again
+IMMUTABLE_TTL = 365 * 24 * 60 * 60
+
+# Query parameters that must never be part of a cache key
+UNCACHED_PARAMS = ("api_key",)
+
+CachedResponse = namedtuple("CachedResponse", ["body", "etag", "last_modified", "fresh"])
+
+
+# Cache key for an endpoint and its query (including any date range),
+# independent of parameter order and API key
+def cache_key(endpoint, params=None):
+    query = sorted((k, str(v)) for k, v in (params or {}).items() if k not in UNCACHED_PARAMS)
+    return endpoint + ("?" + urlencode(query) if query else "")
+
+
+# Size-bounded, SQLite-backed store of NASA API responses. Entries expire by
+# per-endpoint TTL; expired entries that carry an ETag or Last-Modified are
+# kept for conditional revalidation. The least recently used entries are
+# evicted once the total body size exceeds max_bytes.
+class ResponseCache:
+    def __init__(self, path=CACHE_FILE, max_bytes=32 * 1024 * 1024, ttls=None, default_ttl=DEFAULT_TTL):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, body BLOB NOT NULL, etag TEXT, last_modified TEXT,"
+            " fetched_at REAL NOT NULL, accessed_at REAL NOT NULL, size INTEGER NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (accessed_at)")
+        self.total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    # TTL for an endpoint; closed NeoWs feed windows never expire in practice
+    def ttl_for(self, endpoint, params=None):
+        end_date = (params or {}).get("end_date")
+        if end_date and str(end_date) < date.today().isoformat():
+            return IMMUTABLE_TTL
+        matches = [prefix for prefix in self.ttls if endpoint.startswith(prefix)]
+        return self.ttls[max(matches, key=len)] if matches else self.default_ttl
+
+    # Look up a response; returns None on a miss. A stale entry is returned
+    # with fresh=False so the caller can revalidate it.
+    def get(self, endpoint, params=None, now=None):
+        now = time.time() if now is None else now
+        key = cache_key(endpoint, params)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            body, etag, last_modified, fetched_at = row
+            fresh = now < fetched_at + self.ttl_for(endpoint, params)
+            if fresh:
+                self.hits += 1
+                self.bytes_saved += len(body)
+                self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            elif not (etag or last_modified):
+                self.misses += 1
+                return None
+            return CachedResponse(bytes(body), etag, last_modified, fresh)
+
+    # Store a 200 response body along with its validators
+    def put(self, endpoint, params, body, headers=None, now=None):
+        now = time.time() if now is None else now
+        headers = headers or {}
+        key = cache_key(endpoint, params)
+        with self._lock:
+            old = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, body, headers.get("ETag"), headers.get("Last-Modified"), now, now, len(body)),
+            )
+            self.total_bytes += len(body) - (old[0] if old else 0)
+            self._evict()
+
+    # Record a 304: the cached body is still valid for another TTL
+    def revalidated(self, endpoint, params, headers=None, now=None):
+        now = time.time() if now is None else now
+        headers = headers or {}
+        key = cache_key(endpoint, params)
+        with self._lock:
+            row = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return
+            self.revalidations += 1
+            self.bytes_saved += row[0]
+            self._db.execute(
+                "UPDATE responses SET fetched_at = ?, accessed_at = ?,"
+                " etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) WHERE key = ?",
+                (now, now, headers.get("ETag"), headers.get("Last-Modified"), key),
+            )
+
+    # Drop least recently used entries until the cache fits in max_bytes
+    def _evict(self):
+        while self.total_bytes > self.max_bytes:
+            row = self._db.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                self.total_bytes = 0
+                return
+            self._db.execute("DELETE FROM responses WHERE key = ?", (row[0],))
+            self.total_bytes -= row[1]
+            self.evictions += 1
+
+    # Counters for reporting cache effectiveness
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "evictions": self.evictions,
+            "bytes_saved": self.bytes_saved,
+            "bytes_stored": self.total_bytes,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self.total_bytes = 0
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+# Conditional request headers for a stale cached response
+def validator_headers(cached):
+    headers = {}
+    if cached.etag:
+        headers["If-None-Match"] = cached.etag
+    if cached.last_modified:
+        headers["If-Modified-Since"] = cached.last_modified
+    return headers
+
@@ -0,0 +1,197 @@
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import namedtuple
+from datetime import date, timedelta
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from nasa_cache import validator_headers
+from neo_store import NeoStore
+
+# Public NASA API root and the key used when none is configured
+NASA_API_URL = "https://api.nasa.gov"
+DEFAULT_API_KEY = "DEMO_KEY"
+
+# Responses that mean "slow down" rather than "broken"
+RETRY_STATUSES = (429, 503)
+
+# Latest data published to the animation loop. Fields are None until the
+# first successful fetch of that feed.
+NasaSnapshot = namedtuple("NasaSnapshot", ["epic", "neos", "updated_at", "errors"])
+EMPTY_SNAPSHOT = NasaSnapshot(None, None, None, 0)
+
+
+# Raised for HTTP errors from the NASA API
+class NasaError(Exception):
+    def __init__(self, status, message, retry_after=None):
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+# Parse a Retry-After header given in seconds; HTTP dates are ignored
+def parse_retry_after(value):
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+# Reduce the EPIC "natural" image list to the newest image's coordinates
+def parse_epic(images):
+    if not images:
+        return None
+    latest = max(images, key=lambda image: image.get("date", ""))
+    coords = latest.get("centroid_coordinates", {})
+    return {
+        "image": latest.get("image"),
+        "date": latest.get("date"),
+        "latitude": round(float(coords.get("lat", 0.0)), 2),
+        "longitude": round(float(coords.get("lon", 0.0)), 2),
+    }
+
+
+# Archive path of an EPIC natural-color PNG; the date is part of the name
+# (e.g. epic_1b_20240107001303)
+def epic_image_path(image):
+    match = re.search(r"_(\d{4})(\d{2})(\d{2})\d*$", image)
+    if not match:
+        raise ValueError(f"not an EPIC image name: {image!r}")
+    year, month, day = match.groups()
+    return f"/EPIC/archive/natural/{year}/{month}/{day}/png/{image}.png"
+
+
+# Background poller for the EPIC and NeoWs APIs. One pooled HTTP session is
+# shared by both feeds; the newest data is published as an immutable snapshot
+# that the animation loop can read at any time without waiting. on_response,
+# if set, sees every HTTP response (e.g. to follow the rate-limit headers).
+class NasaClient:
+    def __init__(self, api_key=None, base_url=NASA_API_URL, epic_interval=300,
+                 neo_interval=3600, timeout=(3.05, 10), max_backoff=900,
+                 session=None, on_update=None, cache=None, on_response=None):
+        self.api_key = api_key or os.environ.get("NASA_API_KEY", DEFAULT_API_KEY)
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_backoff = max_backoff
+        self.on_update = on_update
+        self.on_response = on_response
+        self.cache = cache
+        self.snapshot = EMPTY_SNAPSHOT
+        self.session = session or self._make_session()
+        self._feeds = {
+            "epic": {"interval": epic_interval, "fetch": self.fetch_epic, "due": 0.0, "failures": 0},
+            "neos": {"interval": neo_interval, "fetch": self.fetch_neo_feed, "due": 0.0, "failures": 0},
+        }
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _make_session(pool_size=4):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    # GET an API path and return the body bytes, going through the response
+    # cache (if any) with conditional requests for stale entries
+    def get(self, path, params=None):
+        params = dict(params or {})
+        cached = self.cache.get(path, params) if self.cache else None
+        if cached is not None and cached.fresh:
+            return cached.body
+
+        headers = validator_headers(cached) if cached is not None else {}
+        query = dict(params, api_key=self.api_key)
+        response = self.session.get(self.base_url + path, params=query, headers=headers, timeout=self.timeout)
+        if self.on_response:
+            self.on_response(response)
+        if response.status_code == 304 and cached is not None:
+            self.cache.revalidated(path, params, response.headers)
+            return cached.body
+        if response.status_code != 200:
+            raise NasaError(response.status_code, response.reason,
+                            parse_retry_after(response.headers.get("Retry-After")))
+        if self.cache:
+            self.cache.put(path, params, response.content, response.headers)
+        return response.content
+
+    # GET an API path and decode the JSON body
+    def get_json(self, path, params=None):
+        return json.loads(self.get(path, params))
+
+    # Coordinates of the newest EPIC natural-color image
+    def fetch_epic(self):
+        return parse_epic(self.get_json("/EPIC/api/natural"))
+
+    # PNG bytes of an EPIC natural-color image, by its name in the image list
+    def fetch_epic_image(self, image):
+        return self.get(epic_image_path(image))
+
+    # Close approaches for the given window (NeoWs allows at most 7 days),
+    # as an indexed NeoStore
+    def fetch_neo_feed(self, start=None, end=None):
+        start = start or date.today()
+        end = end or start + timedelta(days=1)
+        feed = self.get_json("/neo/rest/v1/feed", {
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+        })
+        return NeoStore.from_response(feed)
+
+    # Fetch every feed that is due right now and publish what arrived
+    def poll_once(self, now=None):
+        now = time.monotonic() if now is None else now
+        for name, feed in self._feeds.items():
+            if now < feed["due"]:
+                continue
+            try:
+                value = feed["fetch"]()
+            except (requests.RequestException, NasaError, ValueError, KeyError) as e:
+                feed["failures"] += 1
+                feed["due"] = now + self._backoff(feed, e)
+                self.snapshot = self.snapshot._replace(errors=self.snapshot.errors + 1)
+                continue
+            feed["failures"] = 0
+            feed["due"] = now + feed["interval"]
+            self.snapshot = self.snapshot._replace(**{name: value, "updated_at": time.time()})
+            if self.on_update:
+                self.on_update(self.snapshot)
+        return self.snapshot
+
+    # Exponential backoff with jitter, honouring Retry-After on 429/503
+    def _backoff(self, feed, error):
+        if isinstance(error, NasaError) and error.status in RETRY_STATUSES and error.retry_after is not None:
+            return min(self.max_backoff, error.retry_after)
+        delay = min(self.max_backoff, 2 ** feed["failures"])
+        return delay * random.uniform(0.5, 1.0)
+
+    # Seconds until the next feed is due
+    def _next_wait(self):
+        return max(0.0, min(feed["due"] for feed in self._feeds.values()) - time.monotonic())
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.poll_once()
+            self._stop.wait(self._next_wait())
+
+    # Start polling on a daemon thread
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="nasa-client", daemon=True)
+            self._thread.start()
+        return self
+
+    # Stop polling and release pooled connections
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.session.close()
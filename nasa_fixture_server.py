@@ -0,0 +1,231 @@
+import argparse
+import copy
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from datetime import date, datetime, timedelta, timezone
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# Directory holding the recorded-format NASA responses
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sentinel_fixtures")
+
+# Request paths served from fixture files
+ROUTES = {
+    "/EPIC/api/natural": "epic_natural.json",
+    "/neo/rest/v1/feed": "neo_feed.json",
+    "/neo/rest/v1/neo/browse": "neo_browse.json",
+}
+NEO_LOOKUP = re.compile(r"^/neo/rest/v1/neo/(\d+)$")
+
+# Every EPIC archive image is served as the same Earth picture
+EPIC_IMAGE = re.compile(r"^/EPIC/archive/natural/\d{4}/\d{2}/\d{2}/png/[\w.-]+\.png$")
+EPIC_IMAGE_FILE = "epic_earth.png"
+FEED_PATH = "/neo/rest/v1/feed"
+
+# Objects synthesized for one day get ids day.toordinal() * 100 + k
+SYNTHETIC_PER_DAY = 100
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        url = urlsplit(self.path)
+        server.record(url.path, parse_qs(url.query))
+        if server.delay:
+            time.sleep(server.delay)
+
+        fault = server.next_fault(url.path)
+        if fault is not None:
+            status, retry_after = fault
+            headers = {"Retry-After": str(retry_after)} if retry_after is not None else {}
+            self._send(status, json.dumps({"error": {"code": status}}).encode(), headers)
+            return
+
+        body = server.body_for(url.path, parse_qs(url.query))
+        if body is None:
+            self._send(404, b'{"error": "not found"}')
+            return
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, b"", {"ETag": etag})
+            return
+        content_type = "image/png" if url.path.endswith(".png") else "application/json"
+        self._send(200, body, {"ETag": etag, "Last-Modified": server.last_modified}, content_type)
+
+    def _send(self, status, body, headers=None, content_type="application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-RateLimit-Limit", str(self.server.rate_limit))
+        self.send_header("X-RateLimit-Remaining", str(self.server.remaining()))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Local stand-in for api.nasa.gov serving fixture JSON. Faults (e.g. 429 or
+# 503 with Retry-After) can be queued per path to exercise client backoff.
+# With synthetic_feed, /feed answers for whatever dates are asked for, with
+# the recorded objects moved onto those days (and lookups of them work), so
+# long backfills can be run locally.
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, fixtures_dir=FIXTURES_DIR, delay=0.0, rate_limit=1000,
+                 synthetic_feed=False):
+        super().__init__((host, port), FixtureHandler)
+        self.fixtures_dir = fixtures_dir
+        self.delay = delay
+        self.rate_limit = rate_limit
+        self.synthetic_feed = synthetic_feed
+        self._templates = None
+        self.requests = []
+        self._faults = {}
+        self._bodies = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self.last_modified = formatdate(time.time(), usegmt=True)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    # Queue `count` error responses for requests whose path starts with prefix
+    def inject(self, prefix, status, count=1, retry_after=None):
+        with self._lock:
+            self._faults.setdefault(prefix, deque()).extend([(status, retry_after)] * count)
+
+    def next_fault(self, path):
+        with self._lock:
+            for prefix, faults in self._faults.items():
+                if path.startswith(prefix) and faults:
+                    return faults.popleft()
+        return None
+
+    def record(self, path, query):
+        with self._lock:
+            self.requests.append((path, query))
+
+    def remaining(self):
+        return max(0, self.rate_limit - len(self.requests))
+
+    # Fixture bytes for a request; single-object lookups come from the browse
+    # page (or the synthetic feed) and every EPIC image is the fixture Earth
+    def body_for(self, path, query=None):
+        if self.synthetic_feed and path == FEED_PATH and query and "start_date" in query:
+            start = date.fromisoformat(query["start_date"][0])
+            end = date.fromisoformat(query.get("end_date", [start.isoformat()])[0])
+            return json.dumps(self.synthetic_window(start, end)).encode()
+        body = self._bodies.get(path)
+        if body is not None:
+            return body
+        if path in ROUTES or EPIC_IMAGE.match(path):
+            with open(os.path.join(self.fixtures_dir, ROUTES.get(path, EPIC_IMAGE_FILE)), "rb") as f:
+                body = f.read()
+        else:
+            match = NEO_LOOKUP.match(path)
+            if not match:
+                return None
+            with open(os.path.join(self.fixtures_dir, ROUTES["/neo/rest/v1/neo/browse"]), "rb") as f:
+                browse = json.load(f)
+            found = [neo for neo in browse["near_earth_objects"] if neo["id"] == match.group(1)]
+            if not found and self.synthetic_feed:
+                found = [self.synthetic_object(int(match.group(1)))]
+            if not found or found[0] is None:
+                return None
+            body = json.dumps(found[0]).encode()
+        self._bodies[path] = body
+        return body
+
+    # The recorded feed's objects, one list per day
+    def _day_templates(self):
+        if self._templates is None:
+            with open(os.path.join(self.fixtures_dir, ROUTES[FEED_PATH]), "rb") as f:
+                feed = json.load(f)
+            self._templates = [objects for _, objects in sorted(feed["near_earth_objects"].items())]
+        return self._templates
+
+    # Object k of a synthetic day: a recorded object with its first close
+    # approach moved onto that day
+    def synthetic_object(self, neo_id):
+        if not 1 <= neo_id // SYNTHETIC_PER_DAY <= date.max.toordinal():
+            return None
+        day, k = date.fromordinal(neo_id // SYNTHETIC_PER_DAY), neo_id % SYNTHETIC_PER_DAY
+        templates = self._day_templates()[day.toordinal() % len(self._day_templates())]
+        if k >= len(templates):
+            return None
+        neo = copy.deepcopy(templates[k])
+        approach = neo["close_approach_data"][0]
+        midnight = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+        epoch_ms = int(midnight.timestamp() * 1000) + approach["epoch_date_close_approach"] % 86400000
+        when = datetime.fromtimestamp(epoch_ms / 1000, timezone.utc)
+        approach.update(close_approach_date=day.isoformat(), close_approach_date_full=when.strftime("%Y-%b-%d %H:%M"),
+                        epoch_date_close_approach=epoch_ms)
+        neo.update(id=str(neo_id), neo_reference_id=str(neo_id), close_approach_data=[approach],
+                   name=f"(SYN {day.isoformat()} {k})")
+        return neo
+
+    # A /feed response for start..end built from the recorded objects
+    def synthetic_window(self, start, end):
+        days = {}
+        day = start
+        while day <= end:
+            count = len(self._day_templates()[day.toordinal() % len(self._day_templates())])
+            days[day.isoformat()] = [self.synthetic_object(day.toordinal() * SYNTHETIC_PER_DAY + k)
+                                     for k in range(count)]
+            day += timedelta(days=1)
+        return {"element_count": sum(len(objects) for objects in days.values()), "near_earth_objects": days}
+
+    # Serve on a daemon thread; returns self so it can be used inline
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="nasa-fixtures", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve NASA API fixtures locally")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds to wait before each response")
+    parser.add_argument("--synthetic-feed", action="store_true",
+                        help="answer /feed for any dates with the recorded objects moved onto them")
+    args = parser.parse_args()
+    server = FixtureServer(args.host, args.port, delay=args.delay, synthetic_feed=args.synthetic_feed)
+    print(f"Serving NASA fixtures on {server.url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
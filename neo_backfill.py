@@ -0,0 +1,292 @@
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, timedelta
+
+import numpy as np
+import requests
+
+from nasa_client import NASA_API_URL, RETRY_STATUSES, NasaClient, NasaError
+from neo_store import NEO_DTYPE, NEO_STORE_FILE, NeoStore, rows_from_feed, rows_from_neo
+
+# Progress file: the requests already saved to the store
+BACKFILL_FILE = "neo_backfill.json"
+
+# Longest window the NeoWs feed accepts, in days
+WINDOW_DAYS = 7
+
+# Seconds over which NASA's hourly request quota refills
+QUOTA_WINDOW = 3600
+
+FEED_PATH = "/neo/rest/v1/feed"
+LOOKUP_PATH = "/neo/rest/v1/neo/"
+
+
+# Split start..end (inclusive) into feed windows of at most `days` days
+def date_windows(start, end, days=WINDOW_DAYS):
+    windows = []
+    while start <= end:
+        last = min(end, start + timedelta(days=days - 1))
+        windows.append((start, last))
+        start = last + timedelta(days=1)
+    return windows
+
+
+# Token bucket shared by the workers: `rate` requests per second with bursts
+# of up to `capacity`. observe() follows X-RateLimit-Remaining: the bucket
+# never holds more tokens than the quota has left above `reserve`, and once
+# fewer than `low_water` spare requests remain the rate drops so they are
+# spread over the quota window instead of spent at once. pause() holds every
+# worker back, e.g. for a 429's Retry-After.
+class TokenBucket:
+    def __init__(self, rate=5.0, capacity=4, reserve=10, low_water=50, window=QUOTA_WINDOW,
+                 clock=time.monotonic):
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.reserve = reserve
+        self.low_water = low_water
+        self.window = window
+        self.clock = clock
+        self.tokens = float(capacity)
+        self.remaining = None
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    # Block until a request may be sent; False if `stop` was set meanwhile
+    def acquire(self, stop=None):
+        with self._cond:
+            while True:
+                if stop is not None and stop.is_set():
+                    return False
+                now = self.clock()
+                self._refill(now)
+                if now >= self._paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = max(self._paused_until - now, (1 - self.tokens) / self.rate)
+                self._cond.wait(min(wait, 0.5))
+
+    def observe(self, remaining):
+        with self._cond:
+            self._refill(self.clock())
+            self.remaining = remaining
+            spare = max(0, remaining - self.reserve)
+            self.tokens = min(self.tokens, spare)
+            self.rate = self.base_rate if spare >= self.low_water else max(spare, 1) / self.window
+
+    def pause(self, seconds):
+        with self._cond:
+            self._paused_until = max(self._paused_until, self.clock() + seconds)
+            self._cond.notify_all()
+
+
+# Loads a date range of NeoWs close approaches into the NeoStore file. Each
+# 7-day feed window (and, optionally, a lookup of every hazardous object for
+# its full approach history) is a request handed to a bounded thread pool,
+# paced by a shared TokenBucket. 429 and 503 responses are retried with
+# backoff, honouring Retry-After. Finished rows are added to the store in
+# batches; after each batch is saved, its requests are recorded in the
+# progress file, so an interrupted run resumes where it stopped (a repeated
+# request is harmless, as the store replaces duplicate approaches).
+class NeoBackfill:
+    def __init__(self, client, store_path=NEO_STORE_FILE, progress_path=BACKFILL_FILE, workers=4,
+                 bucket=None, max_attempts=6, max_backoff=60.0, batch_size=8):
+        self.client = client
+        self.store_path = store_path
+        self.progress_path = progress_path
+        self.workers = workers
+        self.bucket = bucket or TokenBucket(capacity=workers)
+        self.max_attempts = max_attempts
+        self.max_backoff = max_backoff
+        self.batch_size = batch_size
+        self.stats = {"requests": 0, "retries": 0, "saved": 0, "failed": [], "rows": 0}
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        client.on_response = self._observe
+
+    def _observe(self, response):
+        with self._lock:
+            self.stats["requests"] += 1
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if remaining is not None and remaining.isdigit():
+            self.bucket.observe(int(remaining))
+
+    def load_progress(self):
+        try:
+            with open(self.progress_path) as f:
+                return set(json.load(f)["done"])
+        except (FileNotFoundError, ValueError, KeyError):
+            return set()
+
+    # Atomically record the finished requests
+    def save_progress(self, done):
+        temp_path = self.progress_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"done": sorted(done)}, f)
+        os.replace(temp_path, self.progress_path)
+
+    def load_store(self):
+        if os.path.exists(self.store_path):
+            return NeoStore.load(self.store_path)
+        return NeoStore()
+
+    # GET one request with retries; returns its rows, or None when stopped
+    def fetch(self, task):
+        key, path, params, parse = task
+        for attempt in range(self.max_attempts):
+            if not self.bucket.acquire(self._stop):
+                return None
+            try:
+                return parse(self.client.get_json(path, params))
+            except NasaError as e:
+                if e.status not in RETRY_STATUSES or attempt + 1 == self.max_attempts:
+                    raise
+                delay = e.retry_after
+                if delay is None:
+                    delay = min(self.max_backoff, 2 ** attempt) * random.uniform(0.5, 1.0)
+                # Too many requests slows everyone down, not just this worker
+                if e.status == 429:
+                    self.bucket.pause(delay)
+                    delay = 0
+            except (requests.RequestException, ValueError):
+                if attempt + 1 == self.max_attempts:
+                    raise
+                delay = min(self.max_backoff, 2 ** attempt) * random.uniform(0.5, 1.0)
+            with self._lock:
+                self.stats["retries"] += 1
+            if self._stop.wait(delay):
+                return None
+        return None
+
+    # Run tasks (key, path, params, parse) on the pool, saving rows in batches
+    def _run_tasks(self, tasks, store, done, on_progress=None):
+        pending_rows, pending_keys = [], []
+
+        def save():
+            if pending_keys:
+                store.add(np.array(pending_rows, dtype=NEO_DTYPE))
+                store.save(self.store_path)
+                done.update(pending_keys)
+                self.save_progress(done)
+                self.stats["saved"] += len(pending_keys)
+                self.stats["rows"] += len(pending_rows)
+                del pending_rows[:], pending_keys[:]
+                if on_progress:
+                    on_progress(self.stats, len(store))
+
+        tasks = iter(tasks)
+        running = {}
+        try:
+            with ThreadPoolExecutor(self.workers, thread_name_prefix="neo-backfill") as pool:
+                try:
+                    while True:
+                        # Keep only a bounded number of requests in flight
+                        while len(running) < self.workers * 2:
+                            task = next(tasks, None)
+                            if task is None:
+                                break
+                            running[pool.submit(self.fetch, task)] = task
+                        if not running:
+                            break
+                        finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            task = running.pop(future)
+                            try:
+                                rows = future.result()
+                            except (NasaError, requests.RequestException, ValueError) as e:
+                                self.stats["failed"].append((task[0], str(e)))
+                                continue
+                            if rows is not None:
+                                pending_rows.extend(rows)
+                                pending_keys.append(task[0])
+                        if len(pending_keys) >= self.batch_size:
+                            save()
+                finally:
+                    # On Ctrl+C, stop retrying and keep whatever already arrived
+                    self._stop.set()
+                    for future in running:
+                        future.cancel()
+                    save()
+        finally:
+            # Only after the pool has waited for its workers, so that none of
+            # them misses the stop and goes on retrying
+            self._stop.clear()
+
+    # Backfill start..end (dates), at most max_requests requests this run
+    # (e.g. to stay within a daily quota). With lookup_hazardous, every
+    # potentially hazardous object seen is also looked up for its full list
+    # of close approaches.
+    def run(self, start, end, lookup_hazardous=False, max_requests=None, on_progress=None):
+        done = self.load_progress()
+        store = self.load_store()
+        tasks = []
+        for first, last in date_windows(start, end):
+            key = f"feed:{first.isoformat()}/{last.isoformat()}"
+            if key not in done:
+                tasks.append((key, FEED_PATH, {"start_date": first.isoformat(), "end_date": last.isoformat()},
+                              rows_from_feed))
+        tasks = tasks[:max_requests]
+        self._run_tasks(tasks, store, done, on_progress)
+        if lookup_hazardous and (max_requests is None or len(tasks) < max_requests):
+            ids = np.unique(store.rows["neo_id"][store.rows["hazardous"]])
+            lookups = [(f"neo:{neo_id}", f"{LOOKUP_PATH}{neo_id}", None, rows_from_neo)
+                       for neo_id in ids if f"neo:{neo_id}" not in done]
+            if max_requests is not None:
+                lookups = lookups[:max_requests - len(tasks)]
+            self._run_tasks(lookups, store, done, on_progress)
+        return self.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill NeoWs close approaches for a date range into the NEO store")
+    parser.add_argument("--start", required=True, type=date.fromisoformat, help="first day, YYYY-MM-DD")
+    parser.add_argument("--end", required=True, type=date.fromisoformat, help="last day, YYYY-MM-DD")
+    parser.add_argument("--store", default=NEO_STORE_FILE)
+    parser.add_argument("--progress", default=BACKFILL_FILE, help="file recording finished requests for resuming")
+    parser.add_argument("--workers", type=int, default=4, help="requests in flight at once")
+    parser.add_argument("--rate", type=float, default=5.0, help="requests per second while the quota allows")
+    parser.add_argument("--max-requests", type=int, default=None, help="stop after this many requests, not counting retries (daily quota)")
+    parser.add_argument("--lookup-hazardous", action="store_true",
+                        help="also fetch the full approach history of every hazardous object")
+    parser.add_argument("--nasa-url", default=NASA_API_URL)
+    parser.add_argument("--api-key", default=None, help="NASA API key (defaults to $NASA_API_KEY or DEMO_KEY)")
+    args = parser.parse_args()
+    if args.end < args.start:
+        parser.error("--end is before --start")
+
+    client = NasaClient(api_key=args.api_key, base_url=args.nasa_url,
+                        session=NasaClient._make_session(pool_size=args.workers))
+    backfill = NeoBackfill(client, args.store, args.progress, args.workers,
+                           TokenBucket(args.rate, capacity=args.workers))
+
+    def progress(stats, approaches):
+        remaining = backfill.bucket.remaining
+        print(f"{stats['saved']} requests saved, {approaches} approaches in {args.store}"
+              + (f", quota remaining {remaining}" if remaining is not None else ""), flush=True)
+
+    started = time.monotonic()
+    try:
+        stats = backfill.run(args.start, args.end, args.lookup_hazardous, args.max_requests, progress)
+    except KeyboardInterrupt:
+        print("Interrupted; run the same command again to resume.")
+        return
+    finally:
+        client.session.close()
+    print(f"Done in {time.monotonic() - started:.1f}s: {stats['requests']} HTTP requests, "
+          f"{stats['retries']} retries, {stats['rows']} approaches added")
+    for key, error in stats["failed"]:
+        print(f"Failed {key}: {error} (run again to retry)")
+
+
+if __name__ == "__main__":
+    main()
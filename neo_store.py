@@ -0,0 +1,231 @@
+import argparse
+import json
+import time
+
+import numpy as np
+
+# Kilometres per lunar distance, as used by NeoWs
+LUNAR_DISTANCE_KM = 384400.0
+MS_PER_DAY = 86400 * 1000
+
+# File the store is saved to between runs
+NEO_STORE_FILE = "neo_store.npz"
+
+# One row per close approach
+NEO_DTYPE = np.dtype([
+    ("neo_id", "i8"),
+    ("name", "U32"),
+    ("epoch_ms", "i8"),
+    ("miss_km", "f8"),
+    ("miss_ld", "f8"),
+    ("velocity_kps", "f4"),
+    ("diameter_min_m", "f4"),
+    ("diameter_max_m", "f4"),
+    ("hazardous", "?"),
+])
+
+# Rows examined per step when scanning forward from an epoch for matches
+SCAN_CHUNK = 256
+
+
+# Rows for every close approach of one NeoWs near-earth object
+def rows_from_neo(neo):
+    diameter = neo.get("estimated_diameter", {}).get("meters", {})
+    rows = []
+    for approach in neo.get("close_approach_data", []):
+        if approach.get("orbiting_body", "Earth") != "Earth":
+            continue
+        miss_km = float(approach["miss_distance"]["kilometers"])
+        rows.append((
+            int(neo["id"]),
+            neo.get("name", "")[:32],
+            int(approach["epoch_date_close_approach"]),
+            miss_km,
+            miss_km / LUNAR_DISTANCE_KM,
+            float(approach["relative_velocity"]["kilometers_per_second"]),
+            float(diameter.get("estimated_diameter_min", 0.0)),
+            float(diameter.get("estimated_diameter_max", 0.0)),
+            bool(neo.get("is_potentially_hazardous_asteroid")),
+        ))
+    return rows
+
+
+# Rows from a /feed response (objects grouped by date)
+def rows_from_feed(feed):
+    rows = []
+    for objects in feed.get("near_earth_objects", {}).values():
+        for neo in objects:
+            rows.extend(rows_from_neo(neo))
+    return rows
+
+
+# Rows from a /neo/browse page (a flat list of objects)
+def rows_from_browse(page):
+    rows = []
+    for neo in page.get("near_earth_objects", []):
+        rows.extend(rows_from_neo(neo))
+    return rows
+
+
+# Rows from any NeoWs response: feed, browse page or single-object lookup
+def rows_from_response(data):
+    if isinstance(data.get("near_earth_objects"), dict):
+        return rows_from_feed(data)
+    if isinstance(data.get("near_earth_objects"), list):
+        return rows_from_browse(data)
+    return rows_from_neo(data)
+
+
+# Columnar store of close approaches. The rows are kept sorted by approach
+# epoch, with argsort indexes by miss distance and by estimated diameter, so
+# range queries are binary searches instead of scans. The sorted keys are also
+# kept as contiguous arrays, since searching a field of the structured array
+# directly would copy the strided column on every query.
+class NeoStore:
+    def __init__(self, rows=None):
+        self._index(np.zeros(0, dtype=NEO_DTYPE))
+        if rows is not None and len(rows):
+            self.add(rows)
+
+    def _index(self, rows):
+        self.rows = rows
+        self._epochs = np.ascontiguousarray(rows["epoch_ms"])
+        self._miss_ld = np.ascontiguousarray(rows["miss_ld"])
+        self._by_miss = np.argsort(rows["miss_km"], kind="stable")
+        self._miss_sorted_km = rows["miss_km"][self._by_miss]
+        self._by_diameter = np.argsort(rows["diameter_max_m"], kind="stable")
+
+    def __len__(self):
+        return len(self.rows)
+
+    @classmethod
+    def from_response(cls, data):
+        return cls(rows_from_response(data))
+
+    # Merge rows (tuples or a NEO_DTYPE array); a repeated (object, epoch)
+    # replaces the older row
+    def add(self, rows):
+        new = rows if isinstance(rows, np.ndarray) else np.array(rows, dtype=NEO_DTYPE)
+        if not len(new):
+            return self
+        merged = np.concatenate([new, self.rows])
+        # Sort by epoch then object; within a duplicate run the lowest position
+        # (the newest row) comes first and is the one kept
+        order = np.lexsort((np.arange(len(merged)), merged["neo_id"], merged["epoch_ms"]))
+        merged = merged[order]
+        keep = np.ones(len(merged), dtype=bool)
+        keep[1:] = (merged["epoch_ms"][1:] != merged["epoch_ms"][:-1]) | (merged["neo_id"][1:] != merged["neo_id"][:-1])
+        self._index(merged[keep])
+        return self
+
+    # Rows with start_ms <= epoch < end_ms
+    def between(self, start_ms, end_ms):
+        return self.rows[np.searchsorted(self._epochs, start_ms, "left"):np.searchsorted(self._epochs, end_ms, "left")]
+
+    # The next n approaches at or after after_ms, optionally within a miss
+    # distance in lunar distances, scanning forward in chunks
+    def next_approaches(self, n=5, within_ld=None, after_ms=None):
+        after_ms = int(time.time() * 1000) if after_ms is None else after_ms
+        start = int(np.searchsorted(self._epochs, after_ms, "left"))
+        if within_ld is None:
+            return self.rows[start:start + n]
+        found = []
+        count = 0
+        chunk = SCAN_CHUNK
+        while start < len(self.rows) and count < n:
+            match = np.flatnonzero(self._miss_ld[start:start + chunk] <= within_ld) + start
+            found.append(match)
+            count += len(match)
+            start += chunk
+            chunk *= 2
+        if not found:
+            return self.rows[:0]
+        return self.rows[np.concatenate(found)[:n]]
+
+    # Potentially hazardous approaches in a window (default: the next 7 days)
+    def hazardous(self, start_ms=None, days=7):
+        start_ms = int(time.time() * 1000) if start_ms is None else start_ms
+        window = self.between(start_ms, start_ms + days * MS_PER_DAY)
+        return window[window["hazardous"]]
+
+    # The n closest approaches overall
+    def closest(self, n=5):
+        return self.rows[self._by_miss[:n]]
+
+    # Every approach closer than max_ld lunar distances, nearest first
+    def within(self, max_ld):
+        count = np.searchsorted(self._miss_sorted_km, max_ld * LUNAR_DISTANCE_KM, "right")
+        return self.rows[self._by_miss[:count]]
+
+    # The n largest objects by estimated maximum diameter
+    def largest(self, n=5):
+        return self.rows[self._by_diameter[::-1][:n]]
+
+    def save(self, path=NEO_STORE_FILE):
+        np.savez(path, rows=self.rows)
+
+    @classmethod
+    def load(cls, path=NEO_STORE_FILE):
+        with np.load(path) as data:
+            store = cls()
+            store.add(data["rows"])
+            return store
+
+
+# Plain-dict form of a row, as handed to the simulation's asteroid alerts
+def alert_from_row(row):
+    return {
+        "neo_id": int(row["neo_id"]),
+        "name": str(row["name"]),
+        "epoch_ms": int(row["epoch_ms"]),
+        "miss_ld": round(float(row["miss_ld"]), 2),
+        "velocity_kps": round(float(row["velocity_kps"]), 1),
+        "hazardous": bool(row["hazardous"]),
+    }
+
+
+# Human-readable summary of one approach row
+def describe(row):
+    when = time.strftime("%Y-%m-%d %H:%M", time.gmtime(int(row["epoch_ms"]) / 1000))
+    flag = " HAZARDOUS" if row["hazardous"] else ""
+    return (f"{when} {row['name']}: {row['miss_ld']:.2f} LD, {row['velocity_kps']:.1f} km/s, "
+            f"{row['diameter_min_m']:.0f}-{row['diameter_max_m']:.0f} m{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest and query NeoWs close approaches")
+    parser.add_argument("--store", default=NEO_STORE_FILE)
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest = commands.add_parser("ingest", help="add NeoWs feed/browse/lookup JSON files to the store")
+    ingest.add_argument("files", nargs="+")
+    upcoming = commands.add_parser("next", help="next approaches after a date")
+    upcoming.add_argument("-n", type=int, default=5)
+    upcoming.add_argument("--ld", type=float, default=None, help="only approaches within this many lunar distances")
+    upcoming.add_argument("--after", default=None, help="YYYY-MM-DD (default: now)")
+    hazard = commands.add_parser("hazardous", help="hazardous approaches in the week after a date")
+    hazard.add_argument("--after", default=None, help="YYYY-MM-DD (default: now)")
+    args = parser.parse_args()
+
+    if args.command == "ingest":
+        try:
+            store = NeoStore.load(args.store)
+        except FileNotFoundError:
+            store = NeoStore()
+        for path in args.files:
+            with open(path) as f:
+                store.add(rows_from_response(json.load(f)))
+        store.save(args.store)
+        print(f"{len(store)} approaches in {args.store}")
+        return
+
+    store = NeoStore.load(args.store)
+    after_ms = None
+    if args.after:
+        after_ms = int(np.datetime64(args.after, "ms").astype(np.int64))
+    rows = store.next_approaches(args.n, args.ld, after_ms) if args.command == "next" else store.hazardous(after_ms)
+    for row in rows:
+        print(describe(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+import math
+from collections import namedtuple
+
+import numpy as np
+
+# Earth constants (WGS-84 / EGM-96)
+MU_EARTH = 398600.4418          # km^3/s^2
+EARTH_RADIUS_KM = 6378.137      # equatorial radius
+EARTH_FLATTENING = 1 / 298.257223563
+J2 = 1.08262668e-3
+SECONDS_PER_DAY = 86400.0
+
+# Unix time of the J2000 epoch (2000-01-01 12:00 TT, close enough in UTC)
+J2000_UNIX = 946728000.0
+
+# Newton iterations when solving Kepler's equation; plenty for e < 0.9. Near-
+# circular orbits converge to KEPLER_TOLERANCE in one or two.
+KEPLER_ITERATIONS = 8
+KEPLER_TOLERANCE = 1e-12
+
+# Classical orbital elements for one or more objects, as equal-length arrays.
+# Angles are in radians, a_km is the semi-major axis and epoch is Unix time.
+Elements = namedtuple("Elements", ["a_km", "e", "i", "raan", "argp", "m0", "epoch"])
+
+
+# Build an Elements tuple from scalars or sequences (broadcast to one length)
+def make_elements(a_km, e, i, raan, argp, m0, epoch):
+    arrays = np.broadcast_arrays(*(np.asarray(value, dtype=float) for value in (a_km, e, i, raan, argp, m0, epoch)))
+    return Elements(*(np.atleast_1d(array).copy() for array in arrays))
+
+
+# Elements for circular orbits at the given altitude(s); angles in degrees
+def circular_orbit(altitude_km, inclination_deg, raan_deg=0.0, phase_deg=0.0, epoch=J2000_UNIX):
+    return make_elements(
+        EARTH_RADIUS_KM + np.asarray(altitude_km, dtype=float), 0.0,
+        np.radians(inclination_deg), np.radians(raan_deg), 0.0, np.radians(phase_deg), epoch,
+    )
+
+
+# Concatenate several Elements into one set
+def concat_elements(*sets):
+    return Elements(*(np.concatenate(parts) for parts in zip(*sets)))
+
+
+# Parse a TLE epoch field (YYDDD.DDDDDDDD) into Unix time
+def _tle_epoch(field):
+    year = int(field[:2])
+    year += 2000 if year < 57 else 1900
+    day_of_year = float(field[2:])
+    start = (np.datetime64(f"{year}-01-01T00:00:00") - np.datetime64("1970-01-01T00:00:00")) / np.timedelta64(1, "s")
+    return float(start) + (day_of_year - 1) * SECONDS_PER_DAY
+
+
+# Mean elements from the two data lines of a TLE. This is a Keplerian + J2
+# approximation of the TLE, not SGP4, so expect drift of kilometres per day.
+def parse_tle(line1, line2):
+    if not (line1.startswith("1 ") and line2.startswith("2 ")):
+        raise ValueError("not a two-line element set")
+    mean_motion = float(line2[52:63]) * 2 * math.pi / SECONDS_PER_DAY
+    return {
+        "a_km": (MU_EARTH / mean_motion ** 2) ** (1 / 3),
+        "e": float("0." + line2[26:33].strip()),
+        "i": math.radians(float(line2[8:16])),
+        "raan": math.radians(float(line2[17:25])),
+        "argp": math.radians(float(line2[34:42])),
+        "m0": math.radians(float(line2[43:51])),
+        "epoch": _tle_epoch(line1[18:32].strip()),
+    }
+
+
+# Read every TLE in a text (2-line or 3-line format) into one Elements set,
+# along with the names from 3-line entries (or catalog numbers)
+def load_tles(text):
+    lines = [line.rstrip() for line in text.splitlines() if line.strip()]
+    records, names = [], []
+    index = 0
+    while index < len(lines):
+        if lines[index].startswith("1 ") and index + 1 < len(lines):
+            name = lines[index][2:7].strip()
+            line1, line2 = lines[index], lines[index + 1]
+            index += 2
+        elif index + 2 < len(lines):
+            name, line1, line2 = lines[index].strip(), lines[index + 1], lines[index + 2]
+            index += 3
+        else:
+            break
+        records.append(parse_tle(line1, line2))
+        names.append(name)
+    if not records:
+        raise ValueError("no TLEs found")
+    return make_elements(*([record[field] for record in records] for field in Elements._fields)), names
+
+
+# Greenwich mean sidereal time (radians) for Unix times
+def gmst(times):
+    days = (np.asarray(times, dtype=float) - J2000_UNIX) / SECONDS_PER_DAY
+    return np.radians((280.46061837 + 360.98564736629 * days) % 360.0)
+
+
+# Solve Kepler's equation M = E - e sin E for E, elementwise
+def solve_kepler(mean_anomaly, e):
+    eccentric = mean_anomaly + e * np.sin(mean_anomaly)
+    for _ in range(KEPLER_ITERATIONS):
+        correction = (eccentric - e * np.sin(eccentric) - mean_anomaly) / (1 - e * np.cos(eccentric))
+        eccentric -= correction
+        if np.max(np.abs(correction), initial=0.0) < KEPLER_TOLERANCE:
+            break
+    return eccentric
+
+
+# Earth-centred inertial positions (km) of every object at every time.
+# Secular J2 drift of the node, perigee and mean anomaly is included.
+# Returns x, y, z arrays of shape (objects, times).
+def propagate_eci(elements, times):
+    times = np.atleast_1d(np.asarray(times, dtype=float))
+    a, e, i, raan0, argp0, m0, epoch = (np.asarray(field)[:, None] for field in elements)
+
+    n = np.sqrt(MU_EARTH / a ** 3)
+    p = a * (1 - e ** 2)
+    factor = 1.5 * n * J2 * (EARTH_RADIUS_KM / p) ** 2
+    cos_i = np.cos(i)
+    raan_dot = -factor * cos_i
+    argp_dot = 0.5 * factor * (5 * cos_i ** 2 - 1)
+    m_dot = n + 0.5 * factor * np.sqrt(1 - e ** 2) * (3 * cos_i ** 2 - 1)
+
+    dt = times[None, :] - epoch
+    mean_anomaly = np.remainder(m0 + m_dot * dt, 2 * np.pi)
+    raan = raan0 + raan_dot * dt
+    argp = argp0 + argp_dot * dt
+
+    eccentric = solve_kepler(mean_anomaly, e)
+    true_anomaly = 2 * np.arctan2(np.sqrt(1 + e) * np.sin(eccentric / 2), np.sqrt(1 - e) * np.cos(eccentric / 2))
+    radius = a * (1 - e * np.cos(eccentric))
+
+    u = argp + true_anomaly
+    cos_u, sin_u = np.cos(u), np.sin(u)
+    cos_raan, sin_raan = np.cos(raan), np.sin(raan)
+    sin_i = np.sin(i)
+    x = radius * (cos_raan * cos_u - sin_raan * sin_u * cos_i)
+    y = radius * (sin_raan * cos_u + cos_raan * sin_u * cos_i)
+    z = radius * (sin_u * sin_i)
+    return x, y, z
+
+
+# Geodetic latitude/longitude (degrees) and altitude (km) above the WGS-84
+# ellipsoid from inertial positions, using Bowring's closed-form approximation
+def eci_to_geodetic(x, y, z, times):
+    theta = gmst(times)[None, :]
+    cos_t, sin_t = np.cos(theta), np.sin(theta)
+    x_ecef = cos_t * x + sin_t * y
+    y_ecef = -sin_t * x + cos_t * y
+
+    a = EARTH_RADIUS_KM
+    b = a * (1 - EARTH_FLATTENING)
+    e2 = 1 - (b / a) ** 2
+    ep2 = (a / b) ** 2 - 1
+    rho = np.hypot(x_ecef, y_ecef)
+    beta = np.arctan2(a * z, b * rho)
+    lat = np.arctan2(z + ep2 * b * np.sin(beta) ** 3, rho - e2 * a * np.cos(beta) ** 3)
+    sin_lat = np.sin(lat)
+    normal = a / np.sqrt(1 - e2 * sin_lat ** 2)
+    cos_lat = np.cos(lat)
+    # Near the poles rho/cos(lat) is ill-conditioned; use z there instead
+    alt = np.where(np.abs(cos_lat) > 1e-6,
+                   rho / np.where(cos_lat == 0, 1, cos_lat) - normal,
+                   np.abs(z) - b)
+    return np.degrees(lat), np.degrees(np.arctan2(y_ecef, x_ecef)), alt
+
+
+# Latitude, longitude and altitude arrays of shape (objects, times)
+def propagate(elements, times):
+    times = np.atleast_1d(np.asarray(times, dtype=float))
+    x, y, z = propagate_eci(elements, times)
+    return eci_to_geodetic(x, y, z, times)
+
+
+# The simulator's own satellite: a ~550 km sun-synchronous orbit, or a TLE
+class SatelliteOrbit:
+    def __init__(self, elements=None, name="Sentinel"):
+        self.elements = elements if elements is not None else circular_orbit(550.0, 97.6, epoch=J2000_UNIX)
+        self.name = name
+
+    # Load the first TLE from a file
+    @classmethod
+    def from_tle_file(cls, path):
+        with open(path) as f:
+            elements, names = load_tles(f.read())
+        return cls(Elements(*(field[:1] for field in elements)), names[0])
+
+    # Latitude, longitude (degrees) and altitude (km) at Unix time `when`
+    def position(self, when):
+        lat, lon, alt = propagate(self.elements, [when])
+        return float(lat[0, 0]), float(lon[0, 0]), float(alt[0, 0])
@@ -0,0 +1,253 @@
+import argparse
+import hashlib
+import json
+import random
+import sys
+import time
+from collections import namedtuple
+
+from simulation import SimState, advance
+
+# File signature and layout version
+MAGIC = b"SATREC\x01"
+
+# Record kinds, stored in the low two bits of each record's leading varint
+# (the rest is the number of ticks since the previous record)
+KEY, ALERT, SNAPSHOT, END = range(4)
+
+# Ticks between full simulation snapshots, used to find where a replay diverges
+SNAPSHOT_EVERY = 600
+
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _write_blob(out, obj):
+    blob = json.dumps(obj, separators=(",", ":")).encode()
+    write_varint(out, len(blob))
+    out += blob
+
+
+def _read_blob(data, pos):
+    length, pos = read_varint(data, pos)
+    return json.loads(data[pos:pos + length]), pos + length
+
+
+# Comparable view of a simulation state: every field but the session's
+# settings, with the active event reduced to its first message. The fleet is
+# left out while empty, as in recordings made before constellation mode.
+def snapshot_of(sim):
+    snapshot = {slot: getattr(sim, slot) for slot in SimState.__slots__
+                if slot not in ("event", "debris_screened", "fleet")}
+    snapshot["event"] = sim.event["stages"][0][0] if sim.event is not None else None
+    if sim.fleet:
+        snapshot["fleet"] = sim.fleet
+    return json.loads(json.dumps(snapshot))
+
+
+# Writes a session as: the seed, telemetry epoch, initial state and orbit (and
+# whether debris events came from conjunction screening), then
+# varint-packed (tick, key) inputs, the asteroid alerts the session consumed,
+# periodic snapshots and, on close, the final state and a digest of the log.
+# A key press costs two or three bytes.
+class SessionRecorder:
+    def __init__(self, path, seed, epoch, state, orbit=None, debris_screened=False):
+        self.path = path
+        self.log_count = 0
+        self._digest = hashlib.sha256()
+        self._last_tick = 0
+        self._next_snapshot = SNAPSHOT_EVERY
+        self._buffer = bytearray(MAGIC)
+        _write_blob(self._buffer, {"seed": seed, "epoch": epoch, "state": dict(state), "orbit": orbit,
+                                   "debris_screened": debris_screened})
+        self._file = open(path, "wb")
+
+    def _record(self, tick, kind):
+        write_varint(self._buffer, (tick - self._last_tick) << 2 | kind)
+        self._last_tick = tick
+
+    def key(self, tick, key):
+        self._record(tick, KEY)
+        write_varint(self._buffer, ord(key))
+
+    def alert(self, tick, alert):
+        self._record(tick, ALERT)
+        _write_blob(self._buffer, alert)
+
+    # Snapshot the state after `tick` if one is due
+    def snapshot(self, tick, sim):
+        if tick + 1 >= self._next_snapshot:
+            self._record(tick, SNAPSHOT)
+            _write_blob(self._buffer, snapshot_of(sim))
+            self._next_snapshot = tick + 1 + SNAPSHOT_EVERY
+            self.flush()
+
+    def log(self, message):
+        self._digest.update(message.encode() + b"\n")
+        self.log_count += 1
+
+    def flush(self):
+        self._file.write(self._buffer)
+        self._file.flush()
+        self._buffer.clear()
+
+    # Finish after `ticks` ticks with the persistent state they ended in
+    def close(self, ticks, state):
+        self._record(ticks, END)
+        _write_blob(self._buffer, {"state": dict(state), "log_count": self.log_count,
+                                   "log_digest": self._digest.hexdigest()})
+        self.flush()
+        self._file.close()
+
+
+Recording = namedtuple("Recording", ["seed", "epoch", "state", "orbit", "keys", "alerts", "snapshots", "ticks", "end",
+                                     "debris_screened"])
+
+ReplayResult = namedtuple("ReplayResult", ["state", "ticks", "elapsed", "logs", "divergence"])
+
+
+# Parse a recording. A file cut short by a crash replays up to its last record
+# and has no `end`.
+def load_recording(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not a session recording")
+    header, pos = _read_blob(data, len(MAGIC))
+    keys, alerts, snapshots = {}, {}, {}
+    tick = 0
+    end = None
+    try:
+        while pos < len(data):
+            lead, pos = read_varint(data, pos)
+            tick += lead >> 2
+            kind = lead & 3
+            if kind == KEY:
+                code, pos = read_varint(data, pos)
+                keys[tick] = chr(code)
+            elif kind == ALERT:
+                alerts[tick], pos = _read_blob(data, pos)
+            elif kind == SNAPSHOT:
+                snapshots[tick], pos = _read_blob(data, pos)
+            else:
+                end, pos = _read_blob(data, pos)
+                break
+    except (IndexError, ValueError):
+        pass
+    ticks = tick if end is not None else tick + 1
+    return Recording(header["seed"], header["epoch"], header["state"], header.get("orbit"),
+                     keys, alerts, snapshots, ticks, end, header.get("debris_screened", False))
+
+
+# Re-run a recording without a terminal, as fast as possible. The telemetry
+# log lines depend on the orbit model, so they are filled in at the end by
+# telemetry_log(healths, whens) -> messages, in one vectorized batch; without
+# it they are left out of the log comparison.
+def replay(recording, telemetry_log=None):
+    rng = random.Random(recording.seed)
+    sim = SimState.from_persistent(recording.state, debris_screened=recording.debris_screened)
+    keys, alerts, snapshots = recording.keys, recording.alerts, recording.snapshots
+    logs = []
+    effects = []
+    readings = []
+    divergence = None
+    tick = 0
+    while tick < recording.ticks:
+        # The front end logs the telemetry drawn with the previous frame
+        when = recording.epoch + sim.elapsed_time
+        del effects[:]
+        advance(sim, keys.get(tick), rng, effects, alerts.get(tick))
+        for effect in effects:
+            if effect[0] == "log":
+                logs.append(effect[1])
+            elif effect[0] == "telemetry" and telemetry_log is not None:
+                readings.append((len(logs), sim.health, when))
+                logs.append(None)
+        if divergence is None and tick in snapshots and snapshot_of(sim) != snapshots[tick]:
+            divergence = tick
+        tick += 1
+        if not sim.running:
+            break
+    if readings:
+        positions, healths, whens = zip(*readings)
+        for position, message in zip(positions, telemetry_log(healths, whens)):
+            logs[position] = message
+    return ReplayResult(sim.persistent(), tick, sim.elapsed_time, logs, divergence)
+
+
+# Differences between a replay and what the recorded session ended with
+def compare(recording, result):
+    problems = []
+    if result.divergence is not None:
+        problems.append(f"simulation diverged from the recording by tick {result.divergence}")
+    end = recording.end
+    if end is None:
+        problems.append("recording has no end record (session crashed?); final state not checked")
+        return problems
+    if result.ticks != recording.ticks:
+        problems.append(f"replay ran {result.ticks} ticks, session ran {recording.ticks}")
+    if result.state != end["state"]:
+        problems.append(f"final state {result.state} != recorded {end['state']}")
+    digest = hashlib.sha256("".join(message + "\n" for message in result.logs).encode()).hexdigest()
+    if len(result.logs) != end["log_count"] or digest != end["log_digest"]:
+        problems.append(f"log differs: {len(result.logs)} records replayed, {end['log_count']} recorded")
+    return problems
+
+
+# Final state stored in a satellite_state.json checkpoint
+def checkpoint_state(path):
+    with open(path) as f:
+        data = json.load(f)
+    return data["state"] if "version" in data else data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded session headlessly and check it reproduces")
+    parser.add_argument("recording")
+    parser.add_argument("--state", default=None, help="also compare the final state with this satellite_state.json")
+    parser.add_argument("--log-out", default=None, help="write the replayed mission log messages here")
+    parser.add_argument("--repeat", type=int, default=1, help="replay this many times (for timing)")
+    args = parser.parse_args()
+
+    recording = load_recording(args.recording)
+    # Telemetry lines need the front end's orbit and formatting
+    import satellite_animation as app
+    app.use_recorded_orbit(recording)
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        result = replay(recording, app.telemetry_messages)
+    elapsed = (time.perf_counter() - start) / args.repeat
+    print(f"{result.ticks} ticks ({result.elapsed / 3600:.1f}h of session time) replayed in {elapsed:.3f}s "
+          f"({result.ticks / elapsed:,.0f} ticks/s), {len(result.logs)} log records")
+
+    if args.log_out:
+        with open(args.log_out, "w") as f:
+            f.writelines(message + "\n" for message in result.logs)
+    problems = compare(recording, result)
+    if args.state and checkpoint_state(args.state) != result.state:
+        problems.append(f"final state differs from {args.state}")
+    for problem in problems:
+        print("MISMATCH:", problem)
+    if not problems:
+        print("Replay matches the recorded session:", result.state)
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import re
+import shutil
+import sys
+import time
+
+# ANSI control sequences used by the renderer
+CSI = "\x1b["
+RESET = CSI + "0m"
+CLEAR_SCREEN = CSI + "2J" + CSI + "H"
+CLEAR_LINE = CSI + "K"
+HIDE_CURSOR = CSI + "?25l"
+SHOW_CURSOR = CSI + "?25h"
+
+# Matches SGR (color/style) escape sequences inside composed lines
+SGR_PATTERN = re.compile(r"\x1b\[([0-9;]*)m")
+
+# Upper bound on the number of parsed lines kept around between frames
+PARSE_CACHE_SIZE = 4096
+
+
+# Split a line containing SGR escapes into a tuple of (style, char) cells.
+# The style of every cell is the full SGR prefix active at that position, so
+# any cell can be redrawn on its own after a cursor move.
+def parse_cells(line):
+    cells = []
+    style = ""
+    pos = 0
+    for match in SGR_PATTERN.finditer(line):
+        for char in line[pos:match.start()]:
+            cells.append((style, char))
+        params = match.group(1)
+        if params in ("", "0"):
+            style = ""
+        else:
+            style += match.group(0)
+        pos = match.end()
+    for char in line[pos:]:
+        cells.append((style, char))
+    return tuple(cells)
+
+
+# Keeps a back buffer of the last frame and writes only the cells that changed,
+# as one buffered write per frame. Rows are drawn at absolute positions, so a
+# frame is clipped to the terminal: `size()` returns its (columns, lines),
+# by default measured when drawing to stdout and unlimited otherwise. A
+# frame taller than the terminal keeps its bottom rows, as scrolling would.
+class TerminalRenderer:
+    def __init__(self, stream=None, stats=False, size=None):
+        self.stream = stream if stream is not None else sys.stdout
+        if size is None and self.stream is sys.stdout:
+            size = shutil.get_terminal_size
+        self.size = size
+        self.stats = stats
+        self.lines = []
+        self.last_bytes = 0
+        self.last_render_ms = 0.0
+        self.last_diff_ms = 0.0
+        self.last_write_ms = 0.0
+        self._rows = None
+        self._size = None
+        self._parse_cache = {}
+
+    # Parse a line into cells, reusing the result for lines seen before
+    # (frame art repeats every cycle, so most lines are cache hits).
+    def _cells(self, line):
+        cells = self._parse_cache.get(line)
+        if cells is None:
+            if len(self._parse_cache) >= PARSE_CACHE_SIZE:
+                self._parse_cache.clear()
+            cells = parse_cells(line)
+            self._parse_cache[line] = cells
+        return cells
+
+    # Forget the back buffer so the next frame is a full redraw
+    def invalidate(self):
+        self._rows = None
+
+    # Full redraw of the current frame (e.g. for a viewer joining mid-session),
+    # leaving the back buffer as it was
+    def keyframe(self):
+        rows = self._rows
+        self._rows = None
+        try:
+            return self.compose(self.lines)
+        finally:
+            self._rows = rows
+
+    # Build the escape sequence that turns the previous frame into this one
+    def compose(self, lines):
+        rows = [self._cells(line) for line in lines]
+        if self._size is not None:
+            columns, height = self._size
+            # The last row is left for the parked cursor
+            if len(rows) >= height:
+                rows = rows[len(rows) - height + 1:]
+            rows = [row[:columns] if len(row) > columns else row for row in rows]
+        out = []
+        previous = self._rows
+        if previous is None:
+            out.append(HIDE_CURSOR + CLEAR_SCREEN)
+            previous = []
+
+        for row_index, row in enumerate(rows):
+            old = previous[row_index] if row_index < len(previous) else ()
+            if row == old:
+                continue
+            col = 0
+            width = len(row)
+            while col < width:
+                if col < len(old) and row[col] == old[col]:
+                    col += 1
+                    continue
+                # Start of a run of changed cells: move there and redraw the run
+                out.append(f"{CSI}{row_index + 1};{col + 1}H")
+                style = None
+                while col < width and not (col < len(old) and row[col] == old[col]):
+                    cell_style, char = row[col]
+                    if cell_style != style:
+                        out.append(RESET + cell_style)
+                        style = cell_style
+                    out.append(char)
+                    col += 1
+                if style:
+                    out.append(RESET)
+            if len(old) > width:
+                out.append(f"{CSI}{row_index + 1};{width + 1}H{CLEAR_LINE}")
+
+        for row_index in range(len(rows), len(previous)):
+            out.append(f"{CSI}{row_index + 1};1H{CLEAR_LINE}")
+
+        # Park the cursor below the frame so stray output does not land inside it
+        if out:
+            out.append(f"{CSI}{len(rows) + 1};1H")
+        self._rows = rows
+        return "".join(out)
+
+    # Render a list of lines (which may contain color codes) in a single write.
+    # The time spent diffing and writing is kept separately for instrumentation.
+    def render(self, lines):
+        start = time.perf_counter()
+        if self.size is not None:
+            size = tuple(self.size())
+            # After a resize the terminal's contents can no longer be trusted
+            if size != self._size:
+                self._size = size
+                self.invalidate()
+        self.lines = list(lines)
+        output = self.compose(self.lines)
+        composed = time.perf_counter()
+        if output:
+            self.stream.write(output)
+            self.stream.flush()
+        end = time.perf_counter()
+        self.last_diff_ms = (composed - start) * 1000
+        self.last_write_ms = (end - composed) * 1000
+        self.last_render_ms = (end - start) * 1000
+        if self.stats:
+            self.last_bytes = len(output.encode("utf-8"))
+        return output
+
+    # One-line summary of the previous frame for the stats footer
+    def stats_line(self):
+        return f"Render: {self.last_bytes} bytes in {self.last_render_ms:.2f}ms"
+
+    # Restore the cursor and leave the screen below the last frame
+    def close(self):
+        self.stream.write(SHOW_CURSOR + RESET)
+        self.stream.flush()
+        self._rows = None
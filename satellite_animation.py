@@ -1,71 +1,67 @@
-import os
 import time
 import random
 import sys
-import json
-import pygame
+import argparse
+import shutil
 from colorama import init, Fore, Style
-from datetime import datetime
-
-# Cross-platform imports for non-blocking input
+from renderer import TerminalRenderer
+from frame_atlas import FrameAtlas
+from nasa_client import NasaClient, NASA_API_URL
+from nasa_cache import ResponseCache, CACHE_FILE
+from mission_log import BackgroundLogger, LOG_FILE
+from state_store import StateStore, STATE_FILE
+from simulation import SimState, step
+from event_loop import FrameScheduler, RawTerminal
+from orbit import SatelliteOrbit, Elements, propagate
+from neo_store import alert_from_row
+from frame_metrics import FrameMetrics, NULL_METRICS
+from audio import AudioPlayer, NULL_AUDIO
+from recording import SessionRecorder, load_recording, compare, ReplayResult
+from broadcast import BroadcastServer, BROADCAST_PORT
+from telemetry_history import TelemetryHistory, HISTORY_FILE, TREND_FIELDS
+from epic_ascii import EpicView, image_loader, FIXTURE_IMAGE, PALETTES
+from constellation import Constellation
+
+# Cross-platform imports for single-key input at the main menu
 import platform
 if platform.system() == "Windows":
     import msvcrt
 else:
-    import select
     import termios
     import tty
 
 # Initialize colorama for colored text
 init(autoreset=True)
 
-# Initialize pygame for sound effects
-pygame.mixer.init()
-
-# Load sound effects (replace with your own .wav files or comment out if unavailable)
-try:
-    sound_boot = pygame.mixer.Sound("boot.wav")
-    sound_event = pygame.mixer.Sound("event.wav")
-    sound_scan = pygame.mixer.Sound("scan.wav")
-    sound_transmit = pygame.mixer.Sound("transmit.wav")
-except FileNotFoundError:
-    sound_boot = sound_event = sound_scan = sound_transmit = None
+# Sound effects; pygame is loaded in the background on first use (replaced by
+# a silent player with --no-audio)
+audio = AudioPlayer()
 
-# File to store persistent state
-STATE_FILE = "satellite_state.json"
+# Persistent state: a checkpoint file plus a journal of changes since then
+state_store = StateStore(STATE_FILE)
 
-# Load or initialize satellite state
+# Load or initialize satellite state (older saves are migrated once)
 def load_state():
-    default_state = {"health": 100, "data_collected": 0, "missions_completed": 0, "solar_power": 100}
-    try:
-        with open(STATE_FILE, "r") as f:
-            state = json.load(f)
-            # Ensure all required keys exist, adding defaults if missing
-            for key, value in default_state.items():
-                if key not in state:
-                    state[key] = value
-            # If 'fuel' exists from an older save, convert it to 'solar_power'
-            if "fuel" in state:
-                state["solar_power"] = state.pop("fuel")
-            return state
-    except FileNotFoundError:
-        with open(STATE_FILE, "w") as f:
-            json.dump(default_state, f)
-        return default_state
-
-# Save satellite state
+    return state_store.load()
+
+# Save satellite state as an atomic checkpoint
 def save_state(state):
-    with open(STATE_FILE, "w") as f:
-        json.dump(state, f)
+    state_store.checkpoint(state)
+
+# Health tiers as (threshold, transform): a tier applies when health > threshold,
+# and None catches everything below the last threshold
+HEALTH_TIERS = [
+    (75, lambda frame: frame),
+    (50, lambda frame: frame.replace("[O]", "[#]").replace("=", "-")),
+    (None, lambda frame: frame.replace("[O]", "[X]").replace("=", "*").replace("-", "~")),
+]
 
 # Generate dynamic frames based on health
 def get_frame(health, base_frames):
-    if health > 75:
-        return base_frames
-    elif health > 50:
-        return [frame.replace("[O]", "[#]").replace("=", "-") for frame in base_frames]
-    else:
-        return [frame.replace("[O]", "[X]").replace("=", "*").replace("-", "~") for frame in base_frames]
+    for threshold, transform in HEALTH_TIERS:
+        if threshold is None or health > threshold:
+            return [transform(frame) for frame in base_frames]
+    return base_frames
 
 # Function to colorize frames based on state
 def colorize_frame(frame, state):
@@ -92,30 +88,6 @@ def colorize_frame(frame, state):
     
     return "\n".join(colored_lines)
 
-# Cross-platform function to get a single character without pressing Enter
-def get_char_non_blocking(timeout=0.1):
-    if platform.system() == "Windows":
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            if msvcrt.kbhit():
-                char = msvcrt.getch().decode('utf-8', errors='ignore').lower()
-                return char
-        return None
-    else:
-        fd = sys.stdin.fileno()
-        old_settings = termios.tcgetattr(fd)
-        try:
-            tty.setraw(fd)
-            if select.select([sys.stdin], [], [], timeout)[0]:
-                char = sys.stdin.read(1).lower()
-                return char
-            return None
-        except Exception as e:
-            print(f"Error in get_char_non_blocking: {e}")
-            return None
-        finally:
-            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
-
 # Enhanced boot-up sequence with sound
 def boot_up_sequence():
     boot_messages = [
@@ -132,8 +104,7 @@ def boot_up_sequence():
     print(Fore.MAGENTA + Style.BRIGHT + "Initializing Sentinel Spy Satellite...")
     for message, color in boot_messages:
         print(color + message)
-        if sound_boot:
-            sound_boot.play()
+        audio.play("boot")
         time.sleep(random.uniform(0.5, 1.5))
     time.sleep(1)
     print(Fore.CYAN + "\nStarting animation sequence...")
@@ -223,7 +194,15 @@ repair_frames = [
     for frame in base_frames
 ]
 
-# Dynamic status messages and events
+# Every frame set, already damaged per health tier and colorized, keyed by the
+# activity state the animation loop is in
+frame_atlas = FrameAtlas(HEALTH_TIERS, colorize_frame, prefix=Fore.CYAN + Style.BRIGHT)
+frame_atlas.add_frame_set("default", base_frames)
+frame_atlas.add_frame_set("scanning", scan_frames)
+frame_atlas.add_frame_set("transmitting", transmit_frames)
+frame_atlas.add_frame_set("repairing", repair_frames)
+
+# Dynamic status messages (events live in the simulation core)
 status_messages = [
     "Scanning sector 1... No anomalies detected",
     "Adjusting orbital trajectory... Complete",
@@ -232,233 +211,429 @@ status_messages = [
     "Signal strength: 98%... Stable",
 ]
 
-# Multi-stage event system
-events = [
-    {
-        "name": "Debris Field",
-        "stages": [
-            ("Debris field detected ahead! (E)vade or (T)ake the hit?", Fore.YELLOW),
-        ],
-        "outcomes": {
-            "e": ("Evasion successful! Minor solar power cost.", Fore.GREEN, -5, -10),
-            "t": ("Impact sustained! Minor damage taken.", Fore.RED, -10, 0),
-        }
-    },
-    {
-        "name": "Signal Intercept",
-        "stages": [
-            ("Unknown signal detected! (I)ntercept or (G)nore?", Fore.CYAN),
-        ],
-        "outcomes": {
-            "i": ("Signal intercepted! Data collected.", Fore.GREEN, 20, 0),
-            "g": ("Signal ignored. No changes.", Fore.YELLOW, 0, 0),
-        }
-    },
-]
-
-# Generate fake telemetry data
-def generate_telemetry():
-    return {
-        "latitude": round(random.uniform(-90, 90), 2),
-        "longitude": round(random.uniform(-180, 180), 2),
-        "altitude_km": round(random.uniform(500, 600), 1),
-        "temperature_c": round(random.uniform(-50, 50), 1),
-        "signal_noise_ratio": round(random.uniform(10, 30), 1),
+# Close approaches nearer than this (in lunar distances) become asteroid alerts
+ALERT_DISTANCE_LD = 20
+
+# Orbit the telemetry position is propagated along (replaced by --tle)
+satellite_orbit = SatelliteOrbit()
+
+# Follow the orbit a recorded session was played on
+def use_recorded_orbit(recording):
+    global satellite_orbit
+    if recording.orbit:
+        satellite_orbit = SatelliteOrbit(Elements(*(recording.orbit[field] for field in Elements._fields)))
+
+# Generate telemetry: position from the orbit model at Unix time `when`, and the
+# Earth view centre from live EPIC data when a NASA snapshot has it. Sensor
+# noise comes from `rng` so a seeded session draws the same readings.
+def generate_telemetry(snapshot=None, when=None, rng=random):
+    latitude, longitude, altitude = satellite_orbit.position(time.time() if when is None else when)
+    telemetry = {
+        "latitude": round(latitude, 2),
+        "longitude": round(longitude, 2),
+        "altitude_km": round(altitude, 1),
+        "temperature_c": round(rng.uniform(-50, 50), 1),
+        "signal_noise_ratio": round(rng.uniform(10, 30), 1),
+        "source": "simulated",
     }
+    if snapshot is not None and snapshot.epic:
+        telemetry["source"] = f"EPIC view {snapshot.epic['latitude']}°, {snapshot.epic['longitude']}°"
+    return telemetry
+
+# Mission log message and fields for a telemetry reading
+def telemetry_record(telemetry, health):
+    message = f"Telemetry - Lat: {telemetry['latitude']}, Lon: {telemetry['longitude']}, Health: {health}"
+    return message, {"latitude": telemetry["latitude"], "longitude": telemetry["longitude"], "health": health}
+
+# Telemetry log messages for many readings at once, with the positions
+# propagated in one batch (used by the headless replayer)
+def telemetry_messages(healths, whens):
+    latitudes, longitudes, _ = propagate(satellite_orbit.elements, whens)
+    return [telemetry_record({"latitude": round(float(lat), 2), "longitude": round(float(lon), 2)}, health)[0]
+            for lat, lon, health in zip(latitudes[0], longitudes[0], healths)]
+
+# Mission log; records are written by a background thread so the frame loop
+# never waits on the disk
+mission_log = BackgroundLogger(LOG_FILE)
 
 # Log data to a file
-def log_data(message):
-    with open("satellite_log.txt", "a") as f:
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        f.write(f"[{timestamp}] {message}\n")
-
-# Animation loop with telemetry, events, transmission, and repairs
-def animation_loop(state):
-    frame_speed = 0.5
-    status_index = 0
-    elapsed_time = 0
-    cycles = 0
-    scanning = False
-    scan_progress = 0
-    event_active = False
-    current_event = None
-    event_stage = 0
-    transmitting = False
-    transmit_progress = 0
-    repairing = False
-    repair_progress = 0
-
-    # Store the last processed character to avoid repeated inputs
-    last_char = None
+def log_data(message, **fields):
+    mission_log.log(message, **fields)
+
+# Sounds the simulation can ask for, by name
+def play_sound(name):
+    audio.play(name)
+
+# Build the lines of one screen: the satellite frame (or the lines of another
+# view, such as the Earth picture) plus telemetry and status
+def compose_screen(frame, sim, telemetry, stats_lines=(), view=None):
+    screen = list(frame.lines if view is None else view)
+    screen.append("")
+    screen.append(Fore.WHITE + f"Telemetry: Lat: {telemetry['latitude']}°, Lon: {telemetry['longitude']}°, Alt: {telemetry['altitude_km']}km")
+    screen.append(Fore.WHITE + f"Temp: {telemetry['temperature_c']}°C, SNR: {telemetry['signal_noise_ratio']}dB | Feed: {telemetry['source']}")
+
+    screen.append(Fore.GREEN + f"Satellite Health: {sim.health}% | Data: {sim.data_collected}MB | Solar Power: {sim.solar_power}%")
+    missions = Fore.GREEN + f"Missions Completed: {sim.missions_completed}"
+    if sim.fleet:
+        lost = sum(1 for health in sim.fleet.values() if health <= 0)
+        missions += f" | Fleet: {len(sim.fleet)} hit, {lost} lost"
+    screen.append(missions)
+    screen.append("")
+
+    if sim.scanning and sim.scan_progress < 100:
+        screen.append(Fore.BLUE + f"Scan Progress: {sim.scan_progress}%")
+    elif sim.transmitting and sim.transmit_progress < 100:
+        screen.append(Fore.MAGENTA + f"Transmitting Data: {sim.transmit_progress}%")
+    elif sim.repairing and sim.repair_progress < 100:
+        screen.append(Fore.YELLOW + f"Repairing: {sim.repair_progress}%")
+    elif sim.event is not None:
+        event_msg, event_color = sim.event["stages"][sim.event_stage]
+        screen.append(event_color + f"EVENT: {event_msg}")
+    else:
+        screen.append(Fore.YELLOW + "Status: " + status_messages[sim.status_index % len(status_messages)])
+
+    screen.append(Fore.GREEN + f"Elapsed Time: {sim.elapsed_time:.1f}s | Cycles: {sim.cycles}")
+    screen.append("")
+    screen.append(Fore.MAGENTA + "Controls: (S)peed, (D)ecrease, (C) to scan, (T)ransmit, (R)epair, (Q)uit")
+    for line in stats_lines:
+        screen.append(Fore.WHITE + line)
+    return screen
+
+# Key that toggles the frame timing overlay when instrumentation is on
+OVERLAY_KEY = "o"
+
+# Key that toggles the telemetry trend rows, and the samples they cover
+# (ten minutes at the default frame speed)
+HISTORY_KEY = "h"
+TREND_SAMPLES = 1200
+TREND_WIDTH = 40
+
+# Key that swaps the satellite for the latest EPIC picture of Earth, and the
+# screen rows kept for the status lines (and a notice) under it
+EARTH_KEY = "v"
+EARTH_STATUS_ROWS = 13
+
+# Sim seconds a conjunction waits for the satellite to be idle (no event,
+# scan, transmission or repair) before it is dropped as past
+CONJUNCTION_HOLD = 5.0
+
+# Animation loop: a fixed-timestep scheduler reads keys as they arrive; on
+# each tick the simulation core decides what happens, the resulting effects
+# are carried out and the next frame is drawn. Each phase of the frame is
+# timed into `metrics` (a no-op unless instrumentation is enabled).
+# Every session has a seed (random unless given) and telemetry follows
+# session time from a fixed epoch, so with `record` set the session can be
+# saved as its seed plus inputs. With `replay` (a loaded recording) the keys
+# and alerts come from the recording instead, nothing is saved or logged,
+# and the outcome is checked against the recorded one. Frames are also sent
+# to the viewers of `broadcast`, whose controller can press keys remotely.
+# Each frame's telemetry is appended to `history`, which can be shown as
+# trend rows. `earth` (an EpicView) draws the newest EPIC image, or
+# `earth_image` until there is one, sized to the terminal. With a
+# `constellation`, it is screened against its debris catalog every tick and
+# real conjunctions replace the random Debris Field event.
+def animation_loop(state, render_stats=False, nasa=None, seed=None, metrics=NULL_METRICS, record=None, replay=None,
+                   broadcast=None, history=None, earth=None, earth_image=FIXTURE_IMAGE, constellation=None):
+    frame_atlas.build()
+    renderer = TerminalRenderer(stats=render_stats)
+    if replay is not None:
+        seed, session_start = replay.seed, replay.epoch
+    else:
+        seed = random.randrange(2 ** 32) if seed is None else seed
+        session_start = time.time()
+    rng = random.Random(seed)
+    sensor_rng = random.Random(seed + 1)
+    screened = replay.debris_screened if replay is not None else constellation is not None
+    sim = SimState.from_persistent(state, debris_screened=screened)
+    scheduler = FrameScheduler(sim.frame_speed, metrics=metrics)
+    feed = {"snapshot": nasa.snapshot if nasa else None}
+    recorder = None
+    if record:
+        orbit = {field: values.tolist() for field, values in satellite_orbit.elements._asdict().items()}
+        recorder = SessionRecorder(record, seed, session_start, state, orbit, screened)
+    replayed_logs = []
+    tick = 0
+    # Approaches that passed before the session started are not news
+    alert_cursor = int(session_start * 1000)
+    conjunctions = []
+    overlay = False
+    trends = False
+    earth_view = False
+    notices = []
+    telemetry = None
+
+    # Draw lines on the terminal and for any network viewers
+    def show(lines):
+        output = renderer.render(lines)
+        if broadcast:
+            broadcast.publish(output, renderer.keyframe)
+
+    # Show a one-line notice under the frame until the next tick, so it stays
+    # up through any pause that follows it
+    def notify(message):
+        notices.append(message)
+
+    # Earth picture for the terminal's current size; None (and a status line)
+    # while it is rendered in the background
+    def earth_lines(stats_lines):
+        snapshot = feed["snapshot"]
+        image = snapshot.epic["image"] if snapshot is not None and snapshot.epic else earth_image
+        size = shutil.get_terminal_size()
+        lines = earth.lines(image, max(1, size.lines - EARTH_STATUS_ROWS - len(stats_lines)), size.columns)
+        if lines is None:
+            stats_lines.append(f"Earth view: {earth.error}" if earth.error else f"Earth view: rendering {image}...")
+        return lines
+
+    # Draw the frame for the current simulation state
+    def draw():
+        nonlocal telemetry
+        started = metrics.clock()
+        frames = frame_atlas.frames(sim.health, sim.mode)
+        telemetry = generate_telemetry(feed["snapshot"], session_start + sim.elapsed_time, sensor_rng)
+        if history is not None and replay is None:
+            history.append(session_start + sim.elapsed_time, telemetry, sim.health, sim.solar_power)
+        stats_lines = [renderer.stats_line(), scheduler.stats_line()] if render_stats else []
+        if render_stats and constellation is not None:
+            stats_lines.append(constellation.stats_line())
+        if overlay:
+            stats_lines = stats_lines + metrics.overlay_lines()
+        if trends:
+            stats_lines = stats_lines + [history.trend_row(label, field, TREND_WIDTH, TREND_SAMPLES, unit)
+                                         for label, field, unit in TREND_FIELDS]
+        view = earth_lines(stats_lines) if earth_view else None
+        screen = compose_screen(frames[sim.frame_index % len(frames)], sim, telemetry, stats_lines, view)
+        if notices:
+            screen += [""] + notices
+        composed = metrics.clock()
+        show(screen)
+        metrics.observe("compose", composed - started + renderer.last_diff_ms / 1000)
+        metrics.observe("write", renderer.last_write_ms / 1000)
+
+    # Queue a mission log record, timing the (non-blocking) call
+    def log(message, **fields):
+        if replay is not None:
+            replayed_logs.append(message)
+            return
+        started = metrics.clock()
+        log_data(message, **fields)
+        if recorder:
+            recorder.log(message)
+        metrics.observe("log", metrics.clock() - started)
+
+    # Screen the constellation at the current sim time, keeping conjunctions
+    # that are not yet past (and none of satellites already lost)
+    def screen_conjunctions():
+        started = metrics.clock()
+        when = session_start + sim.elapsed_time
+        conjunctions[:] = [alert for alert in conjunctions if when - alert["epoch_ms"] / 1000 <= CONJUNCTION_HOLD]
+        conjunctions.extend(alert for alert in constellation.screen(when) if sim.fleet.get(alert["satellite"]) != 0)
+        metrics.observe("screen", metrics.clock() - started)
+
+    # Next conjunction, or else close approach from the NASA feed, that has
+    # not been raised yet
+    def pending_alert():
+        if conjunctions:
+            return conjunctions[0]
+        snapshot = feed["snapshot"]
+        if snapshot is None or not snapshot.neos:
+            return None
+        rows = snapshot.neos.next_approaches(1, ALERT_DISTANCE_LD, alert_cursor)
+        return alert_from_row(rows[0]) if len(rows) else None
+
+    # Advance the simulation with the key pressed during the last tick
+    def on_tick(char):
+        nonlocal sim, alert_cursor, overlay, trends, earth_view, tick
+        notices.clear()
+        if char == OVERLAY_KEY and metrics.enabled:
+            overlay = not overlay
+            char = None
+        elif char == HISTORY_KEY and history is not None:
+            trends = not trends
+            char = None
+        elif char == EARTH_KEY and earth is not None:
+            earth_view = not earth_view
+            char = None
+        if replay is not None:
+            # Keys only stop the playback; the inputs are the recorded ones
+            if char == "q" or tick >= replay.ticks:
+                return False
+            char = replay.keys.get(tick)
+            alert = replay.alerts.get(tick)
+        else:
+            if constellation is not None:
+                screen_conjunctions()
+            alert = pending_alert()
+        sim, effects = step(sim, char, rng, alert)
+        if recorder and char:
+            recorder.key(tick, char)
+        for effect in effects:
+            kind = effect[0]
+            if kind == "notice":
+                notify(effect[2] + effect[1])
+            elif kind == "failure":
+                notify(Fore.RED + effect[1])
+            elif kind == "log":
+                log(effect[1])
+            elif kind == "telemetry":
+                message, fields = telemetry_record(telemetry, sim.health)
+                log(message, **fields)
+            elif kind == "sound":
+                play_sound(effect[1])
+            elif kind == "pause":
+                scheduler.delay(effect[1])
+            elif kind == "alert":
+                if effect[1].get("kind") != "conjunction":
+                    alert_cursor = effect[1]["epoch_ms"] + 1
+                elif effect[1] in conjunctions:
+                    conjunctions.remove(effect[1])
+                if recorder:
+                    recorder.alert(tick, effect[1])
+        if recorder:
+            recorder.snapshot(tick, sim)
+        tick += 1
+
+        state.update(sim.persistent())
+        if replay is None:
+            started = metrics.clock()
+            state_store.record(state)
+            metrics.observe("persist", metrics.clock() - started)
+        if not sim.running:
+            # Leave a critical failure on the last frame
+            if notices:
+                draw()
+            return False
+        scheduler.tick = sim.frame_speed
+        draw()
+
+    # New NASA data wakes the loop on its own thread instead of being polled
+    if nasa:
+        nasa.on_update = lambda snapshot: scheduler.call_soon_threadsafe(
+            lambda: feed.update(snapshot=snapshot))
+    # Keys from the remote controller join the local ones
+    if broadcast:
+        broadcast.on_key = lambda key: scheduler.call_soon_threadsafe(lambda: scheduler.keys.append(key))
+
+    # A replayed session never overwrites the saved game
+    def save():
+        if replay is None:
+            save_state(state)
 
     try:
-        while True:
-            # Determine which frame set to use and adjust for health
-            if scanning and scan_progress < 100:
-                frames = get_frame(state["health"], scan_frames)
-                current_state = "scanning"
-            elif transmitting and transmit_progress < 100:
-                frames = get_frame(state["health"], transmit_frames)
-                current_state = "transmitting"
-            elif repairing and repair_progress < 100:
-                frames = get_frame(state["health"], repair_frames)
-                current_state = "repairing"
-            else:
-                frames = get_frame(state["health"], base_frames)
-                current_state = "default"
-
-            for frame in frames:
-                os.system('cls' if os.name == 'nt' else 'clear')
-                colored_frame = colorize_frame(frame, current_state)
-                print(Fore.CYAN + Style.BRIGHT + colored_frame)
-
-                telemetry = generate_telemetry()
-                print(Fore.WHITE + f"\nTelemetry: Lat: {telemetry['latitude']}°, Lon: {telemetry['longitude']}°, Alt: {telemetry['altitude_km']}km")
-                print(Fore.WHITE + f"Temp: {telemetry['temperature_c']}°C, SNR: {telemetry['signal_noise_ratio']}dB")
-
-                print(Fore.GREEN + f"Satellite Health: {state['health']}% | Data: {state['data_collected']}MB | Solar Power: {state['solar_power']}%")
-                print(Fore.GREEN + f"Missions Completed: {state['missions_completed']}")
-
-                if scanning and scan_progress < 100:
-                    print(Fore.BLUE + f"\nScan Progress: {scan_progress}%")
-                    scan_progress += 10
-                elif transmitting and transmit_progress < 100:
-                    print(Fore.MAGENTA + f"\nTransmitting Data: {transmit_progress}%")
-                    transmit_progress += 10
-                    if random.random() < 0.05:
-                        print(Fore.RED + "\nInterference detected! Transmission disrupted.")
-                        log_data("Transmission disrupted due to interference")
-                        transmitting = False
-                        transmit_progress = 0
-                        time.sleep(2)
-                elif repairing and repair_progress < 100:
-                    print(Fore.YELLOW + f"\nRepairing: {repair_progress}%")
-                    repair_progress += 10
-                elif event_active:
-                    event_msg, event_color = current_event["stages"][event_stage]
-                    print(event_color + f"\nEVENT: {event_msg}")
-                else:
-                    print(Fore.YELLOW + "\nStatus: " + status_messages[status_index])
-
-                print(Fore.GREEN + f"Elapsed Time: {elapsed_time:.1f}s | Cycles: {cycles}")
-                print(Fore.MAGENTA + "\nControls: (S)peed, (D)ecrease, (C) to scan, (T)ransmit, (R)epair, (Q)uit")
-
-                time.sleep(frame_speed)
-                elapsed_time += frame_speed
-                status_index = (status_index + 1) % len(status_messages)
-
-                if not event_active and not scanning and not transmitting and not repairing and random.random() < 0.03:
-                    event_active = True
-                    current_event = random.choice(events)
-                    event_stage = 0
-                    if sound_event:
-                        sound_event.play()
-                    log_data(f"EVENT: {current_event['stages'][event_stage][0]}")
-
-                if cycles % 10 == 0:
-                    log_data(f"Telemetry - Lat: {telemetry['latitude']}, Lon: {telemetry['longitude']}, Health: {state['health']}")
-
-                # Capture and process keypresses in real-time
-                char = get_char_non_blocking(timeout=frame_speed)
-                if char and char != last_char:  # Process new keypresses only
-                    print(f"DEBUG: Key pressed: '{char}'")  # Debug input
-                    last_char = char
-                    if char == 'q':
-                        break
-                    elif char == 's':
-                        frame_speed = max(0.1, frame_speed - 0.1)
-                    elif char == 'd':
-                        frame_speed = min(2.0, frame_speed + 0.1)
-                    elif char == 'c' and not event_active and not transmitting and not repairing:
-                        if not scanning:
-                            scanning = True
-                            scan_progress = 0
-                            print(Fore.BLUE + "\nInitiating scan...")
-                            if sound_scan:
-                                sound_scan.play()
-                            log_data("Initiated sector scan")
-                    elif char == 't' and not event_active and not scanning and not repairing:
-                        if state["data_collected"] >= 100 and not transmitting:
-                            transmitting = True
-                            transmit_progress = 0
-                            print(Fore.MAGENTA + "\nInitiating data transmission...")
-                            if sound_transmit:
-                                sound_transmit.play()
-                            log_data("Initiated data transmission")
-                    elif char == 'r' and not event_active and not scanning and not transmitting:
-                        if state["health"] < 100 and state["solar_power"] >= 10 and not repairing:
-                            repairing = True
-                            repair_progress = 0
-                            print(Fore.YELLOW + "\nInitiating repairs...")
-                            state["solar_power"] -= 10
-                            log_data("Initiated repairs: Consumed 10% solar power")
-                    elif event_active:
-                        print(f"DEBUG: Processing event input: '{char}'")  # Debug input
-                        print(f"DEBUG: Available outcomes: {current_event['outcomes'].keys()}")
-                        if char in current_event["outcomes"]:
-                            outcome_msg, outcome_color, outcome_effect, solar_power_effect = current_event["outcomes"][char]
-                            print(outcome_color + f"\nOUTCOME: {outcome_msg}")
-                            if outcome_effect < 0:
-                                state["health"] = max(0, state["health"] + outcome_effect)
-                            else:
-                                state["data_collected"] += outcome_effect
-                            state["solar_power"] = max(0, state["solar_power"] + solar_power_effect)
-                            log_data(f"Event Outcome: {outcome_msg}")
-                            event_active = False
-                            time.sleep(2)
-                        else:
-                            outcome_msg, outcome_color, outcome_effect, solar_power_effect = current_event["outcomes"].get("g", ("No action taken.", Fore.YELLOW, 0, 0))
-                            print(outcome_color + f"\nOUTCOME: {outcome_msg}")
-                            state["data_collected"] += outcome_effect
-                            state["solar_power"] = max(0, state["solar_power"] + solar_power_effect)
-                            log_data(f"Event Outcome: {outcome_msg}")
-                            event_active = False
-                            time.sleep(2)
-
-            if 'char' in locals() and char == 'q':
-                break
-
-            cycles += 1
-            if scanning and scan_progress >= 100:
-                print(Fore.GREEN + "\nScan complete! Data collected.")
-                state["data_collected"] += 50
-                log_data("Scan completed: 50MB data collected")
-                scanning = False
-            if transmitting and transmit_progress >= 100:
-                print(Fore.GREEN + "\nTransmission complete! Data sent to ground station.")
-                state["missions_completed"] += 1
-                state["data_collected"] = 0
-                log_data(f"Transmission completed: Mission {state['missions_completed']}")
-                transmitting = False
-            if repairing and repair_progress >= 100:
-                print(Fore.GREEN + "\nRepairs complete! Health restored.")
-                state["health"] = min(100, state["health"] + 20)
-                log_data("Repairs completed: Health +20%")
-                repairing = False
-
-            if state["health"] <= 0:
-                print(Fore.RED + "\nCRITICAL FAILURE: Satellite health depleted!")
-                log_data("Satellite failure: Health depleted")
-                break
-            if state["solar_power"] <= 0:
-                print(Fore.RED + "\nCRITICAL FAILURE: Solar power depleted!")
-                log_data("Satellite failure: Solar power depleted")
-                break
-
-        save_state(state)
+        if replay is None:
+            log_data(f"Session seed: {seed}")
+        with RawTerminal():
+            draw()
+            scheduler.run(on_tick)
+        if replay is None:
+            log_data(f"Frame pacing - {scheduler.stats_line()}")
+        save()
 
     except KeyboardInterrupt:
         print(Fore.RED + "\nAnimation terminated by user.")
-        save_state(state)
+        save()
     except Exception as e:
         print(Fore.RED + f"\nError occurred: {e}")
-        save_state(state)
+        save()
     finally:
+        if nasa:
+            nasa.on_update = None
+        if broadcast:
+            broadcast.on_key = None
+        if recorder:
+            recorder.close(tick, sim.persistent())
+        if history is not None:
+            history.flush()
+        if earth is not None:
+            earth.close()
+        scheduler.close()
+        mission_log.flush()
+        renderer.close()
         print(Fore.CYAN + "\nShutting down animation sequence...")
-        pygame.mixer.quit()
+    if replay is not None:
+        return compare(replay, ReplayResult(sim.persistent(), tick, sim.elapsed_time, replayed_logs, None))
+
+# Command-line options for the simulator
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Sentinel Spy Satellite Simulator")
+    parser.add_argument("--render-stats", action="store_true",
+                        help="show bytes written and render time for each frame")
+    parser.add_argument("--offline", action="store_true",
+                        help="do not contact NASA; use simulated telemetry only")
+    parser.add_argument("--nasa-url", default=NASA_API_URL,
+                        help="NASA API root, e.g. a local nasa_fixture_server.py")
+    parser.add_argument("--api-key", default=None,
+                        help="NASA API key (defaults to $NASA_API_KEY or DEMO_KEY)")
+    parser.add_argument("--cache-file", default=CACHE_FILE,
+                        help="SQLite file used to cache NASA responses between runs")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always fetch NASA data instead of using the response cache")
+    parser.add_argument("--log-json", action="store_true",
+                        help="write the mission log as JSON Lines instead of plain text")
+    parser.add_argument("--log-max-bytes", type=int, default=0,
+                        help="rotate the mission log once it reaches this size (0 = never)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed the event and interference rolls for a reproducible session")
+    parser.add_argument("--tle", default=None,
+                        help="file with a two- or three-line element set for the satellite's orbit")
+    parser.add_argument("--no-audio", action="store_true",
+                        help="do not load pygame or play sound effects")
+    parser.add_argument("--record", default=None,
+                        help="record the session's seed and inputs to this file for replaying")
+    parser.add_argument("--replay", default=None,
+                        help="play back a recorded session in real time and check it ends the same way")
+    parser.add_argument("--broadcast", type=int, nargs="?", const=BROADCAST_PORT, default=None, metavar="PORT",
+                        help=f"let viewers watch the console over TCP (default port {BROADCAST_PORT})")
+    parser.add_argument("--broadcast-host", default="127.0.0.1",
+                        help="address to accept viewers on (0.0.0.0 for every interface)")
+    parser.add_argument("--control-token", default=None,
+                        help="a viewer that sends 'control TOKEN' may use the controls")
+    parser.add_argument("--history-file", default=HISTORY_FILE,
+                        help="memory-mapped file keeping the last day of telemetry; press H for trend rows")
+    parser.add_argument("--no-history", action="store_true",
+                        help="do not keep a telemetry history")
+    parser.add_argument("--epic-palette", choices=PALETTES, default="ansi256",
+                        help="characters only, or colored with the xterm 256-color palette, in the Earth view (v)")
+    parser.add_argument("--epic-image", default=FIXTURE_IMAGE,
+                        help="PNG shown in the Earth view offline or until the first EPIC image arrives")
+    parser.add_argument("--constellation", type=int, default=0, metavar="N",
+                        help="fly N more satellites in a Walker constellation around this one, screened against debris")
+    parser.add_argument("--debris", type=int, default=20000, metavar="N",
+                        help="objects in the synthetic debris catalog for --constellation")
+    parser.add_argument("--debris-tle", default=None, metavar="FILE",
+                        help="screen against the objects in a TLE file instead of the synthetic catalog")
+    parser.add_argument("--metrics", action="store_true",
+                        help="time every phase of each frame; press O to toggle the timing overlay")
+    parser.add_argument("--metrics-file", default=None,
+                        help="write frame timings here on exit (JSON for .json, Prometheus text otherwise); implies --metrics")
+    return parser.parse_args(argv)
+
+# Play a recorded session back on screen at its original pace
+def replay_session(path, render_stats=False, metrics=NULL_METRICS):
+    recording = load_recording(path)
+    use_recorded_orbit(recording)
+    print(Fore.CYAN + f"Replaying {path}: {recording.ticks} ticks, seed {recording.seed}")
+    problems = animation_loop(dict(recording.state), render_stats=render_stats, metrics=metrics, replay=recording)
+    for problem in problems:
+        print(Fore.RED + f"Replay mismatch: {problem}")
+    if not problems:
+        print(Fore.GREEN + "Replay matches the recorded session.")
+    return not problems
 
 # Main program with welcome message
 def main():
+    args = parse_args()
+    global satellite_orbit, audio
+    # Load the sounds while the welcome prompt waits for a key
+    audio = NULL_AUDIO if args.no_audio else audio.start()
+    if args.tle:
+        satellite_orbit = SatelliteOrbit.from_tle_file(args.tle)
+    mission_log.json_lines = args.log_json
+    mission_log.max_bytes = args.log_max_bytes
+    metrics = FrameMetrics() if args.metrics or args.metrics_file else NULL_METRICS
+    if args.replay:
+        matched = replay_session(args.replay, args.render_stats, metrics)
+        audio.close()
+        sys.exit(0 if matched else 1)
     state = load_state()
     print(Fore.MAGENTA + Style.BRIGHT + f"Welcome to Sentinel Spy Satellite System v5.0")
     print(Fore.YELLOW + f"Current Status - Health: {state['health']}%, Data: {state['data_collected']}MB, Solar Power: {state['solar_power']}%")
@@ -470,8 +645,52 @@ def main():
         print(Fore.RED + "\nProgram aborted.")
         sys.exit(0)
 
+    nasa = None
+    if not args.offline:
+        cache = None if args.no_cache else ResponseCache(args.cache_file)
+        nasa = NasaClient(api_key=args.api_key, base_url=args.nasa_url, cache=cache).start()
+
+    broadcast = None
+    if args.broadcast is not None:
+        broadcast = BroadcastServer(args.broadcast_host, args.broadcast, control_token=args.control_token).start()
+        host, port = broadcast.address
+        print(Fore.CYAN + f"Broadcasting the console on {host}:{port} (watch with: nc {host} {port})")
+
+    history = None if args.no_history else TelemetryHistory(path=args.history_file)
+
+    earth = EpicView(image_loader(nasa), args.epic_palette)
+    constellation = None
+    if args.constellation > 0:
+        debris, debris_names = Constellation.load_debris(args.debris_tle, args.debris, args.seed or 0)
+        constellation = Constellation.around(satellite_orbit, args.constellation, debris, debris_names)
+        print(Fore.CYAN + f"Constellation of {len(constellation)} satellites, screening "
+              f"{len(constellation.debris_names)} of {constellation.catalog_size} debris objects in their shell")
+
     boot_up_sequence()
-    animation_loop(state)
+    try:
+        animation_loop(state, render_stats=args.render_stats, nasa=nasa, seed=args.seed, metrics=metrics,
+                       record=args.record, broadcast=broadcast, history=history, earth=earth,
+                       earth_image=args.epic_image, constellation=constellation)
+    finally:
+        if history is not None:
+            history.close()
+        if broadcast:
+            stats = broadcast.stats()
+            broadcast.stop()
+            print(Fore.CYAN + f"Broadcast: {stats['frames']} frames, {stats['bytes_sent']} bytes sent, "
+                  f"{stats['dropped']} frames dropped for slow viewers")
+        if args.metrics_file:
+            metrics.export(args.metrics_file)
+            print(Fore.CYAN + f"Frame timings written to {args.metrics_file}")
+        if nasa:
+            nasa.stop()
+            if nasa.cache:
+                stats = nasa.cache.stats()
+                print(Fore.CYAN + f"NASA cache: {stats['hits']} hits, {stats['revalidations']} revalidated, "
+                      f"{stats['misses']} misses, {stats['bytes_saved']} bytes saved")
+                nasa.cache.close()
+    audio.close()
+    mission_log.close()
     print(Fore.GREEN + "System shutdown complete. Goodbye.")
 
 # Blocking getchar for main menu (since we want to wait for input here)
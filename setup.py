@@ -3,16 +3,20 @@ from setuptools import setup, find_packages
 setup(
     name='sentinel_satellite',  # The name of your package
     version='1.0.0',  # Version of your package
-    packages=find_packages(),  # Automatically find packages in your repo
-    py_modules=['satellite_animationv11'],  # Include your Python script
+    packages=find_packages(exclude=['benchmarks']),  # Automatically find packages in your repo
+    py_modules=['satellite_animation', 'renderer', 'frame_atlas', 'nasa_client', 'nasa_cache', 'nasa_fixture_server', 'mission_log', 'state_store', 'simulation', 'event_loop', 'orbit', 'neo_store', 'frame_metrics', 'audio', 'recording', 'broadcast', 'telemetry_history', 'log_analytics', 'neo_backfill', 'epic_ascii', 'constellation'],  # Include your Python scripts
+    # The fixture data installs next to the modules that read it, under a name
+    # that does not clash with the fixtures library on PyPI
+    package_data={'sentinel_fixtures': ['*.json', '*.png']},
     install_requires=[
         'requests',
         'pygame',
-        'colorama'
+        'colorama',
+        'numpy'
     ],  # Dependencies
     entry_points={
         'console_scripts': [
-            'sentinel_satellite=satellite_animationv11:main',  # Command to run
+            'sentinel_satellite=satellite_animation:main',  # Command to run
         ],
     },
 )
@@ -0,0 +1,378 @@
+import argparse
+import random
+import time
+
+from colorama import Fore
+
+# Animation frames shown per cycle; progress and failures are checked once a cycle
+FRAMES_PER_CYCLE = 2
+
+# Chance per idle frame of a random event, and per transmitting frame of interference
+EVENT_CHANCE = 0.03
+INTERFERENCE_CHANCE = 0.05
+
+# Frame speed limits and step for the (S)peed / (D)ecrease controls
+MIN_FRAME_SPEED = 0.1
+MAX_FRAME_SPEED = 2.0
+FRAME_SPEED_STEP = 0.1
+
+# Seconds the front end pauses so an outcome or interference notice can be read
+NOTICE_PAUSE = 2
+
+# Number of rotating status messages
+STATUS_MESSAGE_COUNT = 5
+
+# Multi-stage event system
+events = [
+    {
+        "name": "Debris Field",
+        "stages": [
+            ("Debris field detected ahead! (E)vade or (T)ake the hit?", Fore.YELLOW),
+        ],
+        "outcomes": {
+            "e": ("Evasion successful! Minor solar power cost.", Fore.GREEN, -5, -10),
+            "t": ("Impact sustained! Minor damage taken.", Fore.RED, -10, 0),
+        }
+    },
+    {
+        "name": "Signal Intercept",
+        "stages": [
+            ("Unknown signal detected! (I)ntercept or (G)nore?", Fore.CYAN),
+        ],
+        "outcomes": {
+            "i": ("Signal intercepted! Data collected.", Fore.GREEN, 20, 0),
+            "g": ("Signal ignored. No changes.", Fore.YELLOW, 0, 0),
+        }
+    },
+]
+
+
+# Event for a real close approach from the NEO store (see neo_store.alert_from_row)
+def asteroid_event(alert):
+    hazard = "HAZARDOUS asteroid" if alert["hazardous"] else "Asteroid"
+    return {
+        "name": "Asteroid Alert",
+        "stages": [
+            (f"{hazard} {alert['name']} passing at {alert['miss_ld']} LD, {alert['velocity_kps']} km/s! "
+             "(T)rack or (G)nore?", Fore.RED if alert["hazardous"] else Fore.YELLOW),
+        ],
+        "outcomes": {
+            "t": ("Asteroid tracked! Close-approach data collected.", Fore.GREEN, 30, -5),
+            "g": ("Asteroid ignored. No changes.", Fore.YELLOW, 0, 0),
+        },
+    }
+
+
+# Debris Field event for a real conjunction found by constellation screening
+# (see constellation.Constellation.screen). When the conjunction is another
+# satellite's than the player's (index 0), the event names it and its outcome
+# is settled on that satellite's health (SimState.fleet).
+def conjunction_event(alert):
+    event = {
+        "name": "Debris Field",
+        "stages": [
+            (f"Debris {alert['object']} passing {alert['satellite']} at {alert['miss_km']} km, "
+             f"{alert['velocity_kps']} km/s! (E)vade or (T)ake the hit?", Fore.YELLOW),
+        ],
+        "outcomes": events[0]["outcomes"],
+    }
+    if alert.get("satellite_index", 0):
+        event["satellite"] = alert["satellite"]
+    return event
+
+
+# Keys of SimState that are saved between sessions
+PERSISTENT_KEYS = ("health", "data_collected", "missions_completed", "solar_power")
+
+
+# Everything the game logic needs between frames: the persistent satellite
+# state plus the in-session progress, event and pacing fields. `mode` is the
+# activity chosen at the start of the cycle and selects the frame set, and
+# `event` is the active event dict (or None). With `debris_screened`, debris
+# events come only from real conjunctions, never from the random draw, and
+# `fleet` holds the health of the other satellites of the constellation that
+# have been hit, by name (the rest are at 100). It is replaced, not changed in
+# place, so copies can share it.
+class SimState:
+    __slots__ = (
+        "health", "data_collected", "missions_completed", "solar_power",
+        "frame_speed", "elapsed_time", "status_index", "cycles", "frame_index", "mode",
+        "scanning", "scan_progress", "transmitting", "transmit_progress",
+        "repairing", "repair_progress", "event", "event_stage", "running", "debris_screened", "fleet",
+    )
+
+    def __init__(self, health=100, data_collected=0, missions_completed=0, solar_power=100, frame_speed=0.5,
+                 debris_screened=False):
+        self.health = health
+        self.data_collected = data_collected
+        self.missions_completed = missions_completed
+        self.solar_power = solar_power
+        self.frame_speed = frame_speed
+        self.elapsed_time = 0
+        self.status_index = 0
+        self.cycles = 0
+        self.frame_index = 0
+        self.mode = "default"
+        self.scanning = False
+        self.scan_progress = 0
+        self.transmitting = False
+        self.transmit_progress = 0
+        self.repairing = False
+        self.repair_progress = 0
+        self.event = None
+        self.event_stage = 0
+        self.running = True
+        self.debris_screened = debris_screened
+        self.fleet = {}
+
+    # Start a session from the persisted state dict
+    @classmethod
+    def from_persistent(cls, state, **kwargs):
+        return cls(**{key: state[key] for key in PERSISTENT_KEYS}, **kwargs)
+
+    # The part of the state that goes into satellite_state.json
+    def persistent(self):
+        return {key: getattr(self, key) for key in PERSISTENT_KEYS}
+
+    def copy(self):
+        other = SimState.__new__(SimState)
+        for slot in SimState.__slots__:
+            setattr(other, slot, getattr(self, slot))
+        return other
+
+    def __eq__(self, other):
+        return isinstance(other, SimState) and all(
+            getattr(self, slot) == getattr(other, slot) for slot in SimState.__slots__)
+
+    def __repr__(self):
+        fields = ", ".join(f"{slot}={getattr(self, slot)!r}" for slot in SimState.__slots__)
+        return f"SimState({fields})"
+
+
+# Pick the frame set for a cycle from what the satellite is busy with
+def cycle_mode(state):
+    if state.scanning and state.scan_progress < 100:
+        return "scanning"
+    if state.transmitting and state.transmit_progress < 100:
+        return "transmitting"
+    if state.repairing and state.repair_progress < 100:
+        return "repairing"
+    return "default"
+
+
+# Advance the simulation by one frame: `key` is the keypress read during the
+# frame (or None) and `alert` an optional pending alert. An asteroid alert is
+# raised in place of a random event the next time one would start; a
+# conjunction alert (kind "conjunction") is raised as a Debris Field event as
+# soon as the satellite is idle (no event, scan, transmission or repair, so
+# its prompt is what the screen shows). Returns the next state and the effects
+# the front end should carry out, as tuples:
+#   ("notice", message, color)  show a message under the frame
+#   ("log", message)            write to the mission log
+#   ("telemetry",)              log this frame's telemetry
+#   ("sound", name)             play "event", "scan" or "transmit"
+#   ("pause", seconds)          hold the screen so a notice can be read
+#   ("failure", message)        the session ended in a critical failure
+#   ("alert", alert)            the pending alert was raised
+# The input state is not modified; all randomness comes from `rng`.
+def step(state, key, rng, alert=None):
+    state = state.copy()
+    effects = []
+    advance(state, key, rng, effects, alert)
+    return state, effects
+
+
+# In-place variant of step() used by the headless runner; `effects` may be
+# None to skip collecting effects
+def advance(state, key, rng, effects=None, alert=None):
+    emit = effects.append if effects is not None else _discard
+
+    # Progress for whatever is running this frame
+    if state.scanning and state.scan_progress < 100:
+        state.scan_progress += 10
+    elif state.transmitting and state.transmit_progress < 100:
+        state.transmit_progress += 10
+        if rng.random() < INTERFERENCE_CHANCE:
+            emit(("notice", "Interference detected! Transmission disrupted.", Fore.RED))
+            emit(("log", "Transmission disrupted due to interference"))
+            emit(("pause", NOTICE_PAUSE))
+            state.transmitting = False
+            state.transmit_progress = 0
+    elif state.repairing and state.repair_progress < 100:
+        state.repair_progress += 10
+
+    state.elapsed_time += state.frame_speed
+    state.status_index = (state.status_index + 1) % STATUS_MESSAGE_COUNT
+
+    busy = state.scanning or state.transmitting or state.repairing
+    if state.event is None and not busy and alert is not None and alert.get("kind") == "conjunction":
+        _start_event(state, conjunction_event(alert), emit, alert)
+    elif state.event is None and not busy and rng.random() < EVENT_CHANCE:
+        if alert is not None:
+            _start_event(state, asteroid_event(alert), emit, alert)
+        else:
+            event = events[rng.randrange(len(events))]
+            if not (state.debris_screened and event["name"] == "Debris Field"):
+                _start_event(state, event, emit)
+
+    if state.cycles % 10 == 0:
+        emit(("telemetry",))
+
+    if key:
+        if key == "q":
+            state.running = False
+            return state
+        _handle_key(state, key, emit)
+
+    state.frame_index += 1
+    if state.frame_index >= FRAMES_PER_CYCLE:
+        state.frame_index = 0
+        _end_cycle(state, emit)
+    return state
+
+
+def _discard(effect):
+    pass
+
+
+def _start_event(state, event, emit, alert=None):
+    state.event = event
+    state.event_stage = 0
+    if alert is not None:
+        emit(("alert", alert))
+    emit(("sound", "event"))
+    emit(("log", f"EVENT: {event['stages'][0][0]}"))
+
+
+def _handle_key(state, key, emit):
+    event_active = state.event is not None
+    if key == "s":
+        state.frame_speed = max(MIN_FRAME_SPEED, state.frame_speed - FRAME_SPEED_STEP)
+    elif key == "d":
+        state.frame_speed = min(MAX_FRAME_SPEED, state.frame_speed + FRAME_SPEED_STEP)
+    elif key == "c" and not event_active and not state.transmitting and not state.repairing:
+        if not state.scanning:
+            state.scanning = True
+            state.scan_progress = 0
+            emit(("notice", "Initiating scan...", Fore.BLUE))
+            emit(("sound", "scan"))
+            emit(("log", "Initiated sector scan"))
+    elif key == "t" and not event_active and not state.scanning and not state.repairing:
+        if state.data_collected >= 100 and not state.transmitting:
+            state.transmitting = True
+            state.transmit_progress = 0
+            emit(("notice", "Initiating data transmission...", Fore.MAGENTA))
+            emit(("sound", "transmit"))
+            emit(("log", "Initiated data transmission"))
+    elif key == "r" and not event_active and not state.scanning and not state.transmitting:
+        if state.health < 100 and state.solar_power >= 10 and not state.repairing:
+            state.repairing = True
+            state.repair_progress = 0
+            emit(("notice", "Initiating repairs...", Fore.YELLOW))
+            state.solar_power -= 10
+            emit(("log", "Initiated repairs: Consumed 10% solar power"))
+    elif event_active:
+        outcomes = state.event["outcomes"]
+        if key in outcomes:
+            outcome_msg, outcome_color, outcome_effect, solar_power_effect = outcomes[key]
+        else:
+            outcome_msg, outcome_color, outcome_effect, solar_power_effect = outcomes.get(
+                "g", ("No action taken.", Fore.YELLOW, 0, 0))
+        satellite = state.event.get("satellite")
+        if satellite is not None:
+            # Another satellite of the constellation takes the damage
+            health = state.fleet.get(satellite, 100) + min(0, outcome_effect)
+            state.fleet = {**state.fleet, satellite: max(0, health)}
+            outcome_msg = f"{satellite}: {outcome_msg}"
+        else:
+            if outcome_effect < 0:
+                state.health = max(0, state.health + outcome_effect)
+            else:
+                state.data_collected += outcome_effect
+            state.solar_power = max(0, state.solar_power + solar_power_effect)
+        emit(("notice", f"OUTCOME: {outcome_msg}", outcome_color))
+        emit(("log", f"Event Outcome: {outcome_msg}"))
+        emit(("pause", NOTICE_PAUSE))
+        state.event = None
+
+
+def _end_cycle(state, emit):
+    state.cycles += 1
+    if state.scanning and state.scan_progress >= 100:
+        emit(("notice", "Scan complete! Data collected.", Fore.GREEN))
+        state.data_collected += 50
+        emit(("log", "Scan completed: 50MB data collected"))
+        state.scanning = False
+    if state.transmitting and state.transmit_progress >= 100:
+        emit(("notice", "Transmission complete! Data sent to ground station.", Fore.GREEN))
+        state.missions_completed += 1
+        state.data_collected = 0
+        emit(("log", f"Transmission completed: Mission {state.missions_completed}"))
+        state.transmitting = False
+    if state.repairing and state.repair_progress >= 100:
+        emit(("notice", "Repairs complete! Health restored.", Fore.GREEN))
+        state.health = min(100, state.health + 20)
+        emit(("log", "Repairs completed: Health +20%"))
+        state.repairing = False
+
+    if state.health <= 0:
+        emit(("failure", "CRITICAL FAILURE: Satellite health depleted!"))
+        emit(("log", "Satellite failure: Health depleted"))
+        state.running = False
+    elif state.solar_power <= 0:
+        emit(("failure", "CRITICAL FAILURE: Solar power depleted!"))
+        emit(("log", "Satellite failure: Solar power depleted"))
+        state.running = False
+    state.mode = cycle_mode(state)
+
+
+# A simple input policy for unattended runs: answer events, scan when idle,
+# transmit when enough data is stored and repair when damaged
+def autopilot(state, rng):
+    if state.event is not None:
+        return rng.choice(tuple(state.event["outcomes"]))
+    if state.scanning or state.transmitting or state.repairing:
+        return None
+    if state.health < 60 and state.solar_power >= 10:
+        return "r"
+    if state.data_collected >= 100:
+        return "t"
+    return "c"
+
+
+# Run the simulation without a terminal, as fast as possible. `inputs` is either
+# a {tick: key} dict or a callable (state, rng) -> key; by default the
+# autopilot plays. Stops after `ticks` frames or when the session ends.
+def run_headless(ticks, seed=None, state=None, inputs=autopilot, collect_effects=False):
+    rng = random.Random(seed)
+    state = state.copy() if state is not None else SimState()
+    effects = [] if collect_effects else None
+    if callable(inputs):
+        policy = inputs
+        lookup = None
+    else:
+        policy = None
+        lookup = (inputs or {}).get
+    tick = 0
+    while tick < ticks and state.running:
+        key = policy(state, rng) if policy else lookup(tick)
+        advance(state, key, rng, effects)
+        tick += 1
+    return state, tick, effects
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the satellite simulation headless")
+    parser.add_argument("--ticks", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--idle", action="store_true", help="send no input instead of using the autopilot")
+    args = parser.parse_args()
+    start = time.perf_counter()
+    state, ticks, _ = run_headless(args.ticks, seed=args.seed, inputs={} if args.idle else autopilot)
+    elapsed = time.perf_counter() - start
+    print(f"{ticks} ticks in {elapsed:.3f}s ({ticks / elapsed:,.0f} ticks/s)")
+    print(state.persistent(), "running" if state.running else "ended")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import json
+import os
+
+# Checkpoint file and the journal of changes made since that checkpoint
+STATE_FILE = "satellite_state.json"
+JOURNAL_SUFFIX = ".journal"
+
+# Version of the checkpoint layout; bump it and add a migration when the
+# state schema changes
+SCHEMA_VERSION = 2
+
+DEFAULT_STATE = {"health": 100, "data_collected": 0, "missions_completed": 0, "solar_power": 100}
+
+
+# v0 -> v1: saves from before the rename stored solar power as "fuel"
+def _migrate_fuel(state):
+    if "fuel" in state:
+        state["solar_power"] = state.pop("fuel")
+    return state
+
+
+# v1 -> v2: make sure every key the simulator needs is present
+def _migrate_defaults(state):
+    for key, value in DEFAULT_STATE.items():
+        state.setdefault(key, value)
+    return state
+
+
+# Migration run to move a state from version N to N + 1
+MIGRATIONS = {
+    0: _migrate_fuel,
+    1: _migrate_defaults,
+}
+
+
+# Bring a state dict from `version` up to SCHEMA_VERSION
+def migrate(state, version):
+    while version < SCHEMA_VERSION:
+        state = MIGRATIONS[version](state)
+        version += 1
+    return state
+
+
+# Satellite state persisted as an append-only journal of deltas plus periodic
+# checkpoints. record() appends only the keys that changed; every
+# checkpoint_every entries the journal is compacted into a checkpoint written
+# to a temp file and renamed into place. load() replays the journal on top of
+# the last checkpoint and ignores a torn final entry from a crash.
+class StateStore:
+    def __init__(self, path=STATE_FILE, journal_path=None, checkpoint_every=500, fsync=False):
+        self.path = path
+        self.journal_path = journal_path or path + JOURNAL_SUFFIX
+        self.checkpoint_every = checkpoint_every
+        self.fsync = fsync
+        self.seq = 0
+        self.pending = 0
+        self._saved = None
+        self._journal = None
+
+    # Recover the latest state: checkpoint, then journal replay
+    def load(self):
+        state, self.seq, version = self._read_checkpoint()
+        needs_checkpoint = version != SCHEMA_VERSION or not os.path.exists(self.path)
+        state = migrate(state, version)
+
+        replayed = self._replay(state)
+        self._saved = dict(state)
+        if needs_checkpoint or replayed:
+            self.checkpoint(state)
+        return state
+
+    def _read_checkpoint(self):
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return dict(DEFAULT_STATE), 0, SCHEMA_VERSION
+        if "version" not in data:
+            # Flat dict written before checkpoints were versioned
+            return data, 0, 0
+        return data["state"], data.get("seq", 0), data["version"]
+
+    # Apply journal entries newer than the checkpoint; returns how many applied
+    def _replay(self, state):
+        applied = 0
+        good_offset = 0
+        try:
+            f = open(self.journal_path, "rb")
+        except FileNotFoundError:
+            return 0
+        with f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                good_offset += len(line)
+                if entry["seq"] <= self.seq:
+                    continue
+                state.update(entry["delta"])
+                self.seq = entry["seq"]
+                applied += 1
+        # Drop a torn tail so new entries are not appended after garbage
+        if good_offset != os.path.getsize(self.journal_path):
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(good_offset)
+        return applied
+
+    # Journal whatever changed since the last record; cheap when nothing did
+    def record(self, state):
+        if self._saved is None:
+            self._saved = {}
+        delta = {key: value for key, value in state.items() if self._saved.get(key) != value}
+        if not delta:
+            return False
+        self.seq += 1
+        if self._journal is None:
+            self._journal = open(self.journal_path, "ab")
+        self._journal.write(json.dumps({"seq": self.seq, "delta": delta}, separators=(",", ":")).encode() + b"\n")
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+        self._saved.update(delta)
+        self.pending += 1
+        if self.pending >= self.checkpoint_every:
+            self.checkpoint(state)
+        return True
+
+    # Atomically write the full state and truncate the journal it replaces
+    def checkpoint(self, state):
+        data = {"version": SCHEMA_VERSION, "seq": self.seq, "state": state}
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        with open(self.journal_path, "wb"):
+            pass
+        self._saved = dict(state)
+        self.pending = 0
+
+    # Final checkpoint on a clean shutdown
+    def close(self, state=None):
+        if state is not None:
+            self.checkpoint(state)
+        elif self._journal is not None:
+            self._journal.close()
+            self._journal = None
@@ -0,0 +1,177 @@
+import argparse
+import os
+
+import numpy as np
+
+# File the history is kept in between runs
+HISTORY_FILE = "telemetry_history.dat"
+
+# One day of samples at the default half-second frame speed
+DEFAULT_CAPACITY = 172800
+
+# One telemetry sample; field names match generate_telemetry's keys
+TELEMETRY_DTYPE = np.dtype([
+    ("timestamp", "f8"),
+    ("latitude", "f4"),
+    ("longitude", "f4"),
+    ("altitude_km", "f4"),
+    ("temperature_c", "f4"),
+    ("signal_noise_ratio", "f4"),
+    ("health", "u1"),
+    ("solar_power", "u1"),
+    ("_pad", "V2"),
+])
+
+# Start of the history file: signature, capacity and the number of samples
+# ever appended (the write position is count % capacity)
+HEADER_DTYPE = np.dtype([("magic", "S8"), ("capacity", "<u8"), ("count", "<u8"), ("_pad", "V8")])
+MAGIC = b"TELEMv01"
+
+# Characters for sparklines, lowest to highest
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+
+# One sparkline character per value, scaled between low and high (default:
+# the range of the values)
+def sparkline(values, low=None, high=None):
+    if not len(values):
+        return ""
+    low = values.min() if low is None else low
+    high = values.max() if high is None else high
+    span = high - low or 1.0
+    levels = np.clip(((values - low) / span * (len(SPARK_CHARS) - 1)).round(), 0, len(SPARK_CHARS) - 1)
+    return "".join(SPARK_CHARS[level] for level in levels.astype(int))
+
+
+# Fixed-capacity ring buffer of telemetry samples in a NumPy structured array.
+# With a path, the array is a memory map of the file, so the history survives
+# restarts and reopening it reads nothing until samples are looked at.
+# Appends overwrite the oldest sample once full.
+class TelemetryHistory:
+    def __init__(self, capacity=DEFAULT_CAPACITY, path=None):
+        self.path = path
+        self._map = None
+        if path is None:
+            self._header = np.zeros(1, dtype=HEADER_DTYPE)
+            self._header["capacity"] = capacity
+            self.records = np.zeros(capacity, dtype=TELEMETRY_DTYPE)
+        else:
+            self._open(path, capacity)
+        self.capacity = int(self._header["capacity"][0])
+
+    def _open(self, path, capacity):
+        exists = os.path.exists(path) and os.path.getsize(path) >= HEADER_DTYPE.itemsize
+        if exists:
+            header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+            if header["magic"][0] != MAGIC:
+                raise ValueError(f"{path} is not a telemetry history file")
+            # An existing file keeps the capacity it was created with
+            capacity = int(header["capacity"][0])
+        size = HEADER_DTYPE.itemsize + capacity * TELEMETRY_DTYPE.itemsize
+        self._map = np.memmap(path, dtype=np.uint8, mode="r+" if exists else "w+", shape=(size,))
+        self._header = self._map[:HEADER_DTYPE.itemsize].view(HEADER_DTYPE)
+        self.records = self._map[HEADER_DTYPE.itemsize:].view(TELEMETRY_DTYPE)
+        if not exists:
+            self._header["magic"] = MAGIC
+            self._header["capacity"] = capacity
+
+    # Samples currently held
+    def __len__(self):
+        return min(int(self._header["count"][0]), self.capacity)
+
+    def append(self, timestamp, telemetry, health, solar_power):
+        count = int(self._header["count"][0])
+        self.records[count % self.capacity] = (
+            timestamp, telemetry["latitude"], telemetry["longitude"], telemetry["altitude_km"],
+            telemetry["temperature_c"], telemetry["signal_noise_ratio"], health, solar_power, b"\0\0",
+        )
+        self._header["count"] = count + 1
+
+    # Positions of the last n samples (default: all); start is negative when
+    # they wrap around the end of the array
+    def _window(self, n):
+        held = len(self)
+        n = held if n is None else min(n, held)
+        end = int(self._header["count"][0]) % self.capacity
+        return end - n, end
+
+    # The last n samples, oldest first
+    def latest(self, n=None):
+        start, end = self._window(n)
+        if start >= 0:
+            return self.records[start:end]
+        return np.concatenate([self.records[start:], self.records[:end]])
+
+    # One field of the last n samples, oldest first (copies only that field)
+    def values(self, field, n=None):
+        column = self.records[field]
+        start, end = self._window(n)
+        if start >= 0:
+            return column[start:end]
+        return np.concatenate([column[start:], column[:end]])
+
+    # Min, max and mean of a field over `buckets` equal slices of the last n
+    # samples (fewer buckets when there are fewer samples)
+    def downsample(self, field, buckets, last=None):
+        values = self.values(field, last).astype(np.float64)
+        if not len(values):
+            empty = np.zeros(0)
+            return empty, empty, empty
+        buckets = min(buckets, len(values))
+        edges = np.linspace(0, len(values), buckets + 1).astype(np.intp)[:-1]
+        counts = np.diff(np.append(edges, len(values)))
+        return (np.minimum.reduceat(values, edges), np.maximum.reduceat(values, edges),
+                np.add.reduceat(values, edges) / counts)
+
+    # One character per bucket for the bucket means, scaled between low and
+    # high (default: the range of the data)
+    def sparkline(self, field, width=40, last=None, low=None, high=None):
+        _, _, means = self.downsample(field, width, last)
+        return sparkline(means, low, high)
+
+    # A console row: label, sparkline and the range it covers
+    def trend_row(self, label, field, width=40, last=None, unit=""):
+        lows, highs, means = self.downsample(field, width, last)
+        if not len(means):
+            return f"{label}: no history yet"
+        return (f"{label:<8} {sparkline(means)} "
+                f"{lows.min():.1f}-{highs.max():.1f}{unit} (now {means[-1]:.1f}{unit})")
+
+    def flush(self):
+        if self._map is not None:
+            self._map.flush()
+
+    def close(self):
+        self.flush()
+        self._map = None
+
+
+# Trend rows shown on the console: (label, field, unit)
+TREND_FIELDS = [
+    ("Health", "health", "%"),
+    ("Solar", "solar_power", "%"),
+    ("Temp", "temperature_c", "°C"),
+    ("SNR", "signal_noise_ratio", "dB"),
+    ("Alt", "altitude_km", "km"),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show trends from the telemetry history file")
+    parser.add_argument("--file", default=HISTORY_FILE)
+    parser.add_argument("--last", type=int, default=None, help="only the last N samples")
+    parser.add_argument("--width", type=int, default=60)
+    args = parser.parse_args()
+
+    history = TelemetryHistory(path=args.file)
+    samples = history.latest(args.last)
+    print(f"{len(samples)} samples (capacity {history.capacity})")
+    if len(samples):
+        span = samples["timestamp"][-1] - samples["timestamp"][0]
+        print(f"covering {span / 60:.1f} minutes of session time")
+    for label, field, unit in TREND_FIELDS:
+        print(history.trend_row(label, field, args.width, args.last, unit))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import numpy as np
+
+from constellation import Constellation, positions_at
+from orbit import J2000_UNIX, circular_orbit
+
+
+# One satellite and one object on the mirrored orbit, meeting head-on at
+# about 15 km/s at J2000
+def head_on():
+    satellite = circular_orbit(550.0, 97.6)
+    debris = circular_orbit(550.0, 97.6, 180.0, 180.0)
+    return Constellation(satellite, ["SENTINEL"], debris, ["DEBRIS-1"])
+
+
+def distance(constellation, when):
+    return np.linalg.norm(positions_at(constellation.satellites, when) - positions_at(constellation.debris, when))
+
+
+def test_pass_between_frames_is_found():
+    constellation = head_on()
+    before, after = J2000_UNIX - 0.8, J2000_UNIX + 1.2
+    # Neither frame is within range on its own
+    assert distance(constellation, before) > constellation.radius_km
+    assert distance(constellation, after) > constellation.radius_km
+    assert constellation.screen(before) == []
+    alerts = constellation.screen(after)
+    assert len(alerts) == 1
+    assert alerts[0]["miss_km"] < 0.1
+    assert abs(alerts[0]["epoch_ms"] - J2000_UNIX * 1000) < 50
+
+
+def test_long_gap_is_screened_in_steps():
+    constellation = head_on()
+    constellation.screen(J2000_UNIX - 7.3)
+    alerts = constellation.screen(J2000_UNIX + 5.9)
+    assert [alert["object"] for alert in alerts] == ["DEBRIS-1"]
+    assert alerts[0]["miss_km"] < 0.1
+
+
+def test_pass_is_raised_once():
+    constellation = head_on()
+    found = [alert for offset in np.arange(-3.0, 3.0, 0.5) for alert in constellation.screen(J2000_UNIX + offset)]
+    assert len(found) == 1
@@ -0,0 +1,25 @@
+import io
+import os
+import sys
+from contextlib import redirect_stdout
+
+import satellite_animation as app
+from orbit import J2000_UNIX
+from recording import SessionRecorder, load_recording
+
+
+# A satellite that starts with no health fails at the end of its first cycle;
+# the notice must still reach the screen before the session ends
+def test_critical_failure_is_drawn(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    state = {"health": 0, "data_collected": 0, "missions_completed": 0, "solar_power": 100}
+    recorder = SessionRecorder("failure.rec", 1, J2000_UNIX, state)
+    recorder.close(2, state)
+    # The frame scheduler waits on stdin, so it needs a real (idle) one
+    read_end, write_end = os.pipe()
+    out = io.StringIO()
+    with os.fdopen(read_end) as stdin, os.fdopen(write_end, "w"):
+        monkeypatch.setattr(sys, "stdin", stdin)
+        with redirect_stdout(out):
+            app.animation_loop(dict(state), replay=load_recording("failure.rec"))
+    assert "CRITICAL FAILURE: Satellite health depleted!" in out.getvalue()
@@ -0,0 +1,65 @@
+import random
+
+from simulation import SimState, advance
+
+
+# A conjunction alert as Constellation.screen raises it
+def conjunction(satellite_index=3, satellite="SENTINEL-0003"):
+    return {"kind": "conjunction", "satellite": satellite, "satellite_index": satellite_index,
+            "object": "DEBRIS-00042", "miss_km": 2.5, "velocity_kps": 14.2, "epoch_ms": 946728000000}
+
+
+def run(state, key=None, alert=None):
+    effects = []
+    advance(state, key, random.Random(0), effects, alert)
+    return effects
+
+
+def test_conjunction_raised_when_idle():
+    state = SimState(debris_screened=True)
+    alert = conjunction()
+    effects = run(state, alert=alert)
+    assert state.event["name"] == "Debris Field"
+    assert state.event["satellite"] == "SENTINEL-0003"
+    assert ("alert", alert) in effects
+
+
+def test_conjunction_held_while_busy():
+    state = SimState(debris_screened=True)
+    state.scanning = True
+    effects = run(state, alert=conjunction())
+    assert state.event is None
+    assert not [effect for effect in effects if effect[0] == "alert"]
+
+
+def test_fleet_satellite_takes_the_hit():
+    state = SimState(debris_screened=True)
+    run(state, alert=conjunction())
+    effects = run(state, "t")
+    assert state.fleet == {"SENTINEL-0003": 90}
+    assert (state.health, state.solar_power) == (100, 100)
+    assert ("log", "Event Outcome: SENTINEL-0003: Impact sustained! Minor damage taken.") in effects
+
+
+def test_fleet_evasion_costs_the_satellite_not_the_player():
+    state = SimState(debris_screened=True)
+    run(state, alert=conjunction())
+    run(state, "e")
+    assert state.fleet == {"SENTINEL-0003": 95}
+    assert (state.health, state.solar_power) == (100, 100)
+
+
+def test_own_satellite_takes_the_hit():
+    state = SimState(debris_screened=True)
+    run(state, alert=conjunction(0, "Sentinel"))
+    run(state, "t")
+    assert state.fleet == {}
+    assert state.health == 90
+
+
+def test_fleet_health_stops_at_zero():
+    state = SimState(debris_screened=True)
+    state.fleet = {"SENTINEL-0003": 5}
+    run(state, alert=conjunction())
+    run(state, "t")
+    assert state.fleet == {"SENTINEL-0003": 0}